@@ -0,0 +1,554 @@
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Union
+from auth import Auth
+from client import Client
+from credentials import CredentialPool
+from dataset import Dataset
+from workspace import Workspace
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class _AsyncWrapper:
+
+    def __init__(self, concurrency: int = 10):
+        """
+        Initialize variables.
+
+        Args:
+            concurrency (int, optional): maximum number of requests in flight. Defaults to 10.
+        """
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphores = {}
+
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """
+        Semaphore of the running event loop (a semaphore can't be shared between loops).
+
+        Returns:
+            asyncio.Semaphore: semaphore limiting the concurrency.
+        """
+        loop = asyncio.get_running_loop()
+
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+
+        return self._semaphores[loop]
+
+
+    async def _run(self, func: Callable, *args, **kwargs):
+        """
+        Run a blocking method on the thread pool, limited by the semaphore.
+        Requests go through the same Client, so they share its connection pool and quota.
+        """
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+
+    def close(self):
+        """
+        Stops the thread pool.
+        """
+        self._executor.shutdown(wait=True)
+
+
+class AsyncWorkspace(_AsyncWrapper):
+
+    def __init__(self, token: Union[str, Auth, CredentialPool], client: Client = None, concurrency: int = 10):
+        """
+        Initialize variables.
+
+        Args:
+            token (Union[str, Auth, CredentialPool]): bearer token, Auth object to get a valid token on each request, or CredentialPool.
+            client (Client, optional): shared HTTP client, a new one (with a pool of concurrency connections) is created if not informed
+                (a CredentialPool token is its own client).
+            concurrency (int, optional): maximum number of requests in flight. Defaults to 10.
+        """
+        super().__init__(concurrency)
+
+        if (client is None) & (not isinstance(token, CredentialPool)):
+            client = Client(pool_size=concurrency)
+
+        self.workspace = Workspace(token, client)
+
+
+    async def list_workspaces(
+                self,
+                workspace_id: str = '',
+                workspace_name: str = '',
+                filters: str = '',
+                sink: str = '') -> Dict:
+        """
+        Async version of Workspace.list_workspaces.
+        """
+        return await self._run(
+                    self.workspace.list_workspaces,
+                    workspace_id=workspace_id,
+                    workspace_name=workspace_name,
+                    filters=filters,
+                    sink=sink)
+
+
+    async def list_users(self, workspace_id: str = '', sink: str = '') -> Dict:
+        """
+        Async version of Workspace.list_users.
+        """
+        return await self._run(self.workspace.list_users, workspace_id=workspace_id, sink=sink)
+
+
+    async def list_reports(self, workspace_id: str = '', sink: str = '') -> Dict:
+        """
+        Async version of Workspace.list_reports.
+        """
+        return await self._run(self.workspace.list_reports, workspace_id=workspace_id, sink=sink)
+
+
+    async def add_user(
+                self,
+                user_principal_name: str = '',
+                workspace_id: str = '',
+                access_right: str = 'Member',
+                user_type: str = 'user') -> Dict:
+        """
+        Async version of Workspace.add_user.
+        """
+        return await self._run(
+                    self.workspace.add_user,
+                    user_principal_name=user_principal_name,
+                    workspace_id=workspace_id,
+                    access_right=access_right,
+                    user_type=user_type)
+
+
+    async def update_user(
+                self,
+                user_principal_name: str = '',
+                workspace_id: str = '',
+                access_right: str = 'Member') -> Dict:
+        """
+        Async version of Workspace.update_user.
+        """
+        return await self._run(
+                    self.workspace.update_user,
+                    user_principal_name=user_principal_name,
+                    workspace_id=workspace_id,
+                    access_right=access_right)
+
+
+    async def remove_user(self, user_principal_name: str = '', workspace_id: str = '') -> Dict:
+        """
+        Async version of Workspace.remove_user.
+        """
+        return await self._run(
+                    self.workspace.remove_user,
+                    user_principal_name=user_principal_name,
+                    workspace_id=workspace_id)
+
+
+    async def batch_update_user(
+                self,
+                user: str = '',
+                workspaces_list: List[Dict] = [],
+                access_right: str = 'Admin',
+                workers: int = 0,
+                progress: Callable[[int, int], None] = None,
+                sink: str = '',
+                current: 'DataFrame' = None,
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Async version of Workspace.batch_update_user.
+        """
+        return await self._run(
+                    self.workspace.batch_update_user,
+                    user=user,
+                    workspaces_list=workspaces_list,
+                    access_right=access_right,
+                    workers=workers,
+                    progress=progress,
+                    sink=sink,
+                    current=current,
+                    dry_run=dry_run)
+
+
+    async def reconcile(
+                self,
+                desired: 'DataFrame',
+                current: 'DataFrame' = None,
+                prune: bool = False,
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Async version of Workspace.reconcile.
+        """
+        return await self._run(
+                    self.workspace.reconcile,
+                    desired=desired,
+                    current=current,
+                    prune=prune,
+                    dry_run=dry_run)
+
+
+    async def list_pages(
+                self,
+                workspace_id: str,
+                report_id: str) -> List[Dict]:
+        """
+        Async version of Workspace.list_pages.
+        """
+        return await self._run(
+                    self.workspace.list_pages,
+                    workspace_id=workspace_id,
+                    report_id=report_id)
+
+
+    async def export_report(
+                self,
+                workspace_id: str,
+                report_id: str,
+                format: str = 'PDF',
+                pages: List[str] = [],
+                configuration: Dict = {}) -> Dict:
+        """
+        Async version of Workspace.export_report.
+        """
+        return await self._run(
+                    self.workspace.export_report,
+                    workspace_id=workspace_id,
+                    report_id=report_id,
+                    format=format,
+                    pages=pages,
+                    configuration=configuration)
+
+
+    async def export_status(
+                self,
+                workspace_id: str,
+                report_id: str,
+                export_id: str) -> Dict:
+        """
+        Async version of Workspace.export_status.
+        """
+        return await self._run(
+                    self.workspace.export_status,
+                    workspace_id=workspace_id,
+                    report_id=report_id,
+                    export_id=export_id)
+
+
+    async def download_export(
+                self,
+                workspace_id: str,
+                report_id: str,
+                export_id: str,
+                path: str,
+                chunk_size: int = 1024 * 1024) -> int:
+        """
+        Async version of Workspace.download_export.
+        """
+        return await self._run(
+                    self.workspace.download_export,
+                    workspace_id=workspace_id,
+                    report_id=report_id,
+                    export_id=export_id,
+                    path=path,
+                    chunk_size=chunk_size)
+
+
+class AsyncDataset(_AsyncWrapper):
+
+    def __init__(self, token: Union[str, Auth, CredentialPool], client: Client = None, concurrency: int = 10):
+        """
+        Initialize variables.
+
+        Args:
+            token (Union[str, Auth, CredentialPool]): bearer token, Auth object to get a valid token on each request, or CredentialPool.
+            client (Client, optional): shared HTTP client, a new one (with a pool of concurrency connections) is created if not informed
+                (a CredentialPool token is its own client).
+            concurrency (int, optional): maximum number of requests in flight. Defaults to 10.
+        """
+        super().__init__(concurrency)
+
+        if (client is None) & (not isinstance(token, CredentialPool)):
+            client = Client(pool_size=concurrency)
+
+        self.dataset = Dataset(token, client)
+
+
+    async def list_datasets(self, workspace_id: str = '', sink: str = '') -> Dict:
+        """
+        Async version of Dataset.list_datasets.
+        """
+        return await self._run(self.dataset.list_datasets, workspace_id=workspace_id, sink=sink)
+
+
+    async def list_users(
+                self,
+                workspace_id: str = '',
+                dataset_id: str = '',
+                sink: str = '') -> Dict:
+        """
+        Async version of Dataset.list_users.
+        """
+        return await self._run(
+                    self.dataset.list_users,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    sink=sink)
+
+
+    async def add_user(
+                self,
+                user_principal_name: str = '',
+                workspace_id: str = '',
+                dataset_id: str = '',
+                access_right: str = 'Read',
+                user_type: str = 'User') -> Dict:
+        """
+        Async version of Dataset.add_user.
+        """
+        return await self._run(
+                    self.dataset.add_user,
+                    user_principal_name=user_principal_name,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    access_right=access_right,
+                    user_type=user_type)
+
+
+    async def update_user(
+                self,
+                user_principal_name: str = '',
+                workspace_id: str = '',
+                dataset_id: str = '',
+                access_right: str = 'Read',
+                user_type: str = 'User') -> Dict:
+        """
+        Async version of Dataset.update_user.
+        """
+        return await self._run(
+                    self.dataset.update_user,
+                    user_principal_name=user_principal_name,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    access_right=access_right,
+                    user_type=user_type)
+
+
+    async def remove_user(
+                self,
+                user_principal_name: str = '',
+                workspace_id: str = '',
+                dataset_id: str = '',
+                user_type: str = 'User') -> Dict:
+        """
+        Async version of Dataset.remove_user.
+        """
+        return await self._run(
+                    self.dataset.remove_user,
+                    user_principal_name=user_principal_name,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    user_type=user_type)
+
+
+    async def batch_apply(
+                self,
+                operations: Iterable,
+                action: str = 'remove',
+                journal_path: str = '',
+                report_path: str = '',
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Async version of Dataset.batch_apply.
+        """
+        return await self._run(
+                    self.dataset.batch_apply,
+                    operations=operations,
+                    action=action,
+                    journal_path=journal_path,
+                    report_path=report_path,
+                    dry_run=dry_run)
+
+
+    async def batch_remove_users(
+                self,
+                operations: Iterable,
+                journal_path: str = '',
+                report_path: str = '',
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Async version of Dataset.batch_remove_users.
+        """
+        return await self._run(
+                    self.dataset.batch_remove_users,
+                    operations=operations,
+                    journal_path=journal_path,
+                    report_path=report_path,
+                    dry_run=dry_run)
+
+
+    async def reconcile(
+                self,
+                desired: 'DataFrame',
+                current: 'DataFrame' = None,
+                prune: bool = False,
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Async version of Dataset.reconcile.
+        """
+        return await self._run(
+                    self.dataset.reconcile,
+                    desired=desired,
+                    current=current,
+                    prune=prune,
+                    dry_run=dry_run)
+
+
+    async def execute_queries(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                queries: List[str],
+                include_nulls: bool = True,
+                impersonated_user: str = '') -> List[List[Dict]]:
+        """
+        Async version of Dataset.execute_queries.
+        """
+        return await self._run(
+                    self.dataset.execute_queries,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    queries=queries,
+                    include_nulls=include_nulls,
+                    impersonated_user=impersonated_user)
+
+
+    async def create_push_dataset(
+                self,
+                workspace_id: str,
+                name: str,
+                tables: List[Dict],
+                retention_policy: str = 'None') -> Dict:
+        """
+        Async version of Dataset.create_push_dataset.
+        """
+        return await self._run(
+                    self.dataset.create_push_dataset,
+                    workspace_id=workspace_id,
+                    name=name,
+                    tables=tables,
+                    retention_policy=retention_policy)
+
+
+    async def update_table(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                table: Dict):
+        """
+        Async version of Dataset.update_table.
+        """
+        return await self._run(
+                    self.dataset.update_table,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    table=table)
+
+
+    async def post_rows(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                table_name: str,
+                rows_json: str):
+        """
+        Async version of Dataset.post_rows.
+        """
+        return await self._run(
+                    self.dataset.post_rows,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    table_name=table_name,
+                    rows_json=rows_json)
+
+
+    async def delete_rows(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                table_name: str):
+        """
+        Async version of Dataset.delete_rows.
+        """
+        return await self._run(
+                    self.dataset.delete_rows,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    table_name=table_name)
+
+
+    async def refresh(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                notify_option: str = 'NoNotification',
+                options: Dict = {}) -> str:
+        """
+        Async version of Dataset.refresh.
+        """
+        return await self._run(
+                    self.dataset.refresh,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    notify_option=notify_option,
+                    options=options)
+
+
+    async def refresh_history(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                top: int = 1) -> List[Dict]:
+        """
+        Async version of Dataset.refresh_history.
+        """
+        return await self._run(
+                    self.dataset.refresh_history,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    top=top)
+
+
+    async def refresh_status(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                request_id: str = '') -> Dict:
+        """
+        Async version of Dataset.refresh_status.
+        """
+        return await self._run(
+                    self.dataset.refresh_status,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    request_id=request_id)
+
+
+    async def cancel_refresh(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                request_id: str):
+        """
+        Async version of Dataset.cancel_refresh.
+        """
+        return await self._run(
+                    self.dataset.cancel_refresh,
+                    workspace_id=workspace_id,
+                    dataset_id=dataset_id,
+                    request_id=request_id)
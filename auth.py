@@ -1,9 +1,15 @@
-
-from azure.identity import ClientSecretCredential
+import time
+import threading
+from typing import Dict
 
 class Auth:
 
-    def __init__(self, tenant_id: str, client_id: str, client_secret: str):
+    def __init__(
+                self,
+                tenant_id: str,
+                client_id: str,
+                client_secret: str,
+                refresh_margin: int = 300):
         """
         Initialize variables.
 
@@ -11,28 +17,95 @@ class Auth:
             tenant_id (str, optional): tenant ID.
             client_id (str, optional): client ID (app registration).
             client_secret (str, optional): client secret/credentials (app registration).
+            refresh_margin (int, optional): seconds before the expiration to refresh the token. Defaults to 300.
         """
         self.tenant_id = tenant_id
         self.client_id = client_id
         self.client_secret = client_secret
+        self.refresh_margin = refresh_margin
+        self.auth_url = 'https://analysis.windows.net/powerbi/api/.default'
+
+        # Token cache
+        self._credential = None
+        self._access_token = None
+        self._lock = threading.Lock()
+        self._timer = None
+
+
+    def _refresh(self):
+        """
+        Requests a new token and schedules the next refresh, in the background,
+        refresh_margin seconds before it expires.
+        """
+        if self._credential is None:
+            # Imported only when a token is needed, so the CLI starts fast
+            from azure.identity import ClientSecretCredential
+
+            self._credential = ClientSecretCredential(
+                        authority = 'https://login.microsoftonline.com/',
+                        tenant_id = self.tenant_id,
+                        client_id = self.client_id,
+                        client_secret = self.client_secret)
+
+        self._access_token = self._credential.get_token(self.auth_url)
+
+        # Schedule the next refresh
+        if self._timer is not None:
+            self._timer.cancel()
+
+        delay = max(self._access_token.expires_on - self.refresh_margin - time.time(), 0)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+    def _background_refresh(self):
+        """
+        Refresh the token from the timer thread.
+        If it fails, the next get_token call refreshes it.
+        """
+        try:
+            with self._lock:
+                self._refresh()
+
+        except Exception:
+            pass
+
+
+    def _is_expiring(self) -> bool:
+        return (self._access_token is None) or (self._access_token.expires_on - self.refresh_margin <= time.time())
 
 
     def get_token(self) -> str:
         """
         Generates the bearer token to be used on Power BI REST API requests.
+        The token is cached and only requested again when it's about to expire.
 
         Returns:
             str: token for authorization.
         """
-        auth_url = 'https://analysis.windows.net/powerbi/api/.default'
+        if self._is_expiring():
+            with self._lock:
+                # Another thread may have refreshed it while waiting for the lock
+                if self._is_expiring():
+                    self._refresh()
+
+        return self._access_token.token
+
+
+    def get_headers(self) -> Dict:
+        """
+        Authorization header with a valid bearer token.
 
-        auth = ClientSecretCredential(
-                    authority = 'https://login.microsoftonline.com/',
-                    tenant_id = self.tenant_id,
-                    client_id = self.client_id,
-                    client_secret = self.client_secret)
+        Returns:
+            Dict: header for authorization.
+        """
+        return {'Authorization': f'Bearer {self.get_token()}'}
 
-        response = auth.get_token(auth_url)
-        access_token = response.token
 
-        return access_token
+    def close(self):
+        """
+        Stops the background refresh.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
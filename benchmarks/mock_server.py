@@ -0,0 +1,455 @@
+import re
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class MockPowerBI:
+
+    def __init__(
+                self,
+                latency: float = 0.0,
+                items: int = 100,
+                throttle_rate: float = 0.0,
+                retry_after: int = 1,
+                scan_polls: int = 1,
+                export_polls: int = 1,
+                refresh_seconds: float = 0.2):
+        """
+        Initialize variables.
+
+        Local mock of the Power BI REST API endpoints used by Workspace and Dataset:
+        /groups, /groups/{id}/users, /groups/{id}/reports, /groups/{id}/datasets
+        and /groups/{id}/datasets/{id}/users, the admin Scanner API used by Scanner:
+        /admin/workspaces/modified, getInfo, scanStatus/{id} and scanResult/{id}, and the
+        export to file API: /groups/{id}/reports/{id}/ExportTo, exports/{id} and exports/{id}/file,
+        and the DAX queries QueryExtractor sends to /groups/{id}/datasets/{id}/executeQueries,
+        on the rows of table (key ranges only, results cut at query_max_rows), and the
+        refreshes of /groups/{id}/datasets/{id}/refreshes (start and history).
+        Exports of reports named 'failed-*' fail, and files of reports named 'truncated-*'
+        are cut short (the connection is closed before the whole file is sent). Refreshes of
+        datasets named 'failed-*' fail, and the ones of datasets named 'broken-*' can't start.
+
+        Args:
+            latency (float, optional): seconds added to every response. Defaults to 0.
+            items (int, optional): number of items on each listing (payload size). Defaults to 100.
+            throttle_rate (float, optional): fraction of requests answered with 429 Too Many Requests. Defaults to 0.
+            retry_after (int, optional): Retry-After header of the 429 responses, in seconds. Defaults to 1.
+            scan_polls (int, optional): status requests answered 'Running' before a scan succeeds. Defaults to 1.
+            export_polls (int, optional): status requests answered 'Running' before an export finishes. Defaults to 1.
+            refresh_seconds (float, optional): duration of every refresh (also of the last one on the history). Defaults to 0.2.
+        """
+        self.latency = latency
+        self.items = items
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.scan_polls = scan_polls
+        self.export_polls = export_polls
+        self.refresh_seconds = refresh_seconds
+
+        self.errors = []             # statuses answered to the next requests, one each, before any other response
+        self.authorizations = []     # Authorization header of each request
+        self.urls = []               # path and query of each request
+        self.requests = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.scans = {}              # scan id: workspaces ids and status requests
+        self.modified = []           # workspaces ids listed as modified when modifiedSince is sent
+        self.max_running_scans = 0
+        self.exports = {}            # export id: report id and status requests
+        self.max_running_exports = 0
+        self.table = []              # rows of the table queried with executeQueries, {'Key': ..., other columns}
+        self.query_max_rows = 100000
+        self.queries = []            # DAX queries received
+        self.pushed = []             # rows of each POST rows request to a push dataset table
+        self.refreshes = {}          # dataset id: workspace id, start time and status requests made while running
+        self.max_running_refreshes = {}  # workspace id: maximum refreshes running at the same time
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/v1.0/myorg'
+
+
+    def start(self) -> 'MockPowerBI':
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+    def reset(self):
+        with self._lock:
+            self.errors = []
+            self.authorizations = []
+            self.urls = []
+            self.requests = 0
+            self.throttled = 0
+            self.max_in_flight = 0
+            self.scans = {}
+            self.max_running_scans = 0
+            self.exports = {}
+            self.max_running_exports = 0
+            self.queries = []
+            self.pushed = []
+            self.refreshes = {}
+            self.max_running_refreshes = {}
+
+
+    def _listing(self, path: str, query: dict) -> list:
+        """
+        Items of a listing, None if the path is unknown.
+        """
+        n = self.items
+
+        if re.fullmatch(r'/groups/?', path):
+            items = [{'id': f'ws-{i}', 'name': f'Workspace {i}', 'isReadOnly': False, 'type': 'Workspace'} for i in range(n)]
+            top = int(query.get('$top', ['0'])[0])
+            skip = int(query.get('$skip', ['0'])[0])
+            return items[skip:skip + top] if top else items
+
+        if re.fullmatch(r'/groups/[^/]+/users', path):
+            return [{'emailAddress': f'user{i}@contoso.com', 'identifier': f'user{i}@contoso.com',
+                     'groupUserAccessRight': 'Member', 'principalType': 'User'} for i in range(n)]
+
+        match = re.fullmatch(r'/groups/([^/]+)/reports', path)
+        if match:
+            return [{'id': f'report-{i}', 'name': f'Report {i}', 'datasetId': f'dataset-{i}',
+                     'datasetWorkspaceId': match.group(1), 'reportType': 'PowerBIReport'} for i in range(n)]
+
+        if re.fullmatch(r'/groups/[^/]+/datasets', path):
+            return [{'id': f'dataset-{i}', 'name': f'Dataset {i}', 'configuredBy': 'owner@contoso.com'} for i in range(n)]
+
+        if re.fullmatch(r'/groups/[^/]+/datasets/[^/]+/users', path):
+            return [{'identifier': f'user{i}@contoso.com', 'datasetUserAccessRight': 'Read',
+                     'principalType': 'User'} for i in range(n)]
+
+        return None
+
+
+    def _scanner(self, method: str, path: str, query: dict, body: dict):
+        """
+        Status and body of an admin Scanner API request, None if the path is unknown.
+        """
+        if (method == 'GET') and (path == '/admin/workspaces/modified'):
+            if 'modifiedSince' in query:
+                return 200, [{'id': workspace_id} for workspace_id in self.modified]
+
+            return 200, [{'id': f'ws-{i}'} for i in range(self.items)]
+
+        if (method == 'POST') and (path == '/admin/workspaces/getInfo'):
+            with self._lock:
+                scan_id = f'scan-{len(self.scans)}'
+                self.scans[scan_id] = {'workspaces': body.get('workspaces', []), 'polls': 0, 'done': False}
+                running = sum(1 for scan in self.scans.values() if not scan['done'])
+                self.max_running_scans = max(self.max_running_scans, running)
+
+            return 202, {'id': scan_id, 'status': 'NotStarted'}
+
+        match = re.fullmatch(r'/admin/workspaces/scan(Status|Result)/([^/]+)', path)
+
+        if (method != 'GET') or (match is None) or (match.group(2) not in self.scans):
+            return None
+
+        scan = self.scans[match.group(2)]
+
+        if match.group(1) == 'Status':
+            with self._lock:
+                scan['polls'] += 1
+                status = 'Succeeded' if scan['polls'] > self.scan_polls else 'Running'
+
+            return 200, {'id': match.group(2), 'status': status}
+
+        scan['done'] = True
+
+        # Odd workspaces come without datasets and users, as empty ones are omitted by the service
+        workspaces = []
+
+        for i, workspace_id in enumerate(scan['workspaces']):
+            workspace = {
+                'id': workspace_id,
+                'name': f'Workspace {workspace_id}',
+                'reports': [{'id': f'{workspace_id}-report', 'name': 'Report', 'datasetId': f'{workspace_id}-dataset'}],
+            }
+
+            if i % 2 == 0:
+                workspace['datasets'] = [{'id': f'{workspace_id}-dataset', 'name': 'Dataset'}]
+                workspace['users'] = [{'identifier': 'user@contoso.com', 'groupUserAccessRight': 'Admin'}]
+
+            workspaces.append(workspace)
+
+        return 200, {'workspaces': workspaces}
+
+
+    def _export(self, method: str, path: str):
+        """
+        Status and body of an export to file request (bytes for the file), None if the path is unknown.
+        """
+        match = re.fullmatch(r'/groups/[^/]+/reports/([^/]+)/ExportTo', path)
+
+        if (method == 'POST') and (match is not None):
+            with self._lock:
+                export_id = f'export-{len(self.exports)}'
+                self.exports[export_id] = {'report_id': match.group(1), 'polls': 0, 'done': False}
+                running = sum(1 for export in self.exports.values() if not export['done'])
+                self.max_running_exports = max(self.max_running_exports, running)
+
+            return 202, {'id': export_id, 'status': 'NotStarted', 'percentComplete': 0}
+
+        match = re.fullmatch(r'/groups/[^/]+/reports/[^/]+/exports/([^/]+)(/file)?', path)
+
+        if (method != 'GET') or (match is None) or (match.group(1) not in self.exports):
+            return None
+
+        export = self.exports[match.group(1)]
+
+        if match.group(2) is not None:
+            return 200, f"{export['report_id']}\n".encode() * 1000
+
+        with self._lock:
+            export['polls'] += 1
+
+            if export['polls'] <= self.export_polls:
+                return 200, {'id': match.group(1), 'status': 'Running', 'percentComplete': 50}
+
+            export['done'] = True
+
+        if export['report_id'].startswith('failed-'):
+            return 200, {'id': match.group(1), 'status': 'Failed', 'error': {'code': 'ExportFailed', 'message': 'Export failed'}}
+
+        return 200, {'id': match.group(1), 'status': 'Succeeded', 'percentComplete': 100, 'resourceFileExtension': '.pdf'}
+
+
+    def _execute_queries(self, path: str, body: dict):
+        """
+        Status and body of an executeQueries request, None if the path is unknown.
+        """
+        if not re.fullmatch(r'/groups/[^/]+/datasets/[^/]+/executeQueries', path):
+            return None
+
+        query = body['queries'][0]['query']
+        table = re.search(r"'([^']+)'", query).group(1)
+
+        with self._lock:
+            self.queries.append(query)
+
+        def row(values: dict) -> dict:
+            return {f'{table}[{column}]': value for column, value in values.items()}
+
+        keys = [values['Key'] for values in self.table]
+
+        if 'COUNTROWS' in query:
+            rows = [{'[min]': min(keys, default=None), '[max]': max(keys, default=None), '[rows]': len(keys)}]
+
+        elif 'TOPN(1' in query:
+            rows = [row(values) for values in self.table[:1]]
+
+        else:
+            match = re.search(r'>= ([-0-9.e]+) && \S+ (<=?) ([-0-9.e]+)', query)
+            low, inclusive, high = float(match.group(1)), match.group(2) == '<=', float(match.group(3))
+            rows = [
+                row(values) for values in self.table
+                if (low <= values['Key']) and ((values['Key'] <= high) if inclusive else (values['Key'] < high))
+            ][:self.query_max_rows]
+
+        return 200, {'results': [{'tables': [{'rows': rows}]}]}
+
+
+    def _post_rows(self, path: str, body: dict):
+        """
+        Status and body of a push dataset POST rows request, None if the path is unknown.
+        """
+        if not re.fullmatch(r'/groups/[^/]+/datasets/[^/]+/tables/[^/]+/rows', path):
+            return None
+
+        with self._lock:
+            self.pushed.append(body['rows'])
+
+        return 200, {}
+
+
+    def _refreshes(self, method: str, path: str):
+        """
+        Status, body and headers of a refresh request, None if the path is unknown.
+        """
+        match = re.fullmatch(r'/groups/([^/]+)/datasets/([^/]+)/refreshes', path)
+
+        if match is None:
+            return None
+
+        workspace_id, dataset_id = match.groups()
+        now = time.time()
+
+        if method == 'POST':
+            if dataset_id.startswith('broken-'):
+                return 400, {'error': {'code': 'InvalidRequest', 'message': 'Refresh could not be started'}}, {}
+
+            with self._lock:
+                self.refreshes[dataset_id] = {'workspace_id': workspace_id, 'started': now, 'polls': []}
+                running = sum(
+                            1 for refresh in self.refreshes.values()
+                            if (refresh['workspace_id'] == workspace_id) and (now < refresh['started'] + self.refresh_seconds))
+                self.max_running_refreshes[workspace_id] = max(self.max_running_refreshes.get(workspace_id, 0), running)
+
+            return 202, {}, {'RequestId': f'request-{dataset_id}'}
+
+        def timestamp(seconds: float) -> str:
+            return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + f'.{int(seconds % 1 * 1000):03d}Z'
+
+        # Last refresh before the run, with the same duration
+        history = [{
+            'requestId': 'previous', 'status': 'Completed',
+            'startTime': timestamp(now - 3600), 'endTime': timestamp(now - 3600 + self.refresh_seconds),
+        }]
+
+        refresh = self.refreshes.get(dataset_id)
+
+        if refresh is not None:
+            ended = now >= refresh['started'] + self.refresh_seconds
+
+            with self._lock:
+                refresh['polls'].append(now)
+
+            if not ended:
+                status = 'Unknown'
+            else:
+                status = 'Failed' if dataset_id.startswith('failed-') else 'Completed'
+
+            history.insert(0, {
+                'requestId': f'request-{dataset_id}', 'status': status, 'startTime': timestamp(refresh['started']),
+                'endTime': timestamp(refresh['started'] + self.refresh_seconds) if ended else None,
+            })
+
+        return 200, {'value': history}, {}
+
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body, headers: dict = {}):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_file(self, data: bytes, truncated: bool = False):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+
+                # Half of the file, then the connection is closed
+                if truncated:
+                    self.close_connection = True
+                    data = data[:len(data) // 2]
+
+                self.wfile.write(data)
+
+            def _handle(self):
+                with mock._lock:
+                    mock.in_flight += 1
+                    mock.max_in_flight = max(mock.max_in_flight, mock.in_flight)
+
+                try:
+                    self._respond()
+                finally:
+                    with mock._lock:
+                        mock.in_flight -= 1
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+
+                with mock._lock:
+                    mock.requests += 1
+                    mock.authorizations.append(self.headers.get('Authorization', ''))
+                    mock.urls.append(self.path.split('/v1.0/myorg', 1)[-1])
+                    error = mock.errors.pop(0) if mock.errors else None
+                    throttle = (error is None) and (mock._random.random() < mock.throttle_rate)
+                    if throttle:
+                        mock.throttled += 1
+
+                if mock.latency:
+                    time.sleep(mock.latency)
+
+                if error is not None:
+                    headers = {'Retry-After': str(mock.retry_after)} if error == 429 else {}
+                    return self._send(error, {'error': {'code': 'MockError', 'message': f'mock error {error}'}}, headers)
+
+                if throttle:
+                    return self._send(
+                                429,
+                                {'error': {'code': 'TooManyRequests', 'message': 'Too many requests'}},
+                                {'Retry-After': str(mock.retry_after)})
+
+                url = urlparse(self.path)
+                path = url.path.split('/v1.0/myorg', 1)[-1]
+
+                if path.startswith('/admin/'):
+                    scanner = mock._scanner(self.command, path, parse_qs(url.query), json.loads(body or b'{}'))
+
+                    if scanner is None:
+                        return self._send(404, {'error': {'code': 'NotFound', 'message': 'Not found'}})
+
+                    return self._send(*scanner)
+
+                refreshes = mock._refreshes(self.command, path)
+
+                if refreshes is not None:
+                    return self._send(*refreshes)
+
+                if self.command == 'POST':
+                    data = json.loads(body or b'{}')
+                    query = mock._execute_queries(path, data)
+
+                    if query is not None:
+                        return self._send(*query)
+
+                    rows = mock._post_rows(path, data)
+
+                    if rows is not None:
+                        return self._send(*rows)
+
+                export = mock._export(self.command, path)
+
+                if export is not None:
+                    status, content = export
+
+                    if not isinstance(content, bytes):
+                        return self._send(status, content)
+
+                    return self._send_file(content, truncated='/truncated-' in path)
+
+                if self.command == 'GET':
+                    items = mock._listing(path, parse_qs(url.query))
+
+                    if items is None:
+                        return self._send(404, {'error': {'code': 'NotFound', 'message': 'Not found'}})
+
+                    return self._send(200, {'value': items})
+
+                # Adding, updating and removing users always succeed
+                return self._send(200, {})
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        return Handler
@@ -0,0 +1,224 @@
+"""
+Benchmark suite against a local mock of the Power BI REST API.
+
+Usage:
+    python benchmarks/run.py --label <version> [--latency 0.01] [--items 100] [--throttle-rate 0.05]
+    python benchmarks/run.py --label <version> --compare <other version>
+
+Results are saved to benchmarks/results/<label>.json.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import subprocess
+from typing import Callable, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+sys.path.insert(0, ROOT)
+
+from client import Client
+from dataset import Dataset
+from workspace import Workspace
+from rate_limiter import RateLimiter
+from benchmarks.mock_server import MockPowerBI
+
+
+def make_client(server: MockPowerBI) -> Client:
+    """
+    Client pointing to the mock, without quota and cache, so every call is a request.
+    """
+    rate_limiter = RateLimiter(max_requests=10 ** 9, state_file=None)
+
+    return Client(base_url=server.url, rate_limiter=rate_limiter, cache_size=0)
+
+
+def list_workspaces(server: MockPowerBI, args) -> Callable:
+    workspace = Workspace('token', make_client(server), sink=args.sink)
+
+    def run():
+        for _ in range(args.iterations):
+            workspace.list_workspaces()
+        workspace.flush()
+
+    return run
+
+
+def batch_update_user(server: MockPowerBI, args) -> Callable:
+    workspace = Workspace('token', make_client(server), sink=args.sink)
+    workspaces_list = [{'id': f'ws-{i}', 'name': f'Workspace {i}'} for i in range(args.workspaces)]
+
+    def run():
+        workspace.batch_update_user('user@contoso.com', workspaces_list)
+
+    return run
+
+
+def dataset_cleanup(server: MockPowerBI, args) -> Callable:
+    dataset = Dataset('token', make_client(server), sink=args.sink)
+    operations = [(f'user{i}@contoso.com', f'ws-{i % 50}', f'dataset-{i % 200}', 'Read') for i in range(args.rows)]
+
+    def run():
+        # New journal on the working directory, so nothing is resumed
+        fd, journal = tempfile.mkstemp(suffix='.jsonl', dir=args.workdir)
+        os.close(fd)
+        dataset.batch_remove_users(iter(operations), journal_path=journal)
+
+    return run
+
+
+def cli_startup(server: MockPowerBI, args) -> Callable:
+    """
+    Start the CLI (cli.py --help) in new processes: interpreter start plus imports, no requests.
+    """
+    command = [sys.executable, os.path.join(ROOT, 'cli.py'), '--help']
+
+    def run():
+        for _ in range(args.startups):
+            subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+
+    return run
+
+
+BENCHMARKS = {
+    'list_workspaces': list_workspaces,
+    'batch_update_user': batch_update_user,
+    'dataset_cleanup': dataset_cleanup,
+    'cli_startup': cli_startup,
+}
+
+
+def import_time(module: str) -> Dict:
+    """
+    Cumulative import time of a module (python -X importtime) and the heavy modules it loads.
+    """
+    code = f'import sys, json, {module}; print(json.dumps([m for m in ("pandas", "openpyxl", "azure.identity") if m in sys.modules]))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    # Last line of the module itself: "import time: self [us] | cumulative | module"
+    line = [line for line in result.stderr.splitlines() if line.split('|')[-1].strip() == module][-1]
+
+    return {'import_seconds': int(line.split('|')[1]) / 10 ** 6, 'heavy_modules': json.loads(result.stdout)}
+
+
+def measure(name: str, server: MockPowerBI, args) -> Dict:
+    """
+    Run a benchmark twice: once timed, once tracing memory (tracing slows it down).
+    """
+    result = {'name': name}
+
+    try:
+        server.reset()
+        run = BENCHMARKS[name](server, args)
+        started = time.perf_counter()
+        run()
+        wall_time = time.perf_counter() - started
+
+        result.update({
+            'wall_time': round(wall_time, 4),
+            'requests': server.requests,
+            'throttled': server.throttled,
+            'requests_per_second': round(server.requests / wall_time, 2),
+        })
+
+        if name == 'cli_startup':
+            result.update(import_time('cli'), startup_seconds=round(wall_time / args.startups, 4))
+
+        run = BENCHMARKS[name](server, args)
+        tracemalloc.start()
+        run()
+        result['peak_memory_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+
+    finally:
+        tracemalloc.stop()
+
+    return result
+
+
+def git_version() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return 'local'
+
+
+def compare(results: Dict, label: str):
+    """
+    Print the change of each metric against the results of another version.
+    """
+    with open(os.path.join(RESULTS_DIR, f'{label}.json')) as f:
+        baseline = {r['name']: r for r in json.load(f)['benchmarks']}
+
+    print(f"\n{'benchmark':<20}{'metric':<22}{label:>12}{results['label']:>12}{'change':>10}")
+
+    for result in results['benchmarks']:
+        other = baseline.get(result['name'], {})
+
+        for metric in ['wall_time', 'requests_per_second', 'peak_memory_mb', 'startup_seconds', 'import_seconds']:
+            if (metric in result) and (metric in other) and other[metric]:
+                change = (result[metric] - other[metric]) / other[metric] * 100
+                print(f"{result['name']:<20}{metric:<22}{other[metric]:>12}{result[metric]:>12}{change:>+9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--label', default=git_version(), help='version label of the results (default: git commit)')
+    parser.add_argument('--compare', default='', help='label of the results to compare with')
+    parser.add_argument('--benchmarks', nargs='+', default=list(BENCHMARKS), choices=list(BENCHMARKS))
+    parser.add_argument('--latency', type=float, default=0.005, help='seconds added to every response')
+    parser.add_argument('--items', type=int, default=100, help='items on each listing (payload size)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--iterations', type=int, default=100, help='list_workspaces calls')
+    parser.add_argument('--workspaces', type=int, default=500, help='workspaces on batch_update_user')
+    parser.add_argument('--rows', type=int, default=10000, help='rows of the dataset cleanup')
+    parser.add_argument('--startups', type=int, default=10, help='CLI starts measured by cli_startup')
+    parser.add_argument('--sink', default='none', help="export of list_* results ('none', 'csv', 'jsonl', 'parquet', 'excel')")
+    args = parser.parse_args()
+
+    server = MockPowerBI(latency=args.latency, items=args.items, throttle_rate=args.throttle_rate).start()
+
+    # Exports and journals go to a temporary directory
+    cwd = os.getcwd()
+    args.workdir = tempfile.mkdtemp()
+    os.chdir(args.workdir)
+
+    try:
+        benchmarks = []
+
+        for name in args.benchmarks:
+            result = measure(name, server, args)
+            benchmarks.append(result)
+            print(json.dumps(result))
+
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(args.workdir, ignore_errors=True)
+        server.stop()
+
+    results = {
+        'label': args.label,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'settings': {key: value for key, value in vars(args).items() if key not in ('label', 'compare', 'benchmarks', 'workdir')},
+        'benchmarks': benchmarks,
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    with open(os.path.join(RESULTS_DIR, f'{args.label}.json'), 'w') as f:
+        json.dump(results, f, indent=4)
+
+    if args.compare != '':
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
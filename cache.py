@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Hashable
+from urllib.parse import urlparse
+
+
+class ResponseCache:
+
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize variables.
+
+        Session cache of successful GET responses (bounded LRU). Identical requests
+        made while one is in flight wait for it, instead of being sent again.
+
+        Args:
+            max_size (int, optional): maximum number of cached responses. Defaults to 256.
+        """
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._responses = OrderedDict()
+        self._in_flight = {}
+        self._generation = 0
+
+
+    def get(self, key: Hashable, url: str, fetch: Callable):
+        """
+        Cached response of a request, fetching it if not cached.
+
+        Args:
+            key (Hashable): request identifier.
+            url (str): request URL, used for invalidation.
+            fetch (Callable): function that makes the request.
+
+        Returns:
+            requests.Response: response of the request.
+        """
+        with self._lock:
+            if key in self._responses:
+                self._responses.move_to_end(key)
+                return self._responses[key][1]
+
+            # Same request already in flight, wait for it
+            future = self._in_flight.get(key)
+            owner = future is None
+
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                generation = self._generation
+
+        if not owner:
+            return future.result()
+
+        try:
+            response = fetch()
+
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+            # Don't cache errors, nor responses invalidated while in flight
+            if (response.status_code == 200) & (generation == self._generation):
+                self._responses[key] = (urlparse(url).path, response)
+
+                while len(self._responses) > self.max_size:
+                    self._responses.popitem(last=False)
+
+        future.set_result(response)
+
+        return response
+
+
+    def invalidate(self, path: str = ''):
+        """
+        Drop cached responses under a path.
+
+        Args:
+            path (str, optional): URL path, all responses if not informed.
+        """
+        with self._lock:
+            self._generation += 1
+
+            for key in [key for key, (cached_path, _) in self._responses.items() if cached_path.startswith(path)]:
+                del self._responses[key]
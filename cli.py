@@ -0,0 +1,177 @@
+"""
+Command line interface.
+
+Usage:
+    python cli.py workspaces list [--name NAME | --id ID | --filter FILTER]
+    python cli.py workspaces users WORKSPACE_ID
+    python cli.py workspaces reports WORKSPACE_ID
+    python cli.py datasets list WORKSPACE_ID
+    python cli.py datasets users WORKSPACE_ID DATASET_ID
+    python cli.py datasets remove-users --plan PLAN_FILE [--journal JOURNAL_FILE] [--report REPORT_FILE] [--dry-run]
+
+Listings are written to stdout as JSON lines. The token is read from --token (or the
+POWERBI_TOKEN environment variable), otherwise requested for the app registration on
+TENANT_ID, CLIENT_ID and CLIENT_SECRET.
+
+pandas, openpyxl and azure-identity are only imported by the commands that need them.
+"""
+import os
+import sys
+import json
+import argparse
+from typing import Dict, List
+from client import Client
+
+
+def get_token(args: argparse.Namespace):
+    """
+    Bearer token informed, or Auth object of the app registration.
+    """
+    token = args.token or os.environ.get('POWERBI_TOKEN', '')
+
+    if token != '':
+        return token
+
+    from auth import Auth
+
+    return Auth(os.environ.get('TENANT_ID', ''), os.environ.get('CLIENT_ID', ''), os.environ.get('CLIENT_SECRET', ''))
+
+
+def print_records(response: Dict) -> int:
+    """
+    Print the content of a listing as JSON lines, or its error.
+
+    Returns:
+        int: exit code.
+    """
+    if response['message'] != 'Success':
+        print(json.dumps(response['message']), file=sys.stderr)
+        return 1
+
+    for record in response['content']:
+        sys.stdout.write(json.dumps(record.to_dict()) + '\n')
+
+    return 0
+
+
+def workspaces_command(args: argparse.Namespace, client: Client) -> int:
+    from workspace import Workspace
+
+    workspace = Workspace(get_token(args), client, sink=args.sink)
+
+    if args.command == 'list':
+        response = workspace.list_workspaces(workspace_id=args.id, workspace_name=args.name, filters=args.filter)
+    elif args.command == 'users':
+        response = workspace.list_users(args.workspace_id)
+    else:
+        response = workspace.list_reports(args.workspace_id)
+
+    code = print_records(response)
+    workspace.flush()
+
+    return code
+
+
+def datasets_command(args: argparse.Namespace, client: Client) -> int:
+    from dataset import Dataset
+
+    dataset = Dataset(get_token(args), client, sink=args.sink)
+
+    if args.command == 'list':
+        code = print_records(dataset.list_datasets(args.workspace_id))
+
+    elif args.command == 'users':
+        code = print_records(dataset.list_users(args.workspace_id, args.dataset_id))
+
+    else:
+        from plan import PlanReader
+
+        # Streamed in chunks, without Owners and duplicated rows
+        plan = PlanReader(args.plan, sheet_name=args.sheet)
+
+        if args.dry_run:
+            estimate = dataset.batch_remove_users(plan, journal_path=args.journal, dry_run=True)
+            print(json.dumps(dict(estimate, plan=plan.stats)))
+            dataset.flush()
+
+            return 0
+
+        df = dataset.batch_remove_users(plan, journal_path=args.journal, report_path=args.report)
+
+        # Summary by status
+        statuses = df['update_status'].value_counts().to_dict() if len(df) > 0 else {}
+        print(json.dumps({'operations': len(df), 'statuses': statuses, 'plan': plan.stats}))
+
+        code = 0
+
+    dataset.flush()
+
+    return code
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='cli.py', description='Power BI REST API command line interface.')
+    parser.add_argument('--token', default='', help='bearer token, defaults to POWERBI_TOKEN or the app registration on TENANT_ID, CLIENT_ID and CLIENT_SECRET')
+    parser.add_argument('--sink', default='none', choices=['none', 'csv', 'jsonl', 'parquet', 'excel'], help='also export listings to ./data (default: none)')
+    parser.add_argument('--base-url', default='https://api.powerbi.com/v1.0/myorg', help='Power BI REST API base URL')
+    parser.add_argument('--pool-size', type=int, default=10, help='connections kept alive (default: 10)')
+    parser.add_argument('--metrics', default='', help='save the requests metrics (JSON) to this file')
+
+    groups = parser.add_subparsers(dest='group', required=True)
+
+    # Workspaces
+    workspaces = groups.add_parser('workspaces', help='workspaces commands')
+    commands = workspaces.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('list', help='list workspaces')
+    command.add_argument('--id', default='', help='workspace id')
+    command.add_argument('--name', default='', help='workspace name')
+    command.add_argument('--filter', default='', help="OData filter, e.g. \"contains(name,'Sales')\"")
+
+    command = commands.add_parser('users', help='list users of a workspace')
+    command.add_argument('workspace_id')
+
+    command = commands.add_parser('reports', help='list reports of a workspace')
+    command.add_argument('workspace_id')
+
+    workspaces.set_defaults(run=workspaces_command)
+
+    # Datasets
+    datasets = groups.add_parser('datasets', help='datasets commands')
+    commands = datasets.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('list', help='list datasets of a workspace')
+    command.add_argument('workspace_id')
+
+    command = commands.add_parser('users', help='list users of a dataset')
+    command.add_argument('workspace_id')
+    command.add_argument('dataset_id')
+
+    command = commands.add_parser('remove-users', help='remove users access to datasets (resumable)')
+    command.add_argument('--plan', required=True, help='CSV, JSONL, Parquet or Excel file with user_principal_name, workspace_id, dataset_id and access_right columns')
+    command.add_argument('--sheet', default='', help='Excel sheet of the plan, defaults to the active one')
+    command.add_argument('--journal', default='', help='journal file, to resume an interrupted run')
+    command.add_argument('--report', default='', help='Excel file to save the final report to')
+    command.add_argument('--dry-run', action='store_true', help='only print the requests needed and the time estimate')
+
+    datasets.set_defaults(run=datasets_command)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    client = Client(base_url=args.base_url, pool_size=args.pool_size)
+
+    try:
+        return args.run(args, client)
+
+    finally:
+        client.close()
+
+        if args.metrics != '':
+            client.metrics.save(args.metrics)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,247 @@
+import time
+import requests
+from typing import Dict
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from cache import ResponseCache
+from metrics import Metrics
+from retry import RetryPolicy
+from rate_limiter import RateLimiter
+
+
+class PowerBIError(Exception):
+
+    def __init__(self, status: int, content: Dict):
+        """
+        Error returned by the Power BI REST API.
+
+        Args:
+            status (int): HTTP status code.
+            content (Dict): response content.
+        """
+        self.status = status
+        self.content = content
+
+        error = content.get('error', {}) if isinstance(content, dict) else {}
+        message = error.get('message', '') or error.get('code', '') or 'request failed'
+
+        super().__init__(f'{status}: {message}')
+
+
+class Client:
+
+    def __init__(
+                self,
+                base_url: str = 'https://api.powerbi.com/v1.0/myorg',
+                pool_size: int = 10,
+                timeout: float = 60,
+                headers: Dict = {},
+                rate_limiter: RateLimiter = None,
+                cache_size: int = 256,
+                metrics: Metrics = None,
+                retry: RetryPolicy = None,
+                session: requests.Session = None):
+        """
+        Initialize variables.
+
+        A single client can be shared between Workspace and Dataset objects,
+        so all requests reuse the same keep-alive connections.
+
+        Args:
+            base_url (str, optional): Power BI REST API base URL.
+            pool_size (int, optional): maximum number of connections kept alive per host. Defaults to 10.
+            timeout (float, optional): seconds to wait for the server before giving up. Defaults to 60.
+            headers (Dict, optional): default headers sent on every request.
+            rate_limiter (RateLimiter, optional): quota scheduler, defaults to 200 requests per hour shared on the host.
+            cache_size (int, optional): maximum number of listings cached for the session, 0 to disable. Defaults to 256.
+            metrics (Metrics, optional): requests metrics, a new one is created if not informed.
+            retry (RetryPolicy, optional): retry policy, defaults to 5 retries with exponential backoff.
+            session (requests.Session, optional): connection pool of another client to share, a new one is created if not informed.
+        """
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.cache = ResponseCache(cache_size) if cache_size > 0 else None
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.retry = retry if retry is not None else RetryPolicy()
+
+        # Keep-alive connection pool
+        if session is not None:
+            self.session = session
+        else:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+            self.session = requests.Session()
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+
+        self.session.headers.update(headers)
+
+
+    def request(self, method: str, url: str, cache: bool = False, **kwargs) -> requests.Response:
+        """
+        Make a request using the shared connection pool, respecting the quota.
+
+        GET requests made with cache=True are memoized for the session (identical
+        requests in flight are sent only once). Successful changes (POST, PUT, DELETE)
+        drop the cached responses of the item they change.
+
+        Args:
+            method (str): HTTP method (GET, POST, PUT, DELETE).
+            url (str): request URL.
+            cache (bool, optional): use the session cache (GET only), don't use it for status polling. Defaults to False.
+            **kwargs: any other argument accepted by requests (headers, json, params...).
+
+        Returns:
+            requests.Response: response of the request.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+
+        if cache & (method == 'GET') & (self.cache is not None):
+            # Responses depend on the principal making the request
+            authorization = kwargs.get('headers', {}).get('Authorization', '')
+            key = (url, repr(kwargs.get('params', '')), authorization)
+
+            return self.cache.get(key, url, lambda: self._send(method, url, **kwargs))
+
+        response = self._send(method, url, **kwargs)
+
+        if (method != 'GET') & (self.cache is not None) & (response.status_code < 400):
+            self.cache.invalidate(self._item_path(url))
+
+        return response
+
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying throttled (429), transient (5xx) and connection
+        errors according to the retry policy.
+        """
+        attempt = 0
+
+        while True:
+            try:
+                response = self._send_once(method, url, **kwargs)
+
+            except (requests.ConnectionError, requests.Timeout):
+                if not self.retry.should_retry(method, attempt):
+                    raise
+
+                delay = self.retry.delay(attempt)
+
+            else:
+                if not self.retry.should_retry(method, attempt, response.status_code):
+                    return response
+
+                delay = self.retry.delay(attempt, response.headers.get('Retry-After', ''))
+
+                # Longer than the policy accepts to wait: give up instead of spending quota on failures
+                give_up = delay > self.retry.max_retry_after
+
+                # Hold every request sharing the quota, not only this one (also when giving up)
+                if (response.status_code == 429) & self.retry.block_on_throttle:
+                    self.rate_limiter.pause(delay)
+                    delay = 0
+
+                if give_up:
+                    return response
+
+                response.close()
+
+            self.metrics.record_retry(method, url)
+            time.sleep(delay)
+            attempt += 1
+
+
+    def _send_once(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, waiting for the quota if needed, and record its metrics.
+        """
+        self.metrics.record_quota_wait(self.rate_limiter.acquire())
+
+        with self.metrics.span(method, url) as span:
+            response = self.session.request(method=method, url=url, **kwargs)
+
+            span['status'] = response.status_code
+            span['bytes_sent'] = len(response.request.body or b'')
+
+            # Don't read streamed bodies here
+            if kwargs.get('stream', False):
+                span['bytes_received'] = int(response.headers.get('Content-Length', 0))
+            else:
+                span['bytes_received'] = len(response.content)
+
+        return response
+
+
+    def _item_path(self, url: str) -> str:
+        """
+        Path of the item changed by a request: the workspace or dataset for users
+        changes (e.g. /groups/{id}/users/{user} changes /groups/{id}), otherwise the parent path.
+        """
+        path = urlparse(url).path
+
+        if '/users' in path:
+            return path.split('/users')[0]
+
+        return path.rsplit('/', 1)[0]
+
+
+    def request_json(self, method: str, url: str, success: tuple = (200,), **kwargs) -> Dict:
+        """
+        Make a request and return the parsed content.
+
+        Args:
+            method (str): HTTP method (GET, POST, PUT, DELETE).
+            url (str): request URL.
+            success (tuple, optional): HTTP status codes of a successful request. Defaults to (200,).
+            **kwargs: any other argument accepted by requests (headers, json, params...).
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            Dict: response content.
+        """
+        r = self.request(method, url, **kwargs)
+
+        try:
+            content = r.json() if r.content else {}
+        except ValueError:
+            content = {'error': {'message': r.text}}
+
+        if r.status_code not in success:
+            raise PowerBIError(r.status_code, content)
+
+        return content
+
+
+    def get_json(self, url: str, **kwargs) -> Dict:
+        """
+        Make a GET request and return the parsed content, see request_json.
+        """
+        return self.request_json('GET', url, **kwargs)
+
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PUT', url, **kwargs)
+
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request('DELETE', url, **kwargs)
+
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+        self.session.close()
@@ -0,0 +1,206 @@
+import copy
+import requests
+from typing import Dict, Iterable, List, Tuple, Union
+from auth import Auth
+from client import Client
+from metrics import Metrics
+from retry import RetryPolicy
+from rate_limiter import RateLimiter
+
+
+class Credential:
+
+    def __init__(self, auth: Auth, client: Client):
+        """
+        Member of a credential pool: a service principal with its own token cache and quota.
+
+        Args:
+            auth (Auth): service principal token cache.
+            client (Client): client sending the requests of the service principal.
+        """
+        self.auth = auth
+        self.client = client
+
+
+    @property
+    def client_id(self) -> str:
+        return self.auth.client_id
+
+
+class CredentialPool(Client):
+
+    def __init__(
+                self,
+                credentials: Iterable[Tuple[str, str, str]],
+                base_url: str = 'https://api.powerbi.com/v1.0/myorg',
+                pool_size: int = 10,
+                timeout: float = 60,
+                headers: Dict = {},
+                max_requests: int = 200,
+                period: float = 3600,
+                state_file: str = './data/rate_limit.db',
+                cache_size: int = 256,
+                metrics: Metrics = None,
+                retry: RetryPolicy = None):
+        """
+        Initialize variables.
+
+        Client spreading the requests between several service principals, each one with
+        its own token cache and quota (tracked per client ID), so the number of requests
+        per hour grows with the number of principals. Each request is sent by the principal
+        with the most remaining quota; a throttled (429) principal is paused and the request
+        is sent again by the next one, and a request whose token isn't accepted (401) is sent
+        again by each of the other principals (once) before giving up.
+
+        Use it as both token and client: Workspace(pool), Dataset(pool), Scanner(pool).
+        All principals should have the same access to the workspaces.
+
+        Args:
+            credentials (Iterable[Tuple[str, str, str]]): (tenant ID, client ID, client secret) of each service principal.
+            base_url (str, optional): Power BI REST API base URL.
+            pool_size (int, optional): maximum number of connections kept alive per host, shared by all principals. Defaults to 10.
+            timeout (float, optional): seconds to wait for the server before giving up. Defaults to 60.
+            headers (Dict, optional): default headers sent on every request.
+            max_requests (int, optional): maximum number of requests per period of each principal. Defaults to 200.
+            period (float, optional): quota window size, in seconds. Defaults to 3600 (one hour).
+            state_file (str, optional): SQLite file to share the quotas between processes, None to keep them in memory.
+            cache_size (int, optional): maximum number of listings cached for the session, 0 to disable. Defaults to 256.
+            metrics (Metrics, optional): requests metrics of all principals, a new one is created if not informed.
+            retry (RetryPolicy, optional): retry policy, max_retries also limits the failovers of a throttled request.
+        """
+        super().__init__(
+                    base_url=base_url,
+                    pool_size=pool_size,
+                    timeout=timeout,
+                    headers=headers,
+                    rate_limiter=RateLimiter(state_file=None), # Not used, each principal has its own quota
+                    cache_size=cache_size,
+                    metrics=metrics,
+                    retry=retry)
+
+        # Throttling is handled by the pool (failover), other errors by each principal
+        member_retry = copy.copy(self.retry)
+        member_retry.statuses = tuple(status for status in self.retry.statuses if status != 429)
+        member_retry.retry_throttled = False
+
+        self.credentials: List[Credential] = []
+
+        for tenant_id, client_id, client_secret in credentials:
+            client = Client(
+                        base_url=base_url,
+                        timeout=timeout,
+                        rate_limiter=RateLimiter(max_requests, period, state_file, key=client_id),
+                        cache_size=0,
+                        metrics=self.metrics,
+                        retry=member_retry,
+                        session=self.session)
+
+            self.credentials.append(Credential(Auth(tenant_id, client_id, client_secret), client))
+
+        if len(self.credentials) == 0:
+            raise ValueError('at least one credential is required')
+
+
+    def get_headers(self) -> Dict:
+        """
+        Headers of the requests, the authorization is added by the principal sending each request.
+
+        Returns:
+            Dict: empty headers.
+        """
+        return {}
+
+
+    def _choose(self, exclude: List[Credential] = []) -> Credential:
+        """
+        Principal with the most remaining quota, not paused by a 429 (nor excluded).
+        """
+        return min(
+                    [credential for credential in self.credentials if credential not in exclude],
+                    key=lambda credential: (
+                        credential.client.rate_limiter.paused(),
+                        -credential.client.rate_limiter.remaining()))
+
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request with the principal with the most remaining quota,
+        failing over to another one if it gets throttled.
+        """
+        attempt = 0
+        unauthorized = []
+
+        while True:
+            credential = self._choose(unauthorized)
+            headers = {**kwargs.get('headers', {}), **credential.auth.get_headers()}
+
+            response = credential.client._send(method, url, **{**kwargs, 'headers': headers})
+
+            # Token of this principal not accepted (e.g. expired secret): try each other principal once
+            if response.status_code == 401:
+                unauthorized.append(credential)
+
+                if len(unauthorized) == len(self.credentials):
+                    return response
+
+                self.metrics.record_retry(method, url)
+                response.close()
+                continue
+
+            if (response.status_code != 429) or (not self.retry.should_retry(method, attempt, 429)):
+                return response
+
+            # Pause the throttled principal only, the next one sends the request
+            credential.client.rate_limiter.pause(self.retry.delay(attempt, response.headers.get('Retry-After', '')))
+
+            # Every principal paused longer than the policy accepts to wait: give up
+            if min(c.client.rate_limiter.paused() for c in self.credentials) > self.retry.max_retry_after:
+                return response
+
+            self.metrics.record_retry(method, url)
+            response.close()
+            attempt += 1
+
+
+    def remaining(self) -> int:
+        """
+        Number of requests all principals can still send on the current window.
+
+        Returns:
+            int: remaining requests.
+        """
+        return sum(credential.client.rate_limiter.remaining() for credential in self.credentials)
+
+
+    def close(self):
+        """
+        Stop the tokens refresh and close all pooled connections.
+        """
+        for credential in self.credentials:
+            credential.auth.close()
+
+        super().close()
+
+
+def client_for(token: Union[str, Auth, CredentialPool], client: Client = None) -> Client:
+    """
+    Client of a token: a CredentialPool is always its own client (it adds the authorization
+    of the principal sending each request), otherwise the client informed or a new one.
+
+    Args:
+        token (Union[str, Auth, CredentialPool]): bearer token, Auth object or CredentialPool.
+        client (Client, optional): shared HTTP client.
+
+    Raises:
+        ValueError: if the token is a CredentialPool and a different client is informed.
+
+    Returns:
+        Client: client to send the requests with.
+    """
+    if isinstance(token, CredentialPool):
+        if (client is not None) and (client is not token):
+            raise ValueError('a CredentialPool sends its own requests, pass it as the token only (client=None)')
+
+        return token
+
+    return client if client is not None else Client()
@@ -1,32 +1,73 @@
 import json
-import requests
-import pandas as pd
-from typing import Dict
-from utilities import create_directory
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Union
+from auth import Auth
+from client import Client, PowerBIError
+from credentials import CredentialPool, client_for
+from models import Collection, DatasetRecord, UserRecord
+from journal import Journal
+from metrics import endpoint_name
+from pagination import paginate
+from sinks import SinkWriter
+from utilities import create_directory, get_operation_status
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class Dataset:
 
-    def __init__(self, token: str):
+    def __init__(self, token: Union[str, Auth, CredentialPool], client: Client = None, sink: str = 'excel'):
         """
         Initialize variables.
+
+        Args:
+            token (Union[str, Auth, CredentialPool]): bearer token, Auth object to get a valid token on each request, or CredentialPool.
+            client (Client, optional): shared HTTP client, a new one is created if not informed (a CredentialPool token is its own client).
+            sink (str, optional): default export of list_* results: 'none', 'csv', 'jsonl', 'parquet' or 'excel'. Defaults to 'excel'.
         """
-        self.main_url = 'https://api.powerbi.com/v1.0/myorg'
+        self.client = client_for(token, client)
+        self.main_url = self.client.base_url
         self.token = token
-        self.headers = {'Authorization': f'Bearer {self.token}'}
+        self.sink = sink
+        self.sink_writer = SinkWriter()
         self.data_dir = './data/datasets'
 
         create_directory(self.data_dir)
 
 
+    @property
+    def headers(self) -> Dict:
+        """
+        Authorization header, asked to Auth on each request (when informed),
+        so long runs never use an expired token.
+
+        Returns:
+            Dict: header for authorization.
+        """
+        if isinstance(self.token, (Auth, CredentialPool)):
+            return self.token.get_headers()
+
+        return {'Authorization': f'Bearer {self.token}'}
+
+
+    def flush(self):
+        """
+        Wait for all exports still being written in the background.
+        """
+        self.sink_writer.flush()
+
+
     def list_datasets(
                 self, 
-                workspace_id: str = '') -> Dict:
+                workspace_id: str = '',
+                sink: str = '') -> Dict:
         """
         List all datasets on a specific workspace_id that the user has access to.
 
         Args:
             workspace_id (str, optional): workspace id to search datasets from.
+            sink (str, optional): export format ('none', 'csv', 'jsonl', 'parquet' or 'excel'), defaults to the object's sink.
 
         Returns:
             Dict: status message and content.
@@ -41,31 +82,106 @@ class Dataset:
 
         # If workspace ID was informed...
         else: 
-            filename = f'datasets_{workspace_id}.xlsx'
+            filename = f'datasets_{workspace_id}'
 
             # Make the request
-            r = requests.get(url=request_url, headers=self.headers)
+            r = self.client.get(url=request_url, headers=self.headers, cache=True)
 
             # Get HTTP status and content
             status = r.status_code
-            response = json.loads(r.content).get('value', '')
+            response = r.json()
 
             # If success...
             if status == 200:
-                # Save to Excel file
-                df = pd.DataFrame(response)
-                df.to_excel(f'{self.data_dir}/{filename}', index=False)
+                response = Collection(DatasetRecord, response.get('value', []))
+
+                # Export (in the background)
+                self.sink_writer.write(response, f'{self.data_dir}/{filename}', sink or self.sink)
                 
                 return {'message': 'Success', 'content': response}
 
             else:                
                 # If any error happens, return message.
-                response = json.loads(r.content)
                 error_message = response['error']['message']
 
                 return {'message': {'error': error_message, 'content': response}}
 
 
+    def list_users(
+                self,
+                workspace_id: str = '',
+                dataset_id: str = '',
+                sink: str = '') -> Dict:
+        """
+        List all users with access to a specific dataset.
+
+        Args:
+            workspace_id (str, optional): workspace id of the dataset.
+            dataset_id (str, optional): dataset id to search users from.
+            sink (str, optional): export format ('none', 'csv', 'jsonl', 'parquet' or 'excel'), defaults to the object's sink.
+
+        Returns:
+            Dict: status message and content.
+        """
+
+        # If workspace or dataset ID were not informed, return error message...
+        if (workspace_id == '') | (dataset_id == ''):
+            return {'message': 'Missing parameters, please check.', 'content': ''}
+
+        # If both were informed...
+        else:
+            # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/get-dataset-users-in-group
+            request_url = f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/users'
+            filename = f'users_{dataset_id}'
+
+            # Make the request
+            r = self.client.get(url=request_url, headers=self.headers, cache=True)
+
+            # Get HTTP status and content
+            status = r.status_code
+            response = r.json()
+
+            # If success...
+            if status == 200:
+                response = Collection(UserRecord, response.get('value', []))
+
+                # Export (in the background)
+                self.sink_writer.write(response, f'{self.data_dir}/{filename}', sink or self.sink)
+
+                return {'message': 'Success', 'content': response}
+
+            else:
+                # If any error happens, return message.
+                error_message = response['error']['message']
+
+                return {'message': {'error': error_message, 'content': response}}
+
+
+    def _fetch(self, url: str, cache: bool = False) -> Dict:
+        """
+        GET request returning the parsed content, raising PowerBIError if not successful.
+        Not cached by default: pages of the iterators would pile up on the session cache.
+        """
+        return self.client.get_json(url, headers=self.headers, cache=cache)
+
+
+    def iter_datasets(self, workspace_id: str) -> Iterator[Dict]:
+        """
+        Iterate over all datasets on a specific workspace_id.
+        The endpoint doesn't support $top/$skip, so only @odata.nextLink is followed.
+
+        Args:
+            workspace_id (str): workspace id to search datasets from.
+
+        Raises:
+            PowerBIError: if any request was not successful.
+
+        Returns:
+            Iterator[Dict]: datasets.
+        """
+        return paginate(self._fetch, f'{self.main_url}/groups/{workspace_id}/datasets')
+
+
     def add_user(
                 self, 
                 user_principal_name: str = '', 
@@ -92,8 +208,6 @@ class Dataset:
 
             request_url = self.main_url + f'/groups/{workspace_id}/datasets/{dataset_id}/users'
 
-            headers = {'Authorization': f'Bearer {self.token}'}
-
             # Add user to dataset with the specified access right.
             # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/post-dataset-user-in-group
             data = {
@@ -103,7 +217,7 @@ class Dataset:
             }
 
             # Make the request
-            r = requests.post(url=request_url, headers=headers, json=data)
+            r = self.client.post(url=request_url, headers=self.headers, json=data)
 
             # Get HTTP status and content
             status = r.status_code
@@ -149,8 +263,6 @@ class Dataset:
 
             request_url = self.main_url + f'/groups/{workspace_id}/datasets/{dataset_id}/users'
 
-            headers = {'Authorization': f'Bearer {self.token}'}
-
             # Add user to dataset with the specified access right.
             # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/post-dataset-user-in-group
             data = {
@@ -160,7 +272,7 @@ class Dataset:
             }
 
             # Make the request
-            r = requests.put(url=request_url, headers=headers, json=data)
+            r = self.client.put(url=request_url, headers=self.headers, json=data)
 
             # Get HTTP status and content
             status = r.status_code
@@ -205,8 +317,6 @@ class Dataset:
 
             request_url = self.main_url + f'/groups/{workspace_id}/datasets/{dataset_id}/users'
 
-            headers = {'Authorization': f'Bearer {self.token}'}
-
             # Add user to dataset with the specified access right.
             # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/post-dataset-user-in-group
             data = {
@@ -216,7 +326,7 @@ class Dataset:
             }
 
             # Make the request
-            r = requests.put(url=request_url, headers=headers, json=data)
+            r = self.client.put(url=request_url, headers=self.headers, json=data)
 
             # Get HTTP status and content
             status = r.status_code
@@ -240,3 +350,451 @@ class Dataset:
 
         else:
             return {'message': 'Missing parameters, please check.'}
+
+
+    def batch_apply(
+                self,
+                operations: Iterable,
+                action: str = 'remove',
+                journal_path: str = '',
+                report_path: str = '',
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Apply a stream of access changes to datasets, recording each outcome on an append-only journal.
+
+        When journal_path is informed, operations already recorded on it are skipped (unless
+        they were throttled), so an interrupted run can be restarted with the same operations
+        and journal. Otherwise each run records its outcomes on a new journal and resumes nothing.
+
+        Args:
+            operations (Iterable): (user_principal_name, workspace_id, dataset_id, access_right) tuples, or dicts with those keys.
+            action (str, optional): 'add', 'update' or 'remove'. Defaults to 'remove'.
+            journal_path (str, optional): journal file to resume. Defaults to a new ./data/datasets/journal_{action}_{timestamp}.jsonl.
+            report_path (str, optional): Excel file to save the final report to, if informed.
+            dry_run (bool, optional): don't send anything, return the cost estimate of the run instead. Defaults to False.
+
+        Returns:
+            DataFrame: last outcome of each operation recorded on the journal.
+            Dict: on dry_run, requests by endpoint, operations skipped and wall time estimate (see Estimator.estimate).
+        """
+        fields = ['user_principal_name', 'workspace_id', 'dataset_id', 'access_right']
+
+        # Only resume a journal asked for: a shared default one would skip operations of unrelated runs
+        resume = journal_path != ''
+
+        if not resume:
+            journal_path = f"{self.data_dir}/journal_{action}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jsonl"
+
+        journal = Journal(journal_path, key_fields=fields)
+
+        # Operations already done on previous runs
+        done = {key for key, record in journal.load().items() if record['status_code'] != 429} if resume else set()
+
+        if dry_run:
+            return self._estimate_batch(operations, action, fields, journal, done)
+
+        try:
+            for operation in operations:
+                if not isinstance(operation, dict):
+                    operation = dict(zip(fields, operation))
+
+                operation = {field: operation.get(field, '') for field in fields}
+
+                if journal.key(operation) in done:
+                    continue
+
+                # Owners access can't be removed
+                if (action == 'remove') & (operation['access_right'] == 'Owner'):
+                    update_status, status_code = 'Skipped', None
+
+                else:
+                    if action == 'add':
+                        response = self.add_user(**operation)
+                    elif action == 'update':
+                        response = self.update_user(**operation)
+                    else:
+                        operation_ = {field: operation[field] for field in fields[:3]}
+                        response = self.remove_user(**operation_)
+
+                    update_status, status_code = get_operation_status(response)
+
+                journal.append(dict(operation, action=action, update_status=update_status, status_code=status_code))
+                done.add(journal.key(operation))
+
+        finally:
+            journal.close()
+
+        # Final report, from the journal
+        import pandas as pd
+
+        df = pd.DataFrame(list(journal.load().values()))
+
+        if report_path != '':
+            df.to_excel(report_path, index=False)
+
+        return df
+
+
+    def _estimate_batch(self, operations: Iterable, action: str, fields: List[str], journal: Journal, done: set) -> Dict:
+        """
+        Requests batch_apply would send, by endpoint, and the operations it would skip.
+        """
+        from estimator import Estimator
+
+        method = {'add': 'POST', 'update': 'PUT'}.get(action, 'PUT')
+        skipped = {'done': 0, 'duplicated': 0, 'owners': 0, 'invalid': 0}
+        requests = {}
+        seen = set()
+
+        for operation in operations:
+            if not isinstance(operation, dict):
+                operation = dict(zip(fields, operation))
+
+            operation = {field: operation.get(field, '') for field in fields}
+            key = journal.key(operation)
+
+            if key in done:
+                skipped['done'] += 1
+                continue
+
+            if key in seen:
+                skipped['duplicated'] += 1
+                continue
+
+            seen.add(key)
+
+            if (action == 'remove') & (operation['access_right'] == 'Owner'):
+                skipped['owners'] += 1
+
+            # Sent without a request (missing parameters)
+            elif any(operation[field] == '' for field in fields[:3]):
+                skipped['invalid'] += 1
+
+            else:
+                url = f"{self.main_url}/groups/{operation['workspace_id']}/datasets/{operation['dataset_id']}/users"
+                endpoint = (method, endpoint_name(url))
+                requests[endpoint] = requests.get(endpoint, 0) + 1
+
+        return Estimator(self.client).estimate(requests, skipped)
+
+
+    def batch_remove_users(
+                self,
+                operations: Iterable,
+                journal_path: str = '',
+                report_path: str = '',
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Remove users access to datasets, see batch_apply.
+
+        Args:
+            operations (Iterable): (user_principal_name, workspace_id, dataset_id, access_right) tuples, or dicts with those keys.
+            journal_path (str, optional): journal file to resume. Defaults to a new ./data/datasets/journal_remove_{timestamp}.jsonl.
+            report_path (str, optional): Excel file to save the final report to, if informed.
+            dry_run (bool, optional): don't send anything, return the cost estimate of the run instead. Defaults to False.
+
+        Returns:
+            DataFrame: last outcome of each operation recorded on the journal (Dict: cost estimate, on dry_run).
+        """
+        return self.batch_apply(operations, action='remove', journal_path=journal_path, report_path=report_path, dry_run=dry_run)
+
+
+    def reconcile(
+                self,
+                desired: 'DataFrame',
+                current: 'DataFrame' = None,
+                prune: bool = False,
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Apply a desired state of datasets access rights, sending only the requests that change something
+        (users that already have the desired right, or were already removed, are skipped).
+
+        Args:
+            desired (DataFrame): 'principal', 'workspace_id', 'dataset_id' and 'right' columns (Read, ReadReshare..., or None to remove).
+            current (DataFrame, optional): current access rights, same columns. Requested for the datasets on desired if not informed.
+            prune (bool, optional): also remove users not listed on desired, on the datasets listed. Defaults to False.
+            dry_run (bool, optional): only list the current access (if needed), return the cost estimate of the changes instead. Defaults to False.
+
+        Raises:
+            PowerBIError: if the current users of any dataset can't be listed.
+
+        Returns:
+            DataFrame: changes applied, with action, status and status_code columns.
+            Dict: on dry_run, requests by endpoint (listings included), rows skipped and wall time estimate (see Estimator.estimate).
+        """
+        # Imported only when needed, so the CLI starts fast
+        import pandas as pd
+        from reconcile import apply_changes, plan_changes, plan_requests, plan_skipped
+
+        item_columns = ['workspace_id', 'dataset_id']
+        listings = 0
+
+        if current is None:
+            items = desired[item_columns].drop_duplicates()
+            listings = len(items)
+
+            rows = [
+                (workspace_id, dataset_id, user.get('identifier', ''), user.get('datasetUserAccessRight', ''))
+                for workspace_id, dataset_id in items.itertuples(index=False, name=None)
+                for user in self._fetch(f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/users').get('value', [])
+            ]
+            current = pd.DataFrame(rows, columns=item_columns + ['principal', 'right'])
+
+        plan = plan_changes(desired, current, item_columns=item_columns, prune=prune)
+
+        if dry_run:
+            from estimator import Estimator
+
+            users = '/groups/{id}/datasets/{id}/users'
+            requests = plan_requests(plan, {'add': ('POST', users), 'update': ('PUT', users), 'remove': ('PUT', users)})
+
+            # Listings aren't cached (see _fetch), so the actual run sends them again
+            if listings > 0:
+                requests[('GET', users)] = listings
+
+            return Estimator(self.client).estimate(requests, plan_skipped(desired, plan, item_columns))
+
+        return apply_changes(plan, {
+            'add': lambda row: self.add_user(row['principal'], row['workspace_id'], row['dataset_id'], row['right']),
+            'update': lambda row: self.update_user(row['principal'], row['workspace_id'], row['dataset_id'], row['right']),
+            'remove': lambda row: self.remove_user(row['principal'], row['workspace_id'], row['dataset_id']),
+        })
+
+
+    def execute_queries(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                queries: List[str],
+                include_nulls: bool = True,
+                impersonated_user: str = '') -> List[List[Dict]]:
+        """
+        Run DAX queries on a dataset.
+        Each query returns up to 100,000 rows or 1,000,000 values, see query.QueryExtractor for larger extractions.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): dataset id.
+            queries (List[str]): DAX queries (e.g. "EVALUATE 'Sales'").
+            include_nulls (bool, optional): return null values (otherwise their keys are omitted). Defaults to True.
+            impersonated_user (str, optional): user principal name to run the queries as (RLS), if any.
+
+        Raises:
+            PowerBIError: if the request, or any query, was not successful.
+
+        Returns:
+            List[List[Dict]]: rows of each query (keys are 'Table[Column]' or the query column names).
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/execute-queries-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/executeQueries'
+
+        data = {
+            'queries': [{'query': query} for query in queries],
+            'serializerSettings': {'includeNulls': include_nulls},
+        }
+
+        if impersonated_user != '':
+            data['impersonatedUserName'] = impersonated_user
+
+        response = self.client.request_json('POST', request_url, headers=self.headers, json=data)
+        results = []
+
+        for result in response.get('results', []):
+            if 'error' in result:
+                raise PowerBIError(400, result)
+
+            tables = result.get('tables', [])
+            results.append(tables[0].get('rows', []) if len(tables) > 0 else [])
+
+        return results
+
+
+    def create_push_dataset(
+                self,
+                workspace_id: str,
+                name: str,
+                tables: List[Dict],
+                retention_policy: str = 'None') -> Dict:
+        """
+        Create a push dataset, see push.table_schema to build the tables from DataFrames.
+
+        Args:
+            workspace_id (str): workspace id to create the dataset on.
+            name (str): dataset name.
+            tables (List[Dict]): tables, with 'name' and 'columns' ('name' and 'dataType' of each one).
+            retention_policy (str, optional): 'None' or 'basicFIFO' (keep the latest 200k rows). Defaults to 'None'.
+
+        Raises:
+            PowerBIError: if the dataset could not be created.
+
+        Returns:
+            Dict: dataset created (id, name...).
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/push-datasets/datasets-post-dataset-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/datasets?defaultRetentionPolicy={retention_policy}'
+
+        data = {'name': name, 'defaultMode': 'Push', 'tables': tables}
+
+        return self.client.request_json('POST', request_url, success=(201,), headers=self.headers, json=data)
+
+
+    def update_table(self, workspace_id: str, dataset_id: str, table: Dict):
+        """
+        Create or update the schema of a push dataset table.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): push dataset id.
+            table (Dict): table, with 'name' and 'columns' ('name' and 'dataType' of each one).
+
+        Raises:
+            PowerBIError: if the table could not be updated.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/push-datasets/datasets-put-table-in-group
+        request_url = f"{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/tables/{table['name']}"
+
+        self.client.request_json('PUT', request_url, headers=self.headers, json=table)
+
+
+    def post_rows(self, workspace_id: str, dataset_id: str, table_name: str, rows_json: str):
+        """
+        Add rows to a push dataset table (up to 10,000 rows per request).
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): push dataset id.
+            table_name (str): table name.
+            rows_json (str): rows, already serialized as a JSON array of records.
+
+        Raises:
+            PowerBIError: if the rows could not be added.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/push-datasets/datasets-post-rows-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/tables/{table_name}/rows'
+
+        # The rows are serialized by the caller, only wrapped here
+        headers = {**self.headers, 'Content-Type': 'application/json'}
+        data = ('{"rows":' + rows_json + '}').encode('utf-8')
+
+        self.client.request_json('POST', request_url, headers=headers, data=data)
+
+
+    def delete_rows(self, workspace_id: str, dataset_id: str, table_name: str):
+        """
+        Delete all rows of a push dataset table.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): push dataset id.
+            table_name (str): table name.
+
+        Raises:
+            PowerBIError: if the rows could not be deleted.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/push-datasets/datasets-delete-rows-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/tables/{table_name}/rows'
+
+        self.client.request_json('DELETE', request_url, headers=self.headers)
+
+
+    def refresh(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                notify_option: str = 'NoNotification',
+                options: Dict = {}) -> str:
+        """
+        Start a refresh of a dataset.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): dataset id.
+            notify_option (str, optional): 'NoNotification', 'MailOnFailure' or 'MailOnCompletion'. Defaults to 'NoNotification'.
+            options (Dict, optional): enhanced refresh options (type, commitMode, maxParallelism, objects...).
+
+        Raises:
+            PowerBIError: if the refresh could not be started.
+
+        Returns:
+            str: refresh request id, to track or cancel it.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/refresh-dataset-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/refreshes'
+
+        # Enhanced refresh options can't be sent with notifyOption
+        data = options if options != {} else {'notifyOption': notify_option}
+
+        r = self.client.post(url=request_url, headers=self.headers, json=data)
+
+        if r.status_code != 202:
+            try:
+                content = r.json()
+            except ValueError:
+                content = {'error': {'message': r.text}}
+
+            raise PowerBIError(r.status_code, content)
+
+        return r.headers.get('RequestId', '') or r.headers.get('x-ms-request-id', '')
+
+
+    def refresh_history(self, workspace_id: str, dataset_id: str, top: int = 1) -> List[Dict]:
+        """
+        Latest refreshes of a dataset, newest first (never cached, it's used for polling).
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): dataset id.
+            top (int, optional): number of refreshes. Defaults to 1.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            List[Dict]: refreshes (requestId, refreshType, startTime, endTime, status...).
+            Status is 'Unknown' while the refresh is running.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/get-refresh-history-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/refreshes?$top={top}'
+
+        return self.client.get_json(request_url, headers=self.headers, cache=False).get('value', [])
+
+
+    def refresh_status(self, workspace_id: str, dataset_id: str, request_id: str = '') -> Dict:
+        """
+        Status of a refresh, from the refresh history.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): dataset id.
+            request_id (str, optional): refresh request id, the latest refresh if not informed.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            Dict: refresh, empty if not found.
+        """
+        history = self.refresh_history(workspace_id, dataset_id, top=1 if request_id == '' else 5)
+
+        if request_id == '':
+            return history[0] if len(history) > 0 else {}
+
+        return next((refresh for refresh in history if refresh.get('requestId', '') == request_id), {})
+
+
+    def cancel_refresh(self, workspace_id: str, dataset_id: str, request_id: str):
+        """
+        Cancel a refresh (only enhanced refreshes can be cancelled).
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): dataset id.
+            request_id (str): refresh request id.
+
+        Raises:
+            PowerBIError: if the refresh could not be cancelled.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/cancel-refresh-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/datasets/{dataset_id}/refreshes/{request_id}'
+
+        self.client.request_json('DELETE', request_url, headers=self.headers)
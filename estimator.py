@@ -0,0 +1,172 @@
+import math
+from typing import Dict, Tuple
+from client import Client
+from credentials import CredentialPool
+
+
+# Seconds per request assumed when no request to the endpoint was measured yet
+DEFAULT_LATENCY = 0.5
+
+
+def wall_seconds(
+            requests: int,
+            latency: float,
+            workers: int,
+            credentials: int,
+            max_requests: int,
+            period: float,
+            remaining: int) -> float:
+    """
+    Time to send a number of requests: the longest of the time spent on the requests
+    themselves (latency spread over the workers) and the time waiting for the quota.
+
+    Requests up to the remaining quota are sent right away; each principal then gets
+    max_requests more per period, as the window slides.
+
+    Args:
+        requests (int): number of requests.
+        latency (float): mean seconds per request.
+        workers (int): requests sent at the same time.
+        credentials (int): number of principals sharing the requests.
+        max_requests (int): requests per period of each principal.
+        period (float): quota window size, in seconds.
+        remaining (int): requests all principals can still send on the current window.
+
+    Returns:
+        float: estimated seconds.
+    """
+    if requests == 0:
+        return 0.0
+
+    extra = max(requests - remaining, 0)
+    quota_seconds = math.ceil(extra / (max_requests * credentials)) * period
+
+    return max(quota_seconds + latency, math.ceil(requests / max(workers, 1)) * latency)
+
+
+class Estimator:
+
+    def __init__(self, client: Client, default_latency: float = DEFAULT_LATENCY):
+        """
+        Initialize variables.
+
+        Estimates the cost of a batch job before running it: requests per endpoint,
+        wall time under the client quota (200 requests per hour by default, per principal
+        on a CredentialPool) with the latency measured so far on client.metrics, and the
+        number of credentials and workers that fit the job in a target time.
+
+        Args:
+            client (Client): client (or CredentialPool) that will run the job.
+            default_latency (float, optional): seconds per request of endpoints not measured yet. Defaults to 0.5.
+        """
+        self.client = client
+        self.default_latency = default_latency
+
+
+    def quota(self) -> Dict:
+        """
+        Quota of the client.
+
+        Returns:
+            Dict: credentials, max_requests and period of each one, and remaining requests (all credentials).
+        """
+        if isinstance(self.client, CredentialPool):
+            rate_limiter = self.client.credentials[0].client.rate_limiter
+
+            return {
+                'credentials': len(self.client.credentials),
+                'max_requests': rate_limiter.max_requests,
+                'period': rate_limiter.period,
+                'remaining': self.client.remaining(),
+            }
+
+        rate_limiter = self.client.rate_limiter
+
+        return {
+            'credentials': 1,
+            'max_requests': rate_limiter.max_requests,
+            'period': rate_limiter.period,
+            'remaining': rate_limiter.remaining(),
+        }
+
+
+    def latencies(self) -> Dict[Tuple[str, str], float]:
+        """
+        Mean seconds per request of each endpoint measured so far, plus the mean of all of them on ('', '').
+
+        Returns:
+            Dict[Tuple[str, str], float]: mean seconds by (method, endpoint).
+        """
+        endpoints = self.client.metrics.to_json()['endpoints']
+        latencies = {(e['method'], e['endpoint']): e['mean_seconds'] for e in endpoints if e['count'] > 0}
+
+        count = sum(e['count'] for e in endpoints)
+        latencies[('', '')] = sum(e['mean_seconds'] * e['count'] for e in endpoints) / count if count > 0 else self.default_latency
+
+        return latencies
+
+
+    def estimate(
+                self,
+                requests: Dict[Tuple[str, str], int],
+                skipped: Dict[str, int] = {},
+                workers: int = 1,
+                target_seconds: float = 3600) -> Dict:
+        """
+        Estimate the cost of a job.
+
+        Args:
+            requests (Dict[Tuple[str, str], int]): number of requests by (method, endpoint), as named on the metrics.
+            skipped (Dict[str, int], optional): operations that won't be sent, by reason (duplicated, no_op...).
+            workers (int, optional): requests the job sends at the same time. Defaults to 1.
+            target_seconds (float, optional): time the job should fit in, for the recommendation. Defaults to 3600.
+
+        Returns:
+            Dict: requests (total), endpoints (method, endpoint, requests and mean_seconds), skipped, quota,
+            seconds (with the current credentials and workers) and recommended (credentials, workers and seconds).
+        """
+        quota = self.quota()
+        latencies = self.latencies()
+
+        endpoints = [
+            {
+                'method': method,
+                'endpoint': endpoint,
+                'requests': count,
+                'mean_seconds': latencies.get((method, endpoint), latencies[('', '')]),
+            }
+            for (method, endpoint), count in sorted(requests.items()) if count > 0
+        ]
+
+        total = sum(e['requests'] for e in endpoints)
+        latency = sum(e['mean_seconds'] * e['requests'] for e in endpoints) / total if total > 0 else 0
+
+        def seconds(credentials: int, workers: int) -> float:
+            # New principals start with a full window, fewer ones keep their share of the remaining quota
+            if credentials > quota['credentials']:
+                remaining = quota['remaining'] + (credentials - quota['credentials']) * quota['max_requests']
+            else:
+                remaining = quota['remaining'] * credentials // quota['credentials']
+
+            return wall_seconds(
+                        total, latency, workers, credentials, quota['max_requests'], quota['period'], remaining)
+
+        # Workers to send the requests on the target time, the smallest pool of credentials whose quota allows it
+        recommended_workers = min(max(math.ceil(total * latency / target_seconds), 1), max(total, 1))
+        max_credentials = max(math.ceil(total / quota['max_requests']), 1)
+        recommended_credentials = next(
+                    (c for c in range(1, max_credentials + 1) if seconds(c, recommended_workers) <= target_seconds),
+                    max_credentials)
+
+        return {
+            'requests': total,
+            'endpoints': endpoints,
+            'skipped': dict(skipped),
+            'quota': quota,
+            'seconds': seconds(quota['credentials'], workers),
+            'recommended': {
+                'credentials': recommended_credentials,
+                'workers': recommended_workers,
+                'seconds': seconds(recommended_credentials, recommended_workers),
+            },
+        }
@@ -0,0 +1,171 @@
+import os
+import time
+import heapq
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable
+from client import PowerBIError
+from workspace import Workspace
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+# Export job statuses of finished jobs
+FINISHED = {'Succeeded', 'Failed'}
+
+
+class ReportExporter:
+
+    def __init__(
+                self,
+                workspace: Workspace,
+                max_jobs: int = 5,
+                download_workers: int = 4,
+                directory: str = './data/exports',
+                min_poll: float = 5,
+                max_poll: float = 60,
+                backoff: float = 1.5,
+                timeout: float = 3600):
+        """
+        Initialize variables.
+
+        Exports many reports (or pages of reports) to files with exportTo: up to max_jobs
+        export jobs run on the service at the same time, a single thread polls all of them
+        (waiting the Retry-After the service asks for, otherwise a growing interval), and
+        finished files are streamed to disk by download_workers threads while the next jobs
+        are already running, so a slot is never held by a download.
+
+        Args:
+            workspace (Workspace): Workspace object used to start, poll and download the exports.
+            max_jobs (int, optional): maximum export jobs running at the same time. Defaults to 5.
+            download_workers (int, optional): number of files downloaded at the same time. Defaults to 4.
+            directory (str, optional): directory of the files without a path informed. Defaults to './data/exports'.
+            min_poll (float, optional): minimum seconds between status requests of a job. Defaults to 5.
+            max_poll (float, optional): maximum seconds between status requests of a job. Defaults to 60.
+            backoff (float, optional): growth of the interval between status requests. Defaults to 1.5.
+            timeout (float, optional): seconds to wait for each job. Defaults to 1 hour.
+        """
+        self.workspace = workspace
+        self.max_jobs = max_jobs
+        self.download_workers = download_workers
+        self.directory = directory
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.timeout = timeout
+
+
+    def _path(self, job: Dict, result: Dict, extension: str) -> str:
+        """
+        File of an export: the one informed, or <directory>/<report id>[_<pages>].<extension>.
+        """
+        if job.get('path', '') != '':
+            return job['path']
+
+        name = '_'.join([job['report_id']] + list(job.get('pages', [])))
+        extension = extension or '.' + result['format'].lower()
+
+        return os.path.join(self.directory, name + extension)
+
+
+    def run(self, jobs: Iterable[Dict]) -> 'DataFrame':
+        """
+        Export reports to files, respecting the concurrency limit.
+
+        Args:
+            jobs (Iterable[Dict]): exports, dicts with 'workspace_id', 'report_id' and optionally 'format' (defaults to 'PDF'),
+                'pages' (page names), 'configuration' (see Workspace.export_report) and 'path' (file to save to).
+
+        Returns:
+            DataFrame: workspace_id, report_id, pages, format, export_id, status, error, path, bytes, polls and seconds of each export.
+        """
+        import pandas as pd
+
+        jobs = list(jobs)
+        results = [
+            {
+                'workspace_id': job['workspace_id'], 'report_id': job['report_id'], 'pages': ','.join(job.get('pages', [])),
+                'format': job.get('format', 'PDF'), 'export_id': '', 'status': 'Pending', 'error': '', 'path': '',
+                'bytes': 0, 'polls': 0, 'seconds': 0.0,
+            }
+            for job in jobs
+        ]
+
+        waiting = deque(range(len(jobs)))
+        running = {}      # job index: (started, interval)
+        polls = []        # heap of (next poll time, job index)
+
+        def download(index: int, started: float, path: str):
+            result = results[index]
+
+            try:
+                size = self.workspace.download_export(result['workspace_id'], result['report_id'], result['export_id'], path)
+                result.update(status='Succeeded', bytes=size)
+            except Exception as e:
+                result.update(status='Failed', error=str(e))
+
+            result['seconds'] = time.time() - started
+
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            while True:
+                # Start jobs while there are free slots
+                while (len(waiting) > 0) and (len(running) < self.max_jobs):
+                    index = waiting.popleft()
+                    job, result = jobs[index], results[index]
+
+                    try:
+                        export = self.workspace.export_report(
+                                    job['workspace_id'], job['report_id'], format=result['format'],
+                                    pages=job.get('pages', []), configuration=job.get('configuration', {}))
+                    except PowerBIError as e:
+                        result.update(status='Failed', error=str(e))
+                        continue
+
+                    result.update(status='Running', export_id=export.get('id', ''))
+                    running[index] = (time.time(), self.min_poll)
+                    heapq.heappush(polls, (time.time() + max(export['retryAfter'], self.min_poll), index))
+
+                if len(running) == 0:
+                    break
+
+                # Poll the job expected to end first
+                next_poll, index = heapq.heappop(polls)
+                time.sleep(max(next_poll - time.time(), 0))
+
+                started, interval = running[index]
+                result = results[index]
+                result['polls'] += 1
+
+                try:
+                    export = self.workspace.export_status(result['workspace_id'], result['report_id'], result['export_id'])
+                    status = export.get('status', 'Unknown')
+                except PowerBIError as e:
+                    export, status = {'error': {'message': str(e)}, 'retryAfter': 0}, 'Unknown'
+
+                if status == 'Succeeded':
+                    # The slot is free as soon as the file is ready, it's downloaded in the background
+                    del running[index]
+                    path = self._path(jobs[index], result, export.get('resourceFileExtension', ''))
+                    result.update(status='Downloading', path=path)
+                    executor.submit(download, index, started, path)
+
+                elif status in FINISHED:
+                    del running[index]
+                    error = export.get('error', {})
+                    result.update(status=status, error=error.get('message', '') if isinstance(error, dict) else str(error),
+                                  seconds=time.time() - started)
+
+                elif time.time() - started > self.timeout:
+                    del running[index]
+                    result.update(status='TimedOut', error=f'not finished after {self.timeout} seconds',
+                                  seconds=time.time() - started)
+
+                else:
+                    # Still running: wait what the service asks for, otherwise longer each time
+                    interval = min(interval * self.backoff, self.max_poll)
+                    running[index] = (started, interval)
+                    wait = max(export['retryAfter'], self.min_poll) if export.get('retryAfter', 0) > 0 else interval
+                    heapq.heappush(polls, (time.time() + wait, index))
+
+        return pd.DataFrame(results)
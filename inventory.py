@@ -0,0 +1,436 @@
+import os
+import json
+import time
+import sqlite3
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+from pandas.core.frame import DataFrame
+from typing import Dict, Iterable, List
+from dataset import Dataset
+from scanner import Scanner
+from workspace import Workspace
+from utilities import create_directory
+
+
+# Seconds each listing is considered fresh
+DEFAULT_TTL = {
+    'workspaces': 24 * 3600,
+    'reports': 24 * 3600,
+    'datasets': 24 * 3600,
+    'users': 3600,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workspaces (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    name_key TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_workspaces_name ON workspaces (name_key);
+
+CREATE TABLE IF NOT EXISTS reports (
+    workspace_id TEXT,
+    id TEXT,
+    name TEXT,
+    name_key TEXT,
+    dataset_id TEXT,
+    dataset_workspace_id TEXT,
+    data TEXT,
+    PRIMARY KEY (workspace_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_reports_name ON reports (workspace_id, name_key);
+
+CREATE TABLE IF NOT EXISTS datasets (
+    workspace_id TEXT,
+    id TEXT,
+    name TEXT,
+    name_key TEXT,
+    data TEXT,
+    PRIMARY KEY (workspace_id, id)
+);
+CREATE INDEX IF NOT EXISTS idx_datasets_name ON datasets (workspace_id, name_key);
+
+CREATE TABLE IF NOT EXISTS users (
+    workspace_id TEXT,
+    identifier TEXT,
+    access_right TEXT,
+    principal_type TEXT,
+    data TEXT,
+    PRIMARY KEY (workspace_id, identifier)
+);
+
+CREATE TABLE IF NOT EXISTS loads (
+    entity TEXT,
+    scope TEXT,
+    loaded_at REAL,
+    PRIMARY KEY (entity, scope)
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def name_key(name: str) -> str:
+    """
+    Key for case-insensitive name lookups.
+    """
+    return str(name).strip().upper()
+
+
+class InventoryStore:
+
+    def __init__(
+                self,
+                workspace: Workspace,
+                dataset: Dataset = None,
+                path: str = './data/inventory.db',
+                ttl: Dict = {}):
+        """
+        Initialize variables.
+
+        Local SQLite copy of the listings, with case-insensitive name indexes.
+        Each listing (all workspaces, or the reports, datasets and users of a workspace)
+        is only requested again when older than its TTL.
+
+        Args:
+            workspace (Workspace): object used to list workspaces, reports and users.
+            dataset (Dataset, optional): object used to list datasets.
+            path (str, optional): SQLite file. Defaults to ./data/inventory.db.
+            ttl (Dict, optional): seconds each entity is fresh, overrides DEFAULT_TTL by entity name.
+        """
+        self.workspace = workspace
+        self.dataset = dataset
+        self.path = path
+        self.ttl = dict(DEFAULT_TTL, **ttl)
+
+        create_directory(os.path.dirname(os.path.abspath(path)))
+
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+
+    def _is_fresh(self, entity: str, scope: str = '') -> bool:
+        row = self.conn.execute(
+                    'SELECT loaded_at FROM loads WHERE entity = ? AND scope = ?', (entity, scope)).fetchone()
+
+        return (row is not None) and (time.time() - row[0] < self.ttl[entity])
+
+
+    def _loaded(self, entity: str, scope: str = ''):
+        self.conn.execute(
+                    'INSERT OR REPLACE INTO loads (entity, scope, loaded_at) VALUES (?, ?, ?)',
+                    (entity, scope, time.time()))
+
+
+    def load_workspaces(self, workspaces: Iterable[Dict]):
+        """
+        Replace the stored workspaces.
+
+        Args:
+            workspaces (Iterable[Dict]): workspaces, as returned by Workspace.list_workspaces.
+        """
+        rows = ((w['id'], w.get('name', ''), name_key(w.get('name', '')), json.dumps(dict(w))) for w in workspaces)
+
+        with self.conn:
+            self.conn.execute('DELETE FROM workspaces')
+            self.conn.executemany('INSERT OR REPLACE INTO workspaces VALUES (?, ?, ?, ?)', rows)
+            self._loaded('workspaces')
+
+
+    def load_reports(self, workspace_id: str, reports: Iterable[Dict]):
+        """
+        Replace the stored reports of a workspace.
+
+        Args:
+            workspace_id (str): workspace id.
+            reports (Iterable[Dict]): reports, as returned by Workspace.list_reports.
+        """
+        rows = ((workspace_id, r['id'], r.get('name', ''), name_key(r.get('name', '')),
+                 r.get('datasetId', ''), r.get('datasetWorkspaceId', workspace_id), json.dumps(dict(r)))
+                for r in reports)
+
+        with self.conn:
+            self.conn.execute('DELETE FROM reports WHERE workspace_id = ?', (workspace_id,))
+            self.conn.executemany('INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            self._loaded('reports', workspace_id)
+
+
+    def load_datasets(self, workspace_id: str, datasets: Iterable[Dict]):
+        """
+        Replace the stored datasets of a workspace.
+
+        Args:
+            workspace_id (str): workspace id.
+            datasets (Iterable[Dict]): datasets, as returned by Dataset.list_datasets.
+        """
+        rows = ((workspace_id, d['id'], d.get('name', ''), name_key(d.get('name', '')), json.dumps(dict(d)))
+                for d in datasets)
+
+        with self.conn:
+            self.conn.execute('DELETE FROM datasets WHERE workspace_id = ?', (workspace_id,))
+            self.conn.executemany('INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?, ?)', rows)
+            self._loaded('datasets', workspace_id)
+
+
+    def load_users(self, workspace_id: str, users: Iterable[Dict]):
+        """
+        Replace the stored users of a workspace.
+
+        Args:
+            workspace_id (str): workspace id.
+            users (Iterable[Dict]): users, as returned by Workspace.list_users.
+        """
+        rows = ((workspace_id, u.get('identifier', '') or u.get('emailAddress', ''),
+                 u.get('groupUserAccessRight', ''), u.get('principalType', ''), json.dumps(dict(u)))
+                for u in users)
+
+        with self.conn:
+            self.conn.execute('DELETE FROM users WHERE workspace_id = ?', (workspace_id,))
+            self.conn.executemany('INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)', rows)
+            self._loaded('users', workspace_id)
+
+
+    def load_scan(self, workspaces: Iterable[Dict]):
+        """
+        Store the workspaces returned by Scanner.scan, with their reports, datasets and users.
+
+        Args:
+            workspaces (Iterable[Dict]): scanned workspaces.
+        """
+        for workspace in workspaces:
+            if workspace.get('state', '') == 'Deleted':
+                self.remove_workspace(workspace['id'])
+                continue
+
+            data = {key: value for key, value in workspace.items() if key not in ('reports', 'datasets', 'users')}
+
+            with self.conn:
+                self.conn.execute(
+                            'INSERT OR REPLACE INTO workspaces VALUES (?, ?, ?, ?)',
+                            (workspace['id'], workspace.get('name', ''), name_key(workspace.get('name', '')), json.dumps(data)))
+
+            self.load_reports(workspace['id'], workspace['reports'])
+            self.load_datasets(workspace['id'], workspace['datasets'])
+            self.load_users(workspace['id'], workspace['users'])
+
+
+    def remove_workspace(self, workspace_id: str):
+        """
+        Remove a workspace and its reports, datasets and users from the store.
+
+        Args:
+            workspace_id (str): workspace id.
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM workspaces WHERE id = ?', (workspace_id,))
+
+            for table in ('reports', 'datasets', 'users'):
+                self.conn.execute(f'DELETE FROM {table} WHERE workspace_id = ?', (workspace_id,))
+
+
+    def sync(self, scanner: Scanner, full: bool = False, poll_interval: float = 5) -> int:
+        """
+        Incremental refresh of the store with the Scanner API.
+
+        Only workspaces modified since the last sync (the high-water mark) are scanned again,
+        so a sync costs a number of requests proportional to the changes, not to the tenant size.
+        The first sync (or one after more than 30 days, the API limit) scans every workspace.
+
+        Args:
+            scanner (Scanner): object used to list and scan workspaces.
+            full (bool, optional): scan every workspace, even if there is a high-water mark. Defaults to False.
+            poll_interval (float, optional): seconds between status requests of each scan. Defaults to 5.
+
+        Returns:
+            int: number of workspaces refreshed.
+        """
+        row = self.conn.execute("SELECT value FROM sync_state WHERE name = 'modified_since'").fetchone()
+        modified_since = row[0] if row is not None else ''
+
+        # modifiedSince accepts up to 30 days ago
+        oldest = datetime.now(timezone.utc) - timedelta(days=29)
+
+        if (modified_since != '') and (
+                    datetime.strptime(modified_since[:19], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc) < oldest):
+            full = True
+
+        # Taken before listing, so changes made during the sync are picked on the next one
+        started = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.0000000Z')
+
+        if full or (modified_since == ''):
+            workspace_ids = scanner.modified_workspaces()
+
+            # Workspaces that no longer exist
+            stored = {id for id, in self.conn.execute('SELECT id FROM workspaces')}
+            for workspace_id in stored - set(workspace_ids):
+                self.remove_workspace(workspace_id)
+
+        else:
+            workspace_ids = scanner.modified_workspaces(modified_since=modified_since)
+
+        self.load_scan(scanner.scan(workspace_ids, poll_interval=poll_interval))
+
+        with self.conn:
+            self.conn.execute(
+                        "INSERT OR REPLACE INTO sync_state (name, value) VALUES ('modified_since', ?)", (started,))
+            self._loaded('workspaces')
+
+        return len(workspace_ids)
+
+
+    def refresh_workspaces(self, force: bool = False):
+        """
+        Load all workspaces from the API, if stale.
+
+        Args:
+            force (bool, optional): load even if fresh. Defaults to False.
+        """
+        if force or not self._is_fresh('workspaces'):
+            self.load_workspaces(self.workspace.iter_workspaces())
+
+
+    def refresh_reports(self, workspace_id: str, force: bool = False):
+        """
+        Load the reports of a workspace from the API, if stale.
+
+        Args:
+            workspace_id (str): workspace id.
+            force (bool, optional): load even if fresh. Defaults to False.
+        """
+        if force or not self._is_fresh('reports', workspace_id):
+            self.load_reports(workspace_id, self.workspace.iter_reports(workspace_id))
+
+
+    def refresh_datasets(self, workspace_id: str, force: bool = False):
+        """
+        Load the datasets of a workspace from the API, if stale.
+
+        Args:
+            workspace_id (str): workspace id.
+            force (bool, optional): load even if fresh. Defaults to False.
+        """
+        if force or not self._is_fresh('datasets', workspace_id):
+            self.load_datasets(workspace_id, self.dataset.iter_datasets(workspace_id))
+
+
+    def refresh_users(self, workspace_id: str, force: bool = False):
+        """
+        Load the users of a workspace from the API, if stale.
+
+        Args:
+            workspace_id (str): workspace id.
+            force (bool, optional): load even if fresh. Defaults to False.
+        """
+        if force or not self._is_fresh('users', workspace_id):
+            self.load_users(workspace_id, self.workspace.iter_users(workspace_id))
+
+
+    def _lookup_table(self, rows: Iterable[tuple], columns: List[str]):
+        """
+        Fill a temporary table, to join against the stored entities.
+        """
+        self.conn.execute('DROP TABLE IF EXISTS temp.lookup')
+        self.conn.execute(f"CREATE TEMP TABLE lookup ({', '.join(columns)})")
+        self.conn.executemany(f"INSERT INTO temp.lookup VALUES ({', '.join('?' * len(columns))})", rows)
+
+
+    def resolve_workspaces(self, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Workspace ids by name (case-insensitive).
+
+        Args:
+            names (Iterable[str]): workspace names.
+
+        Returns:
+            Dict[str, str]: workspace id of each name found.
+        """
+        self.refresh_workspaces()
+
+        self._lookup_table(((name, name_key(name)) for name in set(names)), ['name', 'name_key'])
+        rows = self.conn.execute(
+                    'SELECT l.name, w.id FROM temp.lookup l JOIN workspaces w ON w.name_key = l.name_key').fetchall()
+
+        return dict(rows)
+
+
+    def resolve_reports(self, workspace_id: str, names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Reports by name (case-insensitive) on a workspace.
+
+        Args:
+            workspace_id (str): workspace id.
+            names (Iterable[str]): report names.
+
+        Returns:
+            Dict[str, Dict]: id, dataset_id and dataset_workspace_id of each report name found.
+        """
+        self.refresh_reports(workspace_id)
+
+        self._lookup_table(((name, name_key(name)) for name in set(names)), ['name', 'name_key'])
+        rows = self.conn.execute(
+                    """SELECT l.name, r.id, r.dataset_id, r.dataset_workspace_id
+                    FROM temp.lookup l
+                    JOIN reports r ON r.workspace_id = ? AND r.name_key = l.name_key""", (workspace_id,)).fetchall()
+
+        return {name: {'id': id, 'dataset_id': dataset_id, 'dataset_workspace_id': dataset_workspace_id}
+                for name, id, dataset_id, dataset_workspace_id in rows}
+
+
+    def resolve_frame(
+                self,
+                df: DataFrame,
+                workspace_column: str = 'Workspace',
+                report_column: str = '') -> DataFrame:
+        """
+        Add workspace_id (and report_id, dataset_id) columns to a table with workspace (and report) names.
+        Distinct names are resolved with a single indexed join, rows not found get empty ids.
+
+        Args:
+            df (DataFrame): table with names.
+            workspace_column (str, optional): column with workspace names. Defaults to 'Workspace'.
+            report_column (str, optional): column with report names, if any.
+
+        Returns:
+            DataFrame: table with the ids columns.
+        """
+        workspaces = self.resolve_workspaces(df[workspace_column].dropna().unique())
+        df = df.assign(workspace_id=df[workspace_column].map(workspaces).fillna(''))
+
+        if report_column == '':
+            return df
+
+        # Only the reports of the workspaces needed are loaded
+        for workspace_id in set(workspaces.values()):
+            self.refresh_reports(workspace_id)
+
+        pairs = df.loc[df['workspace_id'] != '', ['workspace_id', report_column]].drop_duplicates()
+        self._lookup_table(
+                    ((w, r, name_key(r)) for w, r in pairs.itertuples(index=False, name=None)),
+                    ['workspace_id', 'name', 'name_key'])
+
+        reports = pd.read_sql_query(
+                    """SELECT l.workspace_id, l.name AS report_name, r.id AS report_id, r.dataset_id
+                    FROM temp.lookup l
+                    JOIN reports r ON r.workspace_id = l.workspace_id AND r.name_key = l.name_key""", self.conn)
+        reports = reports.drop_duplicates(subset=['workspace_id', 'report_name'])
+
+        df = df.merge(
+                    reports,
+                    how='left',
+                    left_on=['workspace_id', report_column],
+                    right_on=['workspace_id', 'report_name'])
+        df = df.drop(columns='report_name')
+        df[['report_id', 'dataset_id']] = df[['report_id', 'dataset_id']].fillna('')
+
+        return df
+
+
+    def close(self):
+        """
+        Close the SQLite connection.
+        """
+        self.conn.close()
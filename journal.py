@@ -0,0 +1,93 @@
+import os
+import json
+import time
+from typing import Dict, Iterator, List
+from utilities import create_directory
+
+
+class Journal:
+
+    def __init__(self, path: str, key_fields: List[str]):
+        """
+        Initialize variables.
+
+        Append-only JSONL journal: each outcome is written as one line and
+        flushed right away, so a crash loses at most the operation in flight,
+        and the cost per operation doesn't grow with the journal size.
+
+        Args:
+            path (str): journal file path.
+            key_fields (List[str]): fields that identify an operation.
+        """
+        self.path = path
+        self.key_fields = key_fields
+
+        create_directory(os.path.dirname(os.path.abspath(path)))
+
+        self._file = None
+
+
+    def key(self, record: Dict) -> tuple:
+        """
+        Identifier of an operation.
+
+        Args:
+            record (Dict): operation or outcome.
+
+        Returns:
+            tuple: values of the key fields.
+        """
+        return tuple(record.get(field, '') for field in self.key_fields)
+
+
+    def records(self) -> Iterator[Dict]:
+        """
+        Read all outcomes recorded on the journal, in order.
+
+        Returns:
+            Iterator[Dict]: recorded outcomes.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # Ignore a partially written last line (crash while writing)
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+    def load(self) -> Dict[tuple, Dict]:
+        """
+        Last outcome of each operation recorded on the journal.
+
+        Returns:
+            Dict[tuple, Dict]: outcomes by operation key.
+        """
+        return {self.key(record): record for record in self.records()}
+
+
+    def append(self, record: Dict):
+        """
+        Record an outcome at the end of the journal.
+
+        Args:
+            record (Dict): outcome to be recorded.
+        """
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+        record = dict(record, timestamp=time.time())
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+
+    def close(self):
+        """
+        Close the journal file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,286 @@
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+from urllib.parse import urlparse
+
+
+# Collections whose next path segment is an id
+COLLECTIONS = {
+    'groups', 'datasets', 'reports', 'users', 'refreshes', 'exports',
+    'tables', 'dashboards', 'imports', 'scanStatus', 'scanResult',
+}
+
+# Latency histogram buckets, in seconds
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Endpoint of an URL, with ids replaced by {id} (e.g. /groups/{id}/users).
+
+    Args:
+        url (str): request URL.
+
+    Returns:
+        str: endpoint.
+    """
+    segments = urlparse(url).path.split('/')
+
+    # Remove the API version prefix (/v1.0/myorg)
+    if 'myorg' in segments:
+        segments = segments[segments.index('myorg') + 1:]
+
+    for i in range(1, len(segments)):
+        if (segments[i - 1] in COLLECTIONS) & (segments[i] != ''):
+            segments[i] = '{id}'
+
+    return '/' + '/'.join(segment for segment in segments if segment != '')
+
+
+class Metrics:
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        """
+        Initialize variables.
+
+        Per endpoint request metrics: latency histograms, status codes (including 429),
+        bytes transferred and retries, plus the time spent waiting for the quota.
+        Span callbacks are called when each request starts and ends, to feed a tracer.
+
+        Args:
+            buckets (tuple, optional): latency histogram buckets, in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self.quota_wait_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._span_callbacks = []
+
+
+    def _endpoint(self, method: str, url: str) -> Dict:
+        key = (method, endpoint_name(url))
+
+        if key not in self._endpoints:
+            self._endpoints[key] = {
+                'count': 0,
+                'seconds': 0.0,
+                'max_seconds': 0.0,
+                'buckets': [0] * len(self.buckets),
+                'statuses': {},
+                'bytes_sent': 0,
+                'bytes_received': 0,
+                'retries': 0,
+            }
+
+        return self._endpoints[key]
+
+
+    def record_request(
+                self,
+                method: str,
+                url: str,
+                status,
+                seconds: float,
+                bytes_sent: int = 0,
+                bytes_received: int = 0):
+        """
+        Record a finished request.
+
+        Args:
+            method (str): HTTP method.
+            url (str): request URL.
+            status: HTTP status code, or 'error' if no response was received.
+            seconds (float): request duration.
+            bytes_sent (int, optional): request body size. Defaults to 0.
+            bytes_received (int, optional): response body size. Defaults to 0.
+        """
+        with self._lock:
+            endpoint = self._endpoint(method, url)
+            endpoint['count'] += 1
+            endpoint['seconds'] += seconds
+            endpoint['max_seconds'] = max(endpoint['max_seconds'], seconds)
+            endpoint['statuses'][str(status)] = endpoint['statuses'].get(str(status), 0) + 1
+            endpoint['bytes_sent'] += bytes_sent
+            endpoint['bytes_received'] += bytes_received
+
+            for i, bucket in enumerate(self.buckets):
+                if seconds <= bucket:
+                    endpoint['buckets'][i] += 1
+
+
+    def record_retry(self, method: str, url: str):
+        """
+        Record a request that will be retried.
+        """
+        with self._lock:
+            self._endpoint(method, url)['retries'] += 1
+
+
+    def record_quota_wait(self, seconds: float):
+        """
+        Record time spent waiting for the quota.
+        """
+        with self._lock:
+            self.quota_wait_seconds += seconds
+
+
+    def add_span_callback(self, on_start: Callable[[Dict], None] = None, on_end: Callable[[Dict], None] = None):
+        """
+        Attach callbacks called when each request starts and ends.
+
+        Both receive the same span dict: method, url, endpoint and start_time; on_end
+        also gets status, seconds and error. Callbacks can store their own objects on it
+        (e.g. a tracer span created on on_start and finished on on_end).
+
+        Args:
+            on_start (Callable[[Dict], None], optional): called before the request is sent.
+            on_end (Callable[[Dict], None], optional): called after the request finished, or failed.
+        """
+        self._span_callbacks.append((on_start, on_end))
+
+
+    @contextmanager
+    def span(self, method: str, url: str) -> Iterator[Dict]:
+        """
+        Measure a request, calling the span callbacks.
+        The caller sets status, bytes_sent and bytes_received on the span.
+
+        Args:
+            method (str): HTTP method.
+            url (str): request URL.
+
+        Returns:
+            Iterator[Dict]: span.
+        """
+        span = {
+            'method': method,
+            'url': url,
+            'endpoint': endpoint_name(url),
+            'start_time': time.time(),
+            'status': 'error',
+            'bytes_sent': 0,
+            'bytes_received': 0,
+            'error': None,
+        }
+
+        for on_start, _ in self._span_callbacks:
+            if on_start is not None:
+                on_start(span)
+
+        started = time.perf_counter()
+
+        try:
+            yield span
+
+        except Exception as e:
+            span['error'] = e
+            raise
+
+        finally:
+            span['seconds'] = time.perf_counter() - started
+
+            self.record_request(
+                        method, url, span['status'], span['seconds'], span['bytes_sent'], span['bytes_received'])
+
+            for _, on_end in self._span_callbacks:
+                if on_end is not None:
+                    on_end(span)
+
+
+    def to_json(self) -> Dict:
+        """
+        Summary of the metrics.
+
+        Returns:
+            Dict: totals and metrics by endpoint.
+        """
+        with self._lock:
+            endpoints = [
+                {
+                    'method': method,
+                    'endpoint': endpoint,
+                    'count': values['count'],
+                    'mean_seconds': values['seconds'] / values['count'] if values['count'] else 0,
+                    'max_seconds': values['max_seconds'],
+                    'statuses': dict(values['statuses']),
+                    'bytes_sent': values['bytes_sent'],
+                    'bytes_received': values['bytes_received'],
+                    'retries': values['retries'],
+                }
+                for (method, endpoint), values in self._endpoints.items()
+            ]
+
+        return {
+            'requests': sum(e['count'] for e in endpoints),
+            'throttled': sum(e['statuses'].get('429', 0) for e in endpoints),
+            'retries': sum(e['retries'] for e in endpoints),
+            'quota_wait_seconds': self.quota_wait_seconds,
+            'endpoints': endpoints,
+        }
+
+
+    def to_prometheus(self, prefix: str = 'powerbi') -> str:
+        """
+        Metrics on the Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): metrics names prefix. Defaults to 'powerbi'.
+
+        Returns:
+            str: metrics.
+        """
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help: str):
+            lines.append(f'# HELP {prefix}_{name} {help}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            metric('request_duration_seconds', 'histogram', 'Requests latency.')
+            for (method, endpoint), values in endpoints:
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                for bucket, count in zip(self.buckets, values['buckets']):
+                    lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bucket}"}} {count}')
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {values["count"]}')
+                lines.append(f'{prefix}_request_duration_seconds_sum{{{labels}}} {values["seconds"]}')
+                lines.append(f'{prefix}_request_duration_seconds_count{{{labels}}} {values["count"]}')
+
+            metric('requests_total', 'counter', 'Requests by status code.')
+            for (method, endpoint), values in endpoints:
+                for status, count in sorted(values['statuses'].items()):
+                    lines.append(f'{prefix}_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}')
+
+            for name, help in [('bytes_sent', 'Request bodies size.'), ('bytes_received', 'Response bodies size.'), ('retries', 'Retried requests.')]:
+                metric(f'{name}_total', 'counter', help)
+                for (method, endpoint), values in endpoints:
+                    lines.append(f'{prefix}_{name}_total{{method="{method}",endpoint="{endpoint}"}} {values[name]}')
+
+            metric('quota_wait_seconds_total', 'counter', 'Time spent waiting for the requests quota.')
+            lines.append(f'{prefix}_quota_wait_seconds_total {self.quota_wait_seconds}')
+
+        return '\n'.join(lines) + '\n'
+
+
+    def save(self, path: str):
+        """
+        Save the JSON summary to a file.
+
+        Args:
+            path (str): file path.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, indent=4)
+
+
+    def reset(self):
+        """
+        Clear all metrics.
+        """
+        with self._lock:
+            self._endpoints = {}
+            self.quota_wait_seconds = 0.0
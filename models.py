@@ -0,0 +1,178 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Type
+
+
+class Record(Mapping):
+    """
+    Compact read-only record of an API item: known fields are kept on slots
+    (no per-item dict), unknown ones on a small dict, only when there are any.
+
+    Records behave like the dicts the API returns (record['id'], record.get('name'),
+    dict(record)), and known fields are also attributes (record.id). Use to_dict()
+    to serialise them (json.dumps(record.to_dict())).
+    """
+    __slots__ = ('_extra',)
+    _field_names = ()
+    _fields = frozenset()
+
+    def __init__(self, data: Dict = {}, **kwargs):
+        self._extra = None
+
+        for key, value in {**data, **kwargs}.items():
+            if key in self._fields:
+                object.__setattr__(self, key, value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+
+
+    def __getitem__(self, key: str):
+        if key in self._fields:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+
+        raise KeyError(key)
+
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._field_names:
+            if hasattr(self, key):
+                yield key
+
+        if self._extra is not None:
+            yield from self._extra
+
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+    def __setattr__(self, key: str, value):
+        if key != '_extra':
+            raise AttributeError(f'{type(self).__name__} is read-only')
+
+        object.__setattr__(self, key, value)
+
+
+    def to_dict(self) -> Dict:
+        """
+        Record as a plain dict, as returned by the API.
+
+        Returns:
+            Dict: record.
+        """
+        return {key: self[key] for key in self}
+
+
+    def __reduce__(self):
+        return type(self), (self.to_dict(),)
+
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.to_dict()})'
+
+
+def record_type(name: str, fields: Iterable[str]) -> Type[Record]:
+    """
+    Create a Record subclass with a slot for each field.
+
+    Args:
+        name (str): class name.
+        fields (Iterable[str]): field names, as returned by the API.
+
+    Returns:
+        Type[Record]: record class.
+    """
+    fields = tuple(fields)
+
+    return type(name, (Record,), {
+        '__slots__': fields, '_field_names': fields, '_fields': frozenset(fields), '__module__': __name__})
+
+
+# https://learn.microsoft.com/en-us/rest/api/power-bi/groups/get-groups#group
+WorkspaceRecord = record_type('WorkspaceRecord', [
+    'id', 'name', 'isReadOnly', 'isOnDedicatedCapacity', 'capacityId', 'defaultDatasetStorageFormat',
+    'dataflowStorageId', 'description', 'type', 'state',
+])
+
+# https://learn.microsoft.com/en-us/rest/api/power-bi/reports/get-reports-in-group#report
+ReportRecord = record_type('ReportRecord', [
+    'id', 'name', 'reportType', 'webUrl', 'embedUrl', 'datasetId', 'datasetWorkspaceId', 'appId',
+    'description', 'isFromPbix', 'isOwnedByMe', 'users', 'subscriptions',
+])
+
+# https://learn.microsoft.com/en-us/rest/api/power-bi/datasets/get-datasets-in-group#dataset
+DatasetRecord = record_type('DatasetRecord', [
+    'id', 'name', 'webUrl', 'configuredBy', 'createdDate', 'description', 'targetStorageMode',
+    'addRowsAPIEnabled', 'isRefreshable', 'isEffectiveIdentityRequired', 'isEffectiveIdentityRolesRequired',
+    'isOnPremGatewayRequired', 'createReportEmbedURL', 'qnaEmbedURL', 'upstreamDatasets', 'users',
+    'queryScaleOutSettings',
+])
+
+# Workspace (groupUserAccessRight) and dataset (datasetUserAccessRight) users
+UserRecord = record_type('UserRecord', [
+    'identifier', 'emailAddress', 'displayName', 'graphId', 'principalType', 'userType',
+    'groupUserAccessRight', 'datasetUserAccessRight',
+])
+
+# Outcome of an add/update/remove operation
+OperationRecord = record_type('OperationRecord', [
+    'id', 'name', 'status', 'status_code', 'error_code', 'error_message',
+])
+
+
+class Collection(list):
+
+    def __init__(self, record_type: Type[Record], items: Iterable[Dict] = ()):
+        """
+        List of records of the same type, converted to a DataFrame or Arrow table only when asked.
+
+        Args:
+            record_type (Type[Record]): record class (WorkspaceRecord, ReportRecord...).
+            items (Iterable[Dict], optional): items, as returned by the API.
+        """
+        super().__init__(item if isinstance(item, record_type) else record_type(item) for item in items)
+        self.record_type = record_type
+
+
+    def to_records(self) -> List[Dict]:
+        """
+        Records as plain dicts.
+
+        Returns:
+            List[Dict]: records.
+        """
+        return [record.to_dict() for record in self]
+
+
+    def to_frame(self, columns: List[str] = None):
+        """
+        Records as a DataFrame, one column per field.
+
+        Args:
+            columns (List[str], optional): columns to keep, all fields if not informed.
+
+        Returns:
+            DataFrame: records.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.to_records(), columns=columns)
+
+
+    def to_arrow(self):
+        """
+        Records as an Arrow table (requires pyarrow).
+
+        Returns:
+            pyarrow.Table: records.
+        """
+        import pyarrow as pa
+
+        return pa.Table.from_pylist(self.to_records())
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator
+
+
+def page_url(url: str, top: int = 0, skip: int = 0) -> str:
+    """
+    Add OData paging parameters to an URL.
+
+    Args:
+        url (str): request URL, with or without a query string.
+        top (int, optional): page size, 0 to not page. Defaults to 0.
+        skip (int, optional): number of items to skip. Defaults to 0.
+
+    Returns:
+        str: URL of the page.
+    """
+    if top == 0:
+        return url
+
+    separator = '&' if '?' in url else '?'
+
+    return f'{url}{separator}$top={top}&$skip={skip}'
+
+
+def paginate(fetch: Callable[[str], Dict], url: str, page_size: int = 0) -> Iterator[Dict]:
+    """
+    Iterate over the items of a listing, page by page.
+
+    Pages are requested with $top/$skip (when page_size is informed) or by following
+    @odata.nextLink. The next page is requested on a background thread while the caller
+    processes the current one, so at most two pages are held in memory.
+
+    Args:
+        fetch (Callable[[str], Dict]): function that requests an URL and returns the parsed body.
+        url (str): URL of the listing.
+        page_size (int, optional): number of items per page, 0 for endpoints without $top/$skip. Defaults to 0.
+
+    Returns:
+        Iterator[Dict]: items of the listing.
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(fetch, page_url(url, page_size, 0))
+    skip = 0
+
+    try:
+        while future is not None:
+            body = future.result()
+            items = body.get('value', [])
+            next_link = body.get('@odata.nextLink', '')
+            skip += len(items)
+
+            # Prefetch the next page, if there is any
+            if next_link != '':
+                future = executor.submit(fetch, next_link)
+            elif (page_size > 0) & (len(items) == page_size):
+                future = executor.submit(fetch, page_url(url, page_size, skip))
+            else:
+                future = None
+
+            yield from items
+
+    finally:
+        # Caller stopped iterating before the end
+        if future is not None:
+            future.cancel()
+
+        executor.shutdown(wait=False)
@@ -0,0 +1,215 @@
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, List
+
+# pandas is imported by the readers, so importing this module (e.g. from the CLI) stays fast
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from inventory import InventoryStore
+
+
+# Fields of the operations fed to the batch methods
+OPERATION_FIELDS = ['user_principal_name', 'workspace_id', 'dataset_id', 'access_right']
+
+
+def read_csv(path: str, chunk_size: int, **kwargs) -> Iterator['DataFrame']:
+    """
+    Read a CSV file chunk_size rows at a time, all values as strings.
+    """
+    import pandas as pd
+
+    yield from pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+
+def read_jsonl(path: str, chunk_size: int, **kwargs) -> Iterator['DataFrame']:
+    """
+    Read a JSONL file chunk_size lines at a time.
+    """
+    import pandas as pd
+
+    with pd.read_json(path, lines=True, dtype=False, chunksize=chunk_size) as reader:
+        yield from reader
+
+
+def read_parquet(path: str, chunk_size: int, **kwargs) -> Iterator['DataFrame']:
+    """
+    Read a Parquet file one record batch at a time (requires pyarrow).
+    """
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+
+def read_excel(path: str, chunk_size: int, sheet_name: str = '', **kwargs) -> Iterator['DataFrame']:
+    """
+    Read an Excel sheet row by row, with openpyxl on read-only mode (the sheet isn't loaded in memory).
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+
+    try:
+        sheet = workbook[sheet_name] if sheet_name != '' else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        columns = [str(column) for column in next(rows, [])]
+        chunk = []
+
+        for row in rows:
+            chunk.append(row)
+
+            if len(chunk) == chunk_size:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+
+        if len(chunk) > 0:
+            yield pd.DataFrame(chunk, columns=columns)
+
+    finally:
+        workbook.close()
+
+
+# File extension: reader
+READERS = {
+    '.csv': read_csv,
+    '.jsonl': read_jsonl,
+    '.parquet': read_parquet,
+    '.xlsx': read_excel,
+}
+
+
+class PlanReader:
+
+    def __init__(
+                self,
+                path: str,
+                inventory: 'InventoryStore' = None,
+                workspace_column: str = '',
+                report_column: str = '',
+                columns: Dict[str, str] = {},
+                sheet_name: str = '',
+                chunk_size: int = 10000,
+                drop_owners: bool = True):
+        """
+        Initialize variables.
+
+        Streams a plan of access changes (CSV, JSONL, Parquet or Excel) in chunks, so memory
+        stays flat regardless of the plan size. Each chunk is normalized before it's used:
+        columns renamed, names resolved to IDs on the inventory (when informed), and rows of
+        Owners, of workspaces/reports that no longer exist or without IDs are dropped, as are
+        operations already read on a previous chunk (the keys seen are kept, one per operation).
+
+        Args:
+            path (str): plan file (.csv, .jsonl, .parquet or .xlsx).
+            inventory (InventoryStore, optional): inventory to resolve workspace (and report) names to IDs.
+            workspace_column (str, optional): column with workspace names, resolved to workspace_id if informed.
+            report_column (str, optional): column with report names, resolved to report_id and dataset_id if informed.
+            columns (Dict[str, str], optional): columns to rename, e.g. {'emailAddress': 'user_principal_name'}.
+            sheet_name (str, optional): Excel sheet, the active one if not informed.
+            chunk_size (int, optional): rows per chunk. Defaults to 10000.
+            drop_owners (bool, optional): drop rows with 'Owner' access right (it can't be changed). Defaults to True.
+        """
+        extension = os.path.splitext(path)[1].lower()
+
+        if extension not in READERS:
+            raise ValueError(f"Invalid plan file '{path}', expected one of: {', '.join(READERS)}.")
+
+        if (workspace_column != '') & (inventory is None):
+            raise ValueError('an inventory is required to resolve workspace names')
+
+        self.path = path
+        self.inventory = inventory
+        self.workspace_column = workspace_column
+        self.report_column = report_column
+        self.columns = columns
+        self.sheet_name = sheet_name
+        self.chunk_size = chunk_size
+        self.drop_owners = drop_owners
+
+        self._reader = READERS[extension]
+
+        # Rows read and dropped, by reason (of the last iteration)
+        self.stats = {'rows': 0, 'owners': 0, 'not_found': 0, 'invalid': 0, 'duplicated': 0}
+
+        # Operations read so far (of the last iteration), to drop duplicates across chunks
+        self._seen = set()
+
+
+    def _normalize(self, df: 'DataFrame') -> 'DataFrame':
+        """
+        Rename columns, resolve names to IDs and drop the rows that can't be applied.
+        """
+        self.stats['rows'] += len(df)
+
+        df = df.rename(columns=self.columns).fillna('').astype(str)
+
+        # Names to IDs
+        if self.workspace_column != '':
+            df = self.inventory.resolve_frame(df, workspace_column=self.workspace_column, report_column=self.report_column)
+
+            # Workspaces or reports that no longer exist
+            id_column = 'report_id' if self.report_column != '' else 'workspace_id'
+            not_found = df[id_column] == ''
+            self.stats['not_found'] += int(not_found.sum())
+            df = df.loc[~not_found]
+
+        if (self.drop_owners) & ('access_right' in df.columns):
+            owners = df['access_right'].str.lower() == 'owner'
+            self.stats['owners'] += int(owners.sum())
+            df = df.loc[~owners]
+
+        # Rows without user or workspace
+        required = [column for column in ['user_principal_name', 'workspace_id'] if column in df.columns]
+        invalid = (df[required] == '').any(axis=1)
+        self.stats['invalid'] += int(invalid.sum())
+        df = df.loc[~invalid]
+
+        # Operations already read, on this chunk or a previous one
+        fields = [field for field in OPERATION_FIELDS if field in df.columns]
+        keep = []
+
+        for key in df[fields].itertuples(index=False, name=None):
+            keep.append(key not in self._seen)
+            self._seen.add(key)
+
+        self.stats['duplicated'] += keep.count(False)
+
+        return df.loc[keep]
+
+
+    def chunks(self) -> Iterator['DataFrame']:
+        """
+        Iterate over the normalized chunks of the plan.
+
+        Returns:
+            Iterator[DataFrame]: chunks.
+        """
+        self.stats = dict.fromkeys(self.stats, 0)
+        self._seen = set()
+
+        for chunk in self._reader(self.path, self.chunk_size, sheet_name=self.sheet_name):
+            df = self._normalize(chunk)
+
+            if len(df) > 0:
+                yield df
+
+
+    def operations(self, fields: List[str] = OPERATION_FIELDS) -> Iterator[Dict]:
+        """
+        Iterate over the operations of the plan, as expected by Dataset.batch_apply.
+
+        Args:
+            fields (List[str], optional): fields of each operation. Defaults to user_principal_name, workspace_id, dataset_id and access_right.
+
+        Returns:
+            Iterator[Dict]: operations.
+        """
+        for df in self.chunks():
+            columns = [field for field in fields if field in df.columns]
+
+            for row in df[columns].itertuples(index=False, name=None):
+                yield dict(zip(columns, row))
+
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.operations()
@@ -0,0 +1,230 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator
+from client import PowerBIError
+from dataset import Dataset
+from journal import Journal
+from rate_limiter import RateLimiter
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+# Maximum rows per request and POST rows requests per minute of a push dataset
+MAX_ROWS = 10000
+MAX_REQUESTS_PER_MINUTE = 120
+
+# Fields that identify a chunk on the journal
+CHUNK_FIELDS = ['dataset_id', 'table', 'batch_id', 'chunk']
+
+
+def data_type(dtype) -> str:
+    """
+    Push dataset data type of a pandas dtype.
+    """
+    kind = getattr(dtype, 'kind', 'O')
+
+    if kind in 'iu':
+        return 'Int64'
+    if kind == 'f':
+        return 'Double'
+    if kind == 'b':
+        return 'Boolean'
+    if kind == 'M':
+        return 'DateTime'
+
+    return 'String'
+
+
+def table_schema(name: str, data) -> Dict:
+    """
+    Table of a push dataset, with the columns (and types) of a DataFrame or Arrow table.
+
+    Args:
+        name (str): table name.
+        data (DataFrame, pyarrow.Table or pyarrow.RecordBatch): data with the table columns.
+
+    Returns:
+        Dict: table, as expected by Dataset.create_push_dataset and Dataset.update_table.
+    """
+    # Only the types are needed, no rows are converted
+    if hasattr(data, 'schema'):
+        data = data.schema.empty_table().to_pandas()
+
+    return {
+        'name': name,
+        'columns': [{'name': str(column), 'dataType': data_type(dtype)} for column, dtype in data.dtypes.items()],
+    }
+
+
+class RowPusher:
+
+    def __init__(
+                self,
+                dataset: Dataset,
+                workers: int = 4,
+                chunk_rows: int = MAX_ROWS,
+                journal_path: str = '',
+                max_requests: int = MAX_REQUESTS_PER_MINUTE):
+        """
+        Initialize variables.
+
+        Posts rows to a push dataset table from a DataFrame or an iterator of DataFrames or
+        Arrow record batches. Rows are regrouped into chunks of chunk_rows (small batches are
+        merged, so each request carries as many rows as allowed), serialized straight from the
+        columns with DataFrame.to_json and posted by workers threads, up to max_requests per
+        minute on each dataset. Requests also count on the client rate limiter, so use a client
+        whose quota allows the expected rate.
+
+        When journal_path is informed, the outcome of each chunk is recorded on it: running the
+        same push again (same data, batch_id and chunk_rows) only posts the chunks that failed
+        or were not posted yet.
+
+        Args:
+            dataset (Dataset): Dataset object used to post the rows.
+            workers (int, optional): number of requests sent at the same time. Defaults to 4.
+            chunk_rows (int, optional): rows per request, up to 10,000. Defaults to 10000.
+            journal_path (str, optional): journal file, to resume a partially failed push.
+            max_requests (int, optional): maximum requests per minute on each dataset. Defaults to 120.
+        """
+        if not 0 < chunk_rows <= MAX_ROWS:
+            raise ValueError(f'chunk_rows must be between 1 and {MAX_ROWS}')
+
+        self.dataset = dataset
+        self.workers = workers
+        self.chunk_rows = chunk_rows
+        self.journal_path = journal_path
+        self.max_requests = max_requests
+
+        self._limiters = {}
+
+
+    def _limiter(self, dataset_id: str) -> RateLimiter:
+        if dataset_id not in self._limiters:
+            self._limiters[dataset_id] = RateLimiter(self.max_requests, 60, state_file=None, key=dataset_id)
+
+        return self._limiters[dataset_id]
+
+
+    def chunks(self, data) -> Iterator['DataFrame']:
+        """
+        Regroup the rows into DataFrames of chunk_rows rows (the last one may be smaller).
+
+        Args:
+            data (DataFrame, pyarrow.Table or iterable of DataFrames or pyarrow.RecordBatch): rows.
+
+        Returns:
+            Iterator[DataFrame]: chunks.
+        """
+        import pandas as pd
+
+        if hasattr(data, 'to_pandas') or isinstance(data, pd.DataFrame):
+            data = [data]
+
+        buffer = []
+        buffered = 0
+
+        for batch in data:
+            if hasattr(batch, 'to_pandas'):
+                batch = batch.to_pandas()
+
+            if len(batch) == 0:
+                continue
+
+            buffer.append(batch)
+            buffered += len(batch)
+
+            if buffered < self.chunk_rows:
+                continue
+
+            df = pd.concat(buffer, ignore_index=True) if len(buffer) > 1 else batch
+            full = len(df) - len(df) % self.chunk_rows
+
+            for start in range(0, full, self.chunk_rows):
+                yield df.iloc[start:start + self.chunk_rows]
+
+            buffer = [df.iloc[full:]] if full < len(df) else []
+            buffered = len(df) - full
+
+        if buffered > 0:
+            yield pd.concat(buffer, ignore_index=True) if len(buffer) > 1 else buffer[0]
+
+
+    def _post(self, workspace_id: str, dataset_id: str, table: str, rows_json: str, record: Dict) -> Dict:
+        """
+        Post a serialized chunk, returning its outcome.
+        """
+        self._limiter(dataset_id).acquire()
+
+        try:
+            self.dataset.post_rows(workspace_id, dataset_id, table, rows_json)
+            record.update(status='Success', status_code=200, error='')
+        except PowerBIError as e:
+            record.update(status='Failed', status_code=e.status, error=str(e))
+        except Exception as e:
+            record.update(status='Failed', status_code=0, error=str(e))
+
+        return record
+
+
+    def push(self, workspace_id: str, dataset_id: str, table: str, data, batch_id: str = '') -> Dict:
+        """
+        Post rows to a push dataset table.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): push dataset id.
+            table (str): table name.
+            data (DataFrame, pyarrow.Table or iterable of DataFrames or pyarrow.RecordBatch): rows, columns named as the table ones.
+            batch_id (str, optional): identifier of the data on the journal, to resume it later.
+
+        Returns:
+            Dict: number of chunks and rows posted, chunks skipped (already posted) and failed.
+        """
+        journal = Journal(self.journal_path, CHUNK_FIELDS) if self.journal_path != '' else None
+        posted = set()
+
+        if journal is not None:
+            posted = {key for key, record in journal.load().items() if record.get('status', '') == 'Success'}
+
+        stats = {'chunks': 0, 'rows': 0, 'skipped': 0, 'failed': 0}
+
+        def collect(record: Dict):
+            if journal is not None:
+                journal.append(record)
+
+            if record['status'] == 'Success':
+                stats['chunks'] += 1
+                stats['rows'] += record['rows']
+            else:
+                stats['failed'] += 1
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+
+            try:
+                for chunk, df in enumerate(self.chunks(data)):
+                    record = {'dataset_id': dataset_id, 'table': table, 'batch_id': batch_id, 'chunk': chunk, 'rows': len(df)}
+
+                    if journal is not None and journal.key(record) in posted:
+                        stats['skipped'] += 1
+                        continue
+
+                    # Keep at most two requests per worker in flight, so memory stays bounded
+                    while len(pending) >= self.workers * 2:
+                        collect(pending.popleft().result())
+
+                    rows_json = df.to_json(orient='records', date_format='iso')
+                    pending.append(executor.submit(self._post, workspace_id, dataset_id, table, rows_json, record))
+
+                while len(pending) > 0:
+                    collect(pending.popleft().result())
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
+                if journal is not None:
+                    journal.close()
+
+        return stats
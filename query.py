@@ -0,0 +1,261 @@
+import math
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+from dataset import Dataset
+
+
+def column_name(key: str) -> str:
+    """
+    Column name of a query result key ('Sales[Amount]' -> 'Amount', '[Total]' -> 'Total').
+    """
+    if key.endswith(']') and '[' in key:
+        return key[key.rindex('[') + 1:-1]
+
+    return key
+
+
+class QueryExtractor:
+
+    def __init__(
+                self,
+                dataset: Dataset,
+                workers: int = 4,
+                max_rows: int = 100000,
+                max_values: int = 1000000,
+                max_bytes: int = 15 * 1024 * 1024):
+        """
+        Initialize variables.
+
+        Extracts large tables from a dataset with DAX queries (executeQueries), splitting
+        them into windows of a numeric key column that stay under the per-query limits.
+        Windows run concurrently; each result is converted to an Arrow table as soon as it
+        arrives and written to Parquet in order, so at most a few windows are kept in memory.
+        A window that hits a limit but can't be split any further (a single key value) is
+        written as returned, and flagged as truncated on the report. Requires pyarrow.
+
+        Args:
+            dataset (Dataset): Dataset object used to run the queries.
+            workers (int, optional): number of windows queried at the same time. Defaults to 4.
+            max_rows (int, optional): maximum rows per query. Defaults to 100000.
+            max_values (int, optional): maximum values (rows x columns) per query. Defaults to 1000000.
+            max_bytes (int, optional): maximum response size per query, rows after it are cut by the service. Defaults to 15 MB.
+        """
+        self.dataset = dataset
+        self.workers = workers
+        self.max_rows = max_rows
+        self.max_values = max_values
+        self.max_bytes = max_bytes
+
+
+    def _query(self, workspace_id: str, dataset_id: str, query: str) -> List[Dict]:
+        return self.dataset.execute_queries(workspace_id, dataset_id, [query])[0]
+
+
+    def _window_query(
+                self,
+                table: str,
+                key_column: str,
+                columns: List[str],
+                low: float,
+                high: float,
+                last: bool,
+                **kwargs) -> str:
+        """
+        DAX query of the rows with key_column between low (inclusive) and high (exclusive, inclusive on the last window).
+        """
+        key = f"'{table}'[{key_column}]"
+        condition = f"{key} >= {low} && {key} {'<=' if last else '<'} {high}"
+        query = f"CALCULATETABLE('{table}', {condition})"
+
+        if len(columns) > 0:
+            selected = ', '.join(f'"{column}", \'{table}\'[{column}]' for column in columns)
+            query = f'SELECTCOLUMNS({query}, {selected})'
+
+        return f'EVALUATE {query}'
+
+
+    def _fetch_window(self, workspace_id: str, dataset_id: str, window: Dict) -> Tuple['pyarrow.Table', List[Dict]]:
+        """
+        Query a window as an Arrow table, splitting it in half while it hits the rows or bytes limit.
+        Returns the table and the report of the windows queried (low, high, rows and truncated).
+        """
+        import pyarrow as pa
+
+        low, high = window['low'], window['high']
+        rows = self._query(workspace_id, dataset_id, self._window_query(**window))
+
+        if isinstance(low, int) and isinstance(high, int):
+            middle = low + (high - low) // 2
+        else:
+            middle = (low + high) / 2
+
+        # Same serialization as the response, to know if the service cut it
+        full = (len(rows) >= window['limit']) or (len(json.dumps(rows, separators=(',', ':'))) >= self.max_bytes)
+
+        if full and (low < middle < high):
+            del rows
+
+            first, first_report = self._fetch_window(workspace_id, dataset_id, dict(window, high=middle, last=False))
+            second, second_report = self._fetch_window(workspace_id, dataset_id, dict(window, low=middle))
+
+            return pa.concat_tables([first, second]), first_report + second_report
+
+        # Straight to columns, the rows are dropped right after
+        result = pa.Table.from_pylist(rows)
+        report = [{'low': low, 'high': high, 'rows': len(rows), 'truncated': full}]
+
+        return result.rename_columns([column_name(name) for name in result.column_names]), report
+
+
+    def windows(self, workspace_id: str, dataset_id: str, table: str, key_column: str, columns: List[str] = []) -> List[Dict]:
+        """
+        Split a table into windows of its key column, sized to stay under the query limits.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): dataset id.
+            table (str): table name.
+            key_column (str): numeric column to split the table by.
+            columns (List[str], optional): columns to extract, all if not informed.
+
+        Raises:
+            PowerBIError: if the queries were not successful.
+
+        Returns:
+            List[Dict]: table, key_column, columns, low, high, last (high is inclusive) and limit (rows) of each window.
+        """
+        key = f"'{table}'[{key_column}]"
+        stats = self._query(
+                    workspace_id, dataset_id,
+                    f'EVALUATE ROW("min", MIN({key}), "max", MAX({key}), "rows", COUNTROWS(\'{table}\'))')[0]
+        stats = {column_name(name): value for name, value in stats.items()}
+
+        if (stats['rows'] or 0) == 0:
+            return []
+
+        # Number of columns, to respect the values limit
+        if len(columns) == 0:
+            sample = self._query(workspace_id, dataset_id, f"EVALUATE TOPN(1, '{table}')")
+            n_columns = max(len(sample[0]) if len(sample) > 0 else 1, 1)
+        else:
+            n_columns = len(columns)
+
+        window_rows = min(self.max_rows, self.max_values // n_columns)
+
+        # Some slack for an uneven distribution of the keys, windows that still hit the limit are split
+        n_windows = max(math.ceil(stats['rows'] * 1.2 / window_rows), 1)
+        low, high = stats['min'], stats['max']
+        step = (high - low) / n_windows
+
+        if isinstance(low, int) and isinstance(high, int):
+            step = max(math.ceil(step), 1)
+
+        windows = []
+        start = low
+
+        while start <= high:
+            end = start + step
+            last = end >= high
+            windows.append({
+                'table': table, 'key_column': key_column, 'columns': columns,
+                'low': start, 'high': high if last else end, 'last': last, 'limit': window_rows,
+            })
+
+            if last:
+                break
+
+            start = end
+
+        return windows
+
+
+    def to_parquet(
+                self,
+                workspace_id: str,
+                dataset_id: str,
+                table: str,
+                key_column: str,
+                path: str,
+                columns: List[str] = [],
+                schema=None) -> Dict:
+        """
+        Extract a table to a Parquet file, window by window.
+
+        Args:
+            workspace_id (str): workspace id of the dataset.
+            dataset_id (str): dataset id.
+            table (str): table name.
+            key_column (str): numeric column to split the table by.
+            path (str): Parquet file.
+            columns (List[str], optional): columns to extract, all if not informed.
+            schema (pyarrow.Schema, optional): schema of the file, inferred from the first window if not informed.
+
+        Raises:
+            PowerBIError: if any query was not successful.
+
+        Returns:
+            Dict: number of windows, rows written, windows truncated (hit a limit on a single key value, some rows
+            are missing) and report (low, high, rows and truncated of each window queried, after the splits).
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        windows = self.windows(workspace_id, dataset_id, table, key_column, columns)
+        n_windows = len(windows)
+
+        writer = None
+        rows = 0
+        report = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            windows = iter(windows)
+
+            try:
+                while True:
+                    # Keep at most two windows per worker in flight, so memory stays bounded
+                    while len(pending) < self.workers * 2:
+                        window = next(windows, None)
+
+                        if window is None:
+                            break
+
+                        pending.append(executor.submit(self._fetch_window, workspace_id, dataset_id, window))
+
+                    if len(pending) == 0:
+                        break
+
+                    result, window_report = pending.popleft().result()
+                    report.extend(window_report)
+
+                    if result.num_rows == 0:
+                        continue
+
+                    if writer is None:
+                        if schema is None:
+                            # Columns null on the first window are kept as strings
+                            schema = pa.schema([
+                                pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                                for field in result.schema
+                            ])
+
+                        writer = pq.ParquetWriter(path, schema)
+
+                    writer.write_table(result.select(schema.names).cast(schema))
+                    rows += result.num_rows
+
+            finally:
+                for future in pending:
+                    future.cancel()
+
+                if writer is not None:
+                    writer.close()
+
+        return {
+            'windows': n_windows,
+            'rows': rows,
+            'truncated': sum(1 for window in report if window['truncated']),
+            'report': report,
+        }
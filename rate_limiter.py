@@ -0,0 +1,192 @@
+import os
+import time
+import sqlite3
+import threading
+from collections import deque
+from utilities import create_directory
+
+
+class RateLimiter:
+
+    def __init__(
+                self,
+                max_requests: int = 200,
+                period: float = 3600,
+                state_file: str = './data/rate_limit.db',
+                key: str = 'default'):
+        """
+        Initialize variables.
+
+        Sliding window scheduler: a request is sent as soon as less than
+        max_requests were sent in the last period seconds, otherwise it waits
+        only until the oldest request leaves the window.
+
+        The window is stored on a SQLite file, so every process on the same
+        host using the same state_file and key shares the same quota.
+
+        Args:
+            max_requests (int, optional): maximum number of requests per period. Defaults to 200.
+            period (float, optional): window size, in seconds. Defaults to 3600 (one hour).
+            state_file (str, optional): SQLite file to share the quota between processes, None to keep it in memory.
+            key (str, optional): quota identifier, to track more than one quota on the same file.
+        """
+        self.max_requests = max_requests
+        self.period = period
+        self.state_file = state_file
+        self.key = key
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._timestamps = deque()
+        self._paused_until = 0
+
+        if state_file is not None:
+            create_directory(os.path.dirname(os.path.abspath(state_file)))
+
+            conn = self._connection()
+            conn.execute('CREATE TABLE IF NOT EXISTS requests (key TEXT NOT NULL, ts REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_requests_key_ts ON requests (key, ts)')
+            conn.execute('CREATE TABLE IF NOT EXISTS pauses (key TEXT PRIMARY KEY, until REAL NOT NULL)')
+
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        SQLite connection of the current thread (connections can't be shared between threads).
+
+        Returns:
+            sqlite3.Connection: connection in autocommit mode.
+        """
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None:
+            conn = sqlite3.connect(self.state_file, timeout=60, isolation_level=None)
+            self._local.conn = conn
+
+        return conn
+
+
+    def _try_acquire(self) -> float:
+        """
+        Take a slot from the window, if there is any available.
+
+        Returns:
+            float: 0 if the slot was taken, otherwise seconds to wait for the next one.
+        """
+        # In memory window (single process)
+        if self.state_file is None:
+            with self._lock:
+                now = time.time()
+
+                if self._paused_until > now:
+                    return self._paused_until - now
+
+                while self._timestamps and self._timestamps[0] <= now - self.period:
+                    self._timestamps.popleft()
+
+                if len(self._timestamps) < self.max_requests:
+                    self._timestamps.append(now)
+                    return 0
+
+                return self._timestamps[0] + self.period - now
+
+        # Shared window, BEGIN IMMEDIATE locks the file for writing,
+        # so the count and the insert are atomic between processes.
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            now = time.time()
+            conn.execute('DELETE FROM requests WHERE key = ? AND ts <= ?', (self.key, now - self.period))
+            count, oldest = conn.execute(
+                        'SELECT COUNT(*), MIN(ts) FROM requests WHERE key = ?', (self.key,)).fetchone()
+            paused = conn.execute('SELECT until FROM pauses WHERE key = ?', (self.key,)).fetchone()
+
+            if (paused is not None) and (paused[0] > now):
+                wait = paused[0] - now
+            elif count < self.max_requests:
+                conn.execute('INSERT INTO requests (key, ts) VALUES (?, ?)', (self.key, now))
+                wait = 0
+            else:
+                wait = oldest + self.period - now
+
+            conn.execute('COMMIT')
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return wait
+
+
+    def acquire(self) -> float:
+        """
+        Block until a request can be sent without going over the quota.
+
+        Returns:
+            float: seconds spent waiting.
+        """
+        waited = 0
+
+        while True:
+            wait = self._try_acquire()
+
+            if wait <= 0:
+                return waited
+
+            time.sleep(wait)
+            waited += wait
+
+
+    def pause(self, seconds: float):
+        """
+        Block every request sharing the quota for some time (e.g. the Retry-After of a 429).
+
+        Args:
+            seconds (float): seconds to wait.
+        """
+        until = time.time() + seconds
+
+        if self.state_file is None:
+            with self._lock:
+                self._paused_until = max(self._paused_until, until)
+            return
+
+        self._connection().execute(
+                    'INSERT INTO pauses (key, until) VALUES (?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET until = MAX(until, excluded.until)', (self.key, until))
+
+
+    def paused(self) -> float:
+        """
+        Seconds left of the current pause.
+
+        Returns:
+            float: seconds, 0 if not paused.
+        """
+        if self.state_file is None:
+            until = self._paused_until
+        else:
+            row = self._connection().execute('SELECT until FROM pauses WHERE key = ?', (self.key,)).fetchone()
+            until = row[0] if row is not None else 0
+
+        return max(until - time.time(), 0)
+
+
+    def remaining(self) -> int:
+        """
+        Number of requests that can still be sent on the current window.
+
+        Returns:
+            int: remaining requests.
+        """
+        since = time.time() - self.period
+
+        if self.state_file is None:
+            with self._lock:
+                used = sum(1 for ts in self._timestamps if ts > since)
+
+        else:
+            used = self._connection().execute(
+                        'SELECT COUNT(*) FROM requests WHERE key = ? AND ts > ?', (self.key, since)).fetchone()[0]
+
+        return max(self.max_requests - used, 0)
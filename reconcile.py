@@ -0,0 +1,136 @@
+import numpy as np
+from pandas.core.frame import DataFrame
+from typing import Callable, Dict, List
+from utilities import get_operation_status
+
+
+# Order the changes are applied: grants first, so no one is left without access in between
+ACTIONS_ORDER = ['add', 'update', 'remove']
+
+
+def plan_changes(
+            desired: DataFrame,
+            current: DataFrame,
+            item_columns: List[str],
+            prune: bool = False) -> DataFrame:
+    """
+    Compare the desired and the current access rights, keeping only the changes needed.
+
+    Both tables have the item_columns, 'principal' and 'right'. A desired right of 'None'
+    (or empty) means the principal must not have access. Principals are compared
+    case-insensitive, and the comparison is a single merge (no loop over rows).
+
+    Args:
+        desired (DataFrame): desired access rights.
+        current (DataFrame): current access rights.
+        item_columns (List[str]): columns that identify the item (e.g. ['workspace_id']).
+        prune (bool, optional): also remove current access not listed on desired, on the items listed. Defaults to False.
+
+    Returns:
+        DataFrame: item_columns, principal, right, current_right and action ('add', 'update' or 'remove'), in the order to apply.
+    """
+    columns = item_columns + ['principal', 'right']
+
+    desired = desired.loc[:, columns].fillna('').astype(str)
+    current = current.loc[:, columns].fillna('').astype(str).rename(columns={'right': 'current_right', 'principal': 'current_principal'})
+
+    desired['key'] = desired['principal'].str.lower()
+    current['key'] = current['current_principal'].str.lower()
+
+    # The last row of a principal wins
+    desired = desired.drop_duplicates(subset=item_columns + ['key'], keep='last')
+
+    # Current access on items not listed on desired is never changed
+    current = current.merge(desired[item_columns].drop_duplicates(), on=item_columns, how='inner')
+
+    df = desired.merge(current, on=item_columns + ['key'], how='outer' if prune else 'left', indicator=True)
+    df[['right', 'current_right']] = df[['right', 'current_right']].fillna('')
+    df['principal'] = df['principal'].fillna(df['current_principal'])
+
+    wants_access = ~df['right'].isin(['', 'None'])
+    has_access = df['_merge'] != 'left_only'
+    listed = df['_merge'] != 'right_only'
+
+    df['action'] = np.select(
+                [
+                    listed & wants_access & ~has_access,
+                    listed & wants_access & has_access & (df['right'] != df['current_right']),
+                    has_access & (~wants_access | ~listed),
+                ],
+                ['add', 'update', 'remove'],
+                default='')
+
+    df = df.loc[df['action'] != '', columns + ['current_right', 'action']]
+    df['order'] = df['action'].map(ACTIONS_ORDER.index)
+
+    return df.sort_values('order', kind='stable').drop(columns='order').reset_index(drop=True)
+
+
+def apply_changes(plan: DataFrame, actions: Dict[str, Callable[[Dict], Dict]]) -> DataFrame:
+    """
+    Apply the changes of a plan, in order.
+
+    Args:
+        plan (DataFrame): changes, as returned by plan_changes.
+        actions (Dict[str, Callable[[Dict], Dict]]): function for each action, receiving the row and returning the API response.
+
+    Returns:
+        DataFrame: plan with 'status' and 'status_code' columns.
+    """
+    statuses = []
+
+    for row in plan.to_dict('records'):
+        response = actions[row['action']](row)
+        statuses.append(get_operation_status(response))
+
+    plan = plan.copy()
+    plan['status'] = [status for status, _ in statuses]
+    plan['status_code'] = [status_code for _, status_code in statuses]
+
+    return plan
+
+
+def plan_requests(plan: DataFrame, endpoints: Dict[str, tuple]) -> Dict[tuple, int]:
+    """
+    Number of requests a plan sends, by endpoint.
+
+    Args:
+        plan (DataFrame): changes, as returned by plan_changes.
+        endpoints (Dict[str, tuple]): (method, endpoint) of each action.
+
+    Returns:
+        Dict[tuple, int]: number of requests by (method, endpoint).
+    """
+    requests = {}
+
+    for action, count in plan['action'].value_counts().items():
+        requests[endpoints[action]] = requests.get(endpoints[action], 0) + int(count)
+
+    return requests
+
+
+def plan_skipped(desired: DataFrame, plan: DataFrame, item_columns: List[str]) -> Dict[str, int]:
+    """
+    Rows of the desired state that don't become a request: duplicated (principals compared
+    case-insensitive, as on plan_changes), or already in effect (no_op).
+
+    Args:
+        desired (DataFrame): desired access rights.
+        plan (DataFrame): changes, as returned by plan_changes.
+        item_columns (List[str]): columns that identify the item (e.g. ['workspace_id']).
+
+    Returns:
+        Dict[str, int]: number of rows by reason.
+    """
+    columns = item_columns + ['principal']
+
+    keys = desired.loc[:, columns].fillna('').astype(str).drop_duplicates()
+    keys['principal'] = keys['principal'].str.lower()
+    keys = set(keys.itertuples(index=False, name=None))
+
+    # Changes of rows listed on desired (prune also removes unlisted ones)
+    changes = plan.loc[:, columns].astype(str)
+    changes['principal'] = changes['principal'].str.lower()
+    listed = sum(1 for key in set(changes.itertuples(index=False, name=None)) if key in keys)
+
+    return {'duplicated': len(desired) - len(keys), 'no_op': len(keys) - listed}
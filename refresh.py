@@ -0,0 +1,240 @@
+import time
+import heapq
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List
+from client import PowerBIError
+from dataset import Dataset
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+# Refresh history statuses of finished refreshes
+FINISHED = {'Completed', 'Failed', 'Cancelled', 'Disabled'}
+
+# Outcomes that prevent dependents from being refreshed
+NOT_REFRESHED = {'Failed', 'Cancelled', 'Disabled', 'Skipped', 'TimedOut'}
+
+
+def refresh_seconds(refresh: Dict) -> float:
+    """
+    Duration of a finished refresh, 0 if unknown.
+    """
+    try:
+        start = datetime.fromisoformat(refresh['startTime'].replace('Z', '+00:00'))
+        end = datetime.fromisoformat(refresh['endTime'].replace('Z', '+00:00'))
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+    return max((end - start).total_seconds(), 0)
+
+
+def topological_order(datasets: List[str], dependencies: Dict[str, List[str]]) -> List[str]:
+    """
+    Order datasets so each one comes after the datasets it depends on.
+
+    Args:
+        datasets (List[str]): datasets ids.
+        dependencies (Dict[str, List[str]]): datasets each dataset depends on (only the ones on datasets are considered).
+
+    Raises:
+        ValueError: if the dependencies have a cycle.
+
+    Returns:
+        List[str]: ordered datasets ids.
+    """
+    pending = {dataset: {d for d in dependencies.get(dataset, []) if d in datasets} for dataset in datasets}
+    order = []
+
+    while len(pending) > 0:
+        ready = [dataset for dataset in datasets if dataset in pending and len(pending[dataset]) == 0]
+
+        if len(ready) == 0:
+            raise ValueError(f'dependencies cycle between datasets: {", ".join(pending)}')
+
+        for dataset in ready:
+            order.append(dataset)
+            del pending[dataset]
+
+            for waiting in pending.values():
+                waiting.discard(dataset)
+
+    return order
+
+
+class RefreshOrchestrator:
+
+    def __init__(
+                self,
+                dataset: Dataset,
+                max_per_group: int = 1,
+                max_concurrent: int = 20,
+                min_poll: float = 15,
+                max_poll: float = 300,
+                backoff: float = 1.5,
+                timeout: float = 4 * 3600,
+                cancel_on_timeout: bool = False):
+        """
+        Initialize variables.
+
+        Runs the refresh of many datasets as early as the capacity allows: up to max_per_group
+        refreshes at the same time on each workspace (or capacity), dependents start as soon as
+        the datasets they depend on complete, and a single thread polls all running refreshes.
+
+        Polling is adaptive: the first status request is made when the refresh is expected to end
+        (the duration of its last refresh), then the interval grows by backoff up to max_poll.
+
+        Args:
+            dataset (Dataset): Dataset object used to start, poll and cancel the refreshes.
+            max_per_group (int, optional): maximum refreshes running on the same workspace (or capacity). Defaults to 1.
+            max_concurrent (int, optional): maximum refreshes running in total. Defaults to 20.
+            min_poll (float, optional): minimum seconds between status requests of a refresh. Defaults to 15.
+            max_poll (float, optional): maximum seconds between status requests of a refresh. Defaults to 300.
+            backoff (float, optional): growth of the interval between status requests. Defaults to 1.5.
+            timeout (float, optional): seconds to wait for each refresh. Defaults to 4 hours.
+            cancel_on_timeout (bool, optional): cancel refreshes that timed out (enhanced refreshes only). Defaults to False.
+        """
+        self.dataset = dataset
+        self.max_per_group = max_per_group
+        self.max_concurrent = max_concurrent
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cancel_on_timeout = cancel_on_timeout
+
+
+    def _expected_seconds(self, workspace_id: str, dataset_id: str) -> float:
+        """
+        Duration of the last successful refresh, used to schedule the first poll.
+        """
+        try:
+            history = self.dataset.refresh_history(workspace_id, dataset_id, top=1)
+        except PowerBIError:
+            return 0
+
+        if (len(history) > 0) and (history[0].get('status', '') == 'Completed'):
+            return refresh_seconds(history[0])
+
+        return 0
+
+
+    def run(
+                self,
+                datasets: Iterable[Dict],
+                dependencies: Dict[str, List[str]] = {},
+                groups: Dict[str, str] = {},
+                options: Dict = {}) -> 'DataFrame':
+        """
+        Refresh datasets, respecting the concurrency limits and dependencies.
+
+        Args:
+            datasets (Iterable[Dict]): datasets to refresh, dicts with 'workspace_id' and 'dataset_id'.
+            dependencies (Dict[str, List[str]], optional): datasets ids each dataset depends on, refreshed (successfully) before it.
+            groups (Dict[str, str], optional): concurrency group (e.g. capacity id) of each workspace id, the workspace itself if not informed.
+            options (Dict, optional): enhanced refresh options, see Dataset.refresh.
+
+        Raises:
+            ValueError: if the dependencies have a cycle.
+
+        Returns:
+            DataFrame: workspace_id, dataset_id, request_id, status, error, polls and seconds of each refresh.
+        """
+        import pandas as pd
+
+        items = {item['dataset_id']: item['workspace_id'] for item in datasets}
+        order = topological_order(list(items), dependencies)
+
+        results = {
+            dataset_id: {
+                'workspace_id': items[dataset_id], 'dataset_id': dataset_id, 'request_id': '',
+                'status': 'Pending', 'error': '', 'polls': 0, 'seconds': 0.0,
+            }
+            for dataset_id in order
+        }
+
+        running = {}      # dataset id: (started, interval)
+        polls = []        # heap of (next poll time, dataset id)
+        group_count = {}
+
+        def group(dataset_id: str) -> str:
+            return groups.get(items[dataset_id], items[dataset_id])
+
+        def finish(dataset_id: str, status: str, error: str = ''):
+            started, _ = running.pop(dataset_id)
+            results[dataset_id].update(status=status, error=error, seconds=time.time() - started)
+            group_count[group(dataset_id)] -= 1
+
+        while True:
+            # Datasets whose dependencies failed won't be refreshed
+            for dataset_id in order:
+                if (results[dataset_id]['status'] == 'Pending') and any(
+                            results[d]['status'] in NOT_REFRESHED
+                            for d in dependencies.get(dataset_id, []) if d in results):
+                    results[dataset_id].update(status='Skipped', error='a dependency was not refreshed')
+
+            # Start the refreshes that are ready, while there are free slots
+            for dataset_id in order:
+                if len(running) >= self.max_concurrent:
+                    break
+
+                if (results[dataset_id]['status'] != 'Pending') or (group_count.get(group(dataset_id), 0) >= self.max_per_group):
+                    continue
+
+                if any(results[d]['status'] != 'Completed' for d in dependencies.get(dataset_id, []) if d in results):
+                    continue
+
+                workspace_id = items[dataset_id]
+                expected = self._expected_seconds(workspace_id, dataset_id)
+
+                try:
+                    request_id = self.dataset.refresh(workspace_id, dataset_id, options=options)
+                except PowerBIError as e:
+                    results[dataset_id].update(status='Failed', error=str(e))
+                    continue
+
+                results[dataset_id].update(status='Running', request_id=request_id)
+                group_count[group(dataset_id)] = group_count.get(group(dataset_id), 0) + 1
+                running[dataset_id] = (time.time(), self.min_poll)
+                heapq.heappush(polls, (time.time() + max(expected, self.min_poll), dataset_id))
+
+            if len(running) == 0:
+                # Dependents of a dataset that failed to start are skipped on the next pass
+                if any(result['status'] == 'Pending' for result in results.values()):
+                    continue
+
+                break
+
+            # Poll the refresh expected to end first
+            next_poll, dataset_id = heapq.heappop(polls)
+            time.sleep(max(next_poll - time.time(), 0))
+
+            started, interval = running[dataset_id]
+            result = results[dataset_id]
+            result['polls'] += 1
+
+            try:
+                refresh = self.dataset.refresh_status(result['workspace_id'], dataset_id, result['request_id'])
+                status = refresh.get('status', 'Unknown')
+            except PowerBIError as e:
+                refresh, status = {'serviceExceptionJson': str(e)}, 'Unknown'
+
+            if status in FINISHED:
+                finish(dataset_id, status, refresh.get('serviceExceptionJson', '') if status != 'Completed' else '')
+
+            elif time.time() - started > self.timeout:
+                if self.cancel_on_timeout and result['request_id'] != '':
+                    try:
+                        self.dataset.cancel_refresh(result['workspace_id'], dataset_id, result['request_id'])
+                    except PowerBIError:
+                        pass
+
+                finish(dataset_id, 'TimedOut', f'not finished after {self.timeout} seconds')
+
+            else:
+                # Still running, wait longer next time
+                interval = min(interval * self.backoff, self.max_poll)
+                running[dataset_id] = (started, interval)
+                heapq.heappush(polls, (time.time() + interval, dataset_id))
+
+        return pd.DataFrame(list(results.values()))
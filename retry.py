@@ -0,0 +1,93 @@
+import time
+import random
+from typing import Optional
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy:
+
+    def __init__(
+                self,
+                max_retries: int = 5,
+                backoff: float = 1,
+                max_backoff: float = 60,
+                statuses: tuple = (429, 500, 502, 503, 504),
+                methods: tuple = ('GET', 'HEAD', 'PUT', 'DELETE'),
+                retry_throttled: bool = True,
+                block_on_throttle: bool = True,
+                max_retry_after: float = 900):
+        """
+        Initialize variables.
+
+        Failed requests are retried after the time the service asks for (Retry-After header),
+        or after an exponential backoff with full jitter (random between 0 and backoff * 2^attempt).
+        Retry-After is honored as sent; when it's longer than max_retry_after the request isn't
+        retried and the response is returned (the quota still stays paused for Retry-After).
+
+        Args:
+            max_retries (int, optional): maximum number of retries per request, 0 to disable. Defaults to 5.
+            backoff (float, optional): base backoff, in seconds. Defaults to 1.
+            max_backoff (float, optional): maximum backoff between retries (without Retry-After), in seconds. Defaults to 60.
+            statuses (tuple, optional): HTTP status codes to retry. Defaults to 429 and 5xx (except 501).
+            methods (tuple, optional): idempotent methods, retried on any retryable status or connection error.
+            retry_throttled (bool, optional): retry 429 on any method (throttled requests aren't processed). Defaults to True.
+            block_on_throttle (bool, optional): pause the client quota on 429 for Retry-After, so other requests wait too. Defaults to True.
+            max_retry_after (float, optional): longest Retry-After to wait for, in seconds, longer ones give up. Defaults to 900.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.methods = methods
+        self.retry_throttled = retry_throttled
+        self.block_on_throttle = block_on_throttle
+        self.max_retry_after = max_retry_after
+
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None) -> bool:
+        """
+        Check if a request should be retried.
+
+        Args:
+            method (str): HTTP method.
+            attempt (int): number of retries already made.
+            status (Optional[int], optional): HTTP status code, None for connection errors.
+
+        Returns:
+            bool: True if the request should be retried.
+        """
+        if attempt >= self.max_retries:
+            return False
+
+        if (status == 429) & self.retry_throttled:
+            return True
+
+        if method.upper() not in self.methods:
+            return False
+
+        return (status is None) or (status in self.statuses)
+
+
+    def delay(self, attempt: int, retry_after: str = '') -> float:
+        """
+        Seconds to wait before the next retry.
+
+        Args:
+            attempt (int): number of retries already made.
+            retry_after (str, optional): Retry-After header, in seconds or as an HTTP date.
+
+        Returns:
+            float: seconds to wait.
+        """
+        if retry_after:
+            try:
+                return max(float(retry_after), 0)
+            except ValueError:
+                pass
+
+            try:
+                return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0)
+            except (TypeError, ValueError):
+                pass
+
+        return random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
@@ -0,0 +1,192 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Union
+from auth import Auth
+from client import Client, PowerBIError
+from credentials import CredentialPool, client_for
+
+
+class Scanner:
+
+    def __init__(self, token: Union[str, Auth, CredentialPool], client: Client = None):
+        """
+        Initialize variables.
+
+        Tenant inventory through the admin Scanner (workspace info) API: a single scan
+        returns the users, reports and datasets of up to 100 workspaces.
+        Requires a service principal allowed to use read-only admin APIs.
+
+        Args:
+            token (Union[str, Auth, CredentialPool]): bearer token, Auth object to get a valid token on each request, or CredentialPool.
+            client (Client, optional): shared HTTP client, a new one is created if not informed (a CredentialPool token is its own client).
+        """
+        self.client = client_for(token, client)
+        self.main_url = self.client.base_url
+        self.token = token
+
+        # Scanner API limits
+        self.batch_size = 100
+        self.max_concurrent_scans = 16
+
+
+    @property
+    def headers(self) -> Dict:
+        """
+        Authorization header, asked to Auth on each request (when informed).
+
+        Returns:
+            Dict: header for authorization.
+        """
+        if isinstance(self.token, (Auth, CredentialPool)):
+            return self.token.get_headers()
+
+        return {'Authorization': f'Bearer {self.token}'}
+
+
+    def modified_workspaces(self, modified_since: str = '', exclude_personal: bool = True) -> List[str]:
+        """
+        List the workspaces ids of the tenant, optionally only the ones modified since a date.
+
+        Args:
+            modified_since (str, optional): ISO 8601 date time (up to 30 days ago), all workspaces if not informed.
+            exclude_personal (bool, optional): exclude personal workspaces. Defaults to True.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            List[str]: workspaces ids.
+        """
+        request_url = f'{self.main_url}/admin/workspaces/modified?excludePersonalWorkspaces={str(exclude_personal).lower()}'
+
+        if modified_since != '':
+            request_url = f'{request_url}&modifiedSince={modified_since}'
+
+        response = self.client.get_json(request_url, headers=self.headers)
+
+        return [workspace['id'] for workspace in response]
+
+
+    def submit_scan(self, workspace_ids: List[str], lineage: bool = True) -> str:
+        """
+        Start a scan of up to 100 workspaces.
+
+        Args:
+            workspace_ids (List[str]): workspaces ids.
+            lineage (bool, optional): include reports/datasets lineage. Defaults to True.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            str: scan id.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/admin/workspace-info-post-workspace-info
+        request_url = f'{self.main_url}/admin/workspaces/getInfo?lineage={str(lineage).lower()}&getArtifactUsers=true'
+
+        response = self.client.request_json(
+                    'POST', request_url, success=(200, 202), headers=self.headers, json={'workspaces': workspace_ids})
+
+        return response['id']
+
+
+    def wait_for_scan(self, scan_id: str, poll_interval: float = 5, timeout: float = 3600):
+        """
+        Wait until a scan finishes.
+
+        Args:
+            scan_id (str): scan id.
+            poll_interval (float, optional): seconds between status requests. Defaults to 5.
+            timeout (float, optional): seconds to wait before giving up. Defaults to 3600.
+
+        Raises:
+            PowerBIError: if the scan failed or timed out.
+        """
+        request_url = f'{self.main_url}/admin/workspaces/scanStatus/{scan_id}'
+        started = time.time()
+
+        while True:
+            response = self.client.get_json(request_url, headers=self.headers)
+            status = response.get('status', '')
+
+            if status == 'Succeeded':
+                return
+
+            if status == 'Failed':
+                raise PowerBIError(200, {'error': {'message': f'scan {scan_id} failed', 'content': response}})
+
+            if time.time() - started > timeout:
+                raise PowerBIError(408, {'error': {'message': f'scan {scan_id} timed out'}})
+
+            time.sleep(poll_interval)
+
+
+    def get_scan_result(self, scan_id: str) -> Dict:
+        """
+        Result of a finished scan.
+
+        Args:
+            scan_id (str): scan id.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            Dict: scan result, with one entry per workspace.
+        """
+        request_url = f'{self.main_url}/admin/workspaces/scanResult/{scan_id}'
+
+        return self.client.get_json(request_url, headers=self.headers)
+
+
+    def _scan_batch(self, workspace_ids: List[str], poll_interval: float) -> List[Dict]:
+        """
+        Submit a scan, wait for it and return its workspaces.
+        """
+        scan_id = self.submit_scan(workspace_ids)
+        self.wait_for_scan(scan_id, poll_interval=poll_interval)
+
+        return self.get_scan_result(scan_id).get('workspaces', [])
+
+
+    def scan(self, workspace_ids: Iterable[str] = None, poll_interval: float = 5) -> Iterator[Dict]:
+        """
+        Scan workspaces in batches of 100, with up to 16 scans running at the same time.
+        Workspaces are returned as soon as their scan finishes, with the same structures
+        Workspace/Dataset listings return on 'users', 'reports' and 'datasets'.
+
+        Args:
+            workspace_ids (Iterable[str], optional): workspaces ids, all workspaces of the tenant if not informed.
+            poll_interval (float, optional): seconds between status requests of each scan. Defaults to 5.
+
+        Raises:
+            PowerBIError: if any request or scan was not successful.
+
+        Returns:
+            Iterator[Dict]: workspaces.
+        """
+        if workspace_ids is None:
+            workspace_ids = self.modified_workspaces()
+
+        workspace_ids = list(workspace_ids)
+        batches = [workspace_ids[i:i + self.batch_size] for i in range(0, len(workspace_ids), self.batch_size)]
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_scans) as executor:
+            futures = [executor.submit(self._scan_batch, batch, poll_interval) for batch in batches]
+
+            for future in as_completed(futures):
+                for workspace in future.result():
+                    yield self._normalize(workspace)
+
+
+    def _normalize(self, workspace: Dict) -> Dict:
+        """
+        Fill the fields the scan result doesn't have, but the listings do.
+        """
+        for report in workspace.setdefault('reports', []):
+            report.setdefault('datasetWorkspaceId', workspace['id'])
+
+        workspace.setdefault('datasets', [])
+        workspace.setdefault('users', [])
+
+        return workspace
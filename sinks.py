@@ -0,0 +1,128 @@
+import os
+import csv
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+from models import Record
+from utilities import create_directory
+
+
+def write_csv(records: List[Dict], path: str):
+    """
+    Stream records to a CSV file, row by row.
+
+    Args:
+        records (List[Dict]): records to be written.
+        path (str): file path.
+    """
+    # Columns from all records, in order of appearance
+    columns = list(dict.fromkeys(key for record in records for key in record))
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def write_jsonl(records: List[Dict], path: str):
+    """
+    Stream records to a JSONL file, one record per line.
+
+    Args:
+        records (List[Dict]): records to be written.
+        path (str): file path.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record.to_dict() if isinstance(record, Record) else record) + '\n')
+
+
+def write_parquet(records: List[Dict], path: str):
+    """
+    Write records to a Parquet file (requires pyarrow).
+
+    Args:
+        records (List[Dict]): records to be written.
+        path (str): file path.
+    """
+    import pandas as pd
+
+    pd.DataFrame(records).to_parquet(path, index=False)
+
+
+def write_excel(records: List[Dict], path: str):
+    """
+    Write records to an Excel file (requires openpyxl).
+
+    Args:
+        records (List[Dict]): records to be written.
+        path (str): file path.
+    """
+    import pandas as pd
+
+    pd.DataFrame(records).to_excel(path, index=False)
+
+
+# Sink name: (file extension, writer)
+SINKS = {
+    'csv': ('.csv', write_csv),
+    'jsonl': ('.jsonl', write_jsonl),
+    'parquet': ('.parquet', write_parquet),
+    'excel': ('.xlsx', write_excel),
+}
+
+
+class SinkWriter:
+
+    def __init__(self, workers: int = 1):
+        """
+        Initialize variables.
+
+        Exports are written on background threads, so listing
+        isn't slowed down by the file format.
+
+        Args:
+            workers (int, optional): number of background writers. Defaults to 1.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._pending = []
+
+
+    def write(self, records: List[Dict], path: str, sink: str = 'excel') -> Future:
+        """
+        Export records in the background.
+
+        Args:
+            records (List[Dict]): records to be written.
+            path (str): file path, without extension.
+            sink (str, optional): 'none', 'csv', 'jsonl', 'parquet' or 'excel'. Defaults to 'excel'.
+
+        Returns:
+            Future: pending write, None if sink is 'none'.
+        """
+        if sink == 'none':
+            return None
+
+        if sink not in SINKS:
+            raise ValueError(f"Invalid sink '{sink}', expected one of: none, {', '.join(SINKS)}.")
+
+        extension, writer = SINKS[sink]
+        create_directory(os.path.dirname(os.path.abspath(path)))
+
+        # Copy, so the caller can change the returned list while it's being written
+        future = self._executor.submit(writer, list(records), path + extension)
+
+        # Keep failed writes, so flush can raise their errors
+        self._pending = [f for f in self._pending if not f.done() or f.exception() is not None] + [future]
+
+        return future
+
+
+    def flush(self):
+        """
+        Wait for all pending exports, raising any error that happened while writing.
+        """
+        pending, self._pending = self._pending, []
+
+        for future in pending:
+            future.result()
@@ -0,0 +1,31 @@
+import os
+import sys
+import pytest
+
+# Modules are on the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import MockPowerBI
+from client import Client
+from rate_limiter import RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # Workspace, Dataset and the journals write to ./data
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def mock():
+    server = MockPowerBI(items=5).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(mock):
+    client = Client(base_url=mock.url, rate_limiter=RateLimiter(100000, 60, state_file=None))
+    yield client
+    client.close()
@@ -0,0 +1,83 @@
+import time
+import asyncio
+import inspect
+import pytest
+from async_client import AsyncDataset, AsyncWorkspace
+from client import Client
+from credentials import CredentialPool
+from dataset import Dataset
+from rate_limiter import RateLimiter
+from workspace import Workspace
+
+
+async def gather(*coroutines):
+    return await asyncio.gather(*coroutines)
+
+
+def test_concurrency_limit(mock, client):
+    mock.latency = 0.05
+    workspace = AsyncWorkspace('token', client, concurrency=3)
+
+    results = asyncio.run(gather(*[workspace.list_users(f'ws-{i}', sink='none') for i in range(12)]))
+    workspace.close()
+
+    assert all(result['message'] == 'Success' for result in results)
+    assert mock.requests == 12
+    assert mock.max_in_flight == 3
+
+
+def test_shared_quota(mock):
+    # Workspace and dataset requests come out of the same window
+    client = Client(base_url=mock.url, rate_limiter=RateLimiter(4, 0.5, state_file=None))
+    workspace = AsyncWorkspace('token', client, concurrency=8)
+    dataset = AsyncDataset('token', client, concurrency=8)
+
+    started = time.time()
+    results = asyncio.run(gather(
+                *[workspace.list_users(f'ws-{i}', sink='none') for i in range(4)],
+                *[dataset.list_datasets(f'ws-{i}', sink='none') for i in range(4)]))
+
+    assert all(result['message'] == 'Success' for result in results)
+    assert mock.requests == 8
+    assert time.time() - started >= 0.5
+    assert client.rate_limiter.remaining() == 0
+
+    workspace.close()
+    dataset.close()
+
+
+@pytest.mark.parametrize('sync_class, async_class', [(Workspace, AsyncWorkspace), (Dataset, AsyncDataset)])
+def test_same_methods_as_sync(sync_class, async_class):
+    # iter_* are generators, they stay synchronous
+    for name, method in inspect.getmembers(sync_class, inspect.isfunction):
+        if name.startswith(('_', 'iter_')) or name == 'flush':
+            continue
+
+        assert hasattr(async_class, name), name
+        assert inspect.iscoroutinefunction(getattr(async_class, name)), name
+        assert inspect.signature(getattr(async_class, name)).parameters.keys() == inspect.signature(method).parameters.keys(), name
+
+
+def test_batch_apply(mock, client):
+    dataset = AsyncDataset('token', client)
+    operations = [('user@contoso.com', 'ws-1', 'dataset-1', 'Read'), ('user@contoso.com', 'ws-1', 'dataset-1', 'Read')]
+
+    estimate = asyncio.run(dataset.batch_remove_users(operations, dry_run=True))
+    assert estimate['requests'] == 1
+    assert mock.requests == 0
+
+    df = asyncio.run(dataset.batch_remove_users(operations))
+    assert list(df['update_status']) == ['Done']
+    assert mock.requests == 1
+
+    dataset.close()
+
+
+def test_credential_pool_is_the_client(mock):
+    pool = CredentialPool([('tenant', 'client', 'secret')], base_url=mock.url, state_file=None)
+
+    assert AsyncWorkspace(pool).workspace.client is pool
+    assert AsyncDataset(pool).dataset.client is pool
+
+    with pytest.raises(ValueError):
+        AsyncWorkspace(pool, Client(base_url=mock.url))
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+from client import Client
+from rate_limiter import RateLimiter
+from workspace import Workspace
+
+
+def make_client(mock, cache_size: int = 256) -> Client:
+    return Client(base_url=mock.url, rate_limiter=RateLimiter(100000, 60, state_file=None), cache_size=cache_size)
+
+
+def test_concurrent_requests_are_coalesced(mock):
+    mock.latency = 0.2
+    client = make_client(mock)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        responses = list(executor.map(lambda _: client.get(f'{mock.url}/groups', cache=True), range(10)))
+
+    assert mock.requests == 1
+    assert all(response.json() == responses[0].json() for response in responses)
+
+    client.close()
+
+
+def test_only_cache_true_is_cached(mock, client):
+    client.get(f'{mock.url}/groups')
+    client.get(f'{mock.url}/groups')
+    assert mock.requests == 2
+
+    client.get(f'{mock.url}/groups', cache=True)
+    client.get(f'{mock.url}/groups', cache=True)
+    assert mock.requests == 3
+
+    # Responses depend on the principal
+    client.get(f'{mock.url}/groups', cache=True, headers={'Authorization': 'Bearer other'})
+    assert mock.requests == 4
+
+
+def test_lru_eviction(mock):
+    client = make_client(mock, cache_size=2)
+    urls = [f'{mock.url}/groups/ws-{i}/users' for i in range(3)]
+
+    client.get(urls[0], cache=True)
+    client.get(urls[1], cache=True)
+    client.get(urls[0], cache=True)    # most recently used
+    client.get(urls[2], cache=True)    # evicts urls[1]
+    assert mock.requests == 3
+
+    client.get(urls[0], cache=True)
+    assert mock.requests == 3
+
+    client.get(urls[1], cache=True)
+    assert mock.requests == 4
+
+    client.close()
+
+
+def test_invalidation_after_changes(mock, client):
+    client.get(f'{mock.url}/groups/ws-1/users', cache=True)
+    client.get(f'{mock.url}/groups/ws-2/users', cache=True)
+    assert mock.requests == 2
+
+    # Changing a user of ws-1 drops only the responses under /groups/ws-1
+    client.put(f'{mock.url}/groups/ws-1/users', json={})
+    assert mock.requests == 3
+
+    client.get(f'{mock.url}/groups/ws-1/users', cache=True)
+    client.get(f'{mock.url}/groups/ws-2/users', cache=True)
+    assert mock.requests == 4
+
+    client.delete(f'{mock.url}/groups/ws-2/users/user@contoso.com')
+    client.get(f'{mock.url}/groups/ws-2/users', cache=True)
+    assert mock.requests == 6
+
+
+def test_errors_are_not_cached(mock, client):
+    mock.errors = [404]
+
+    assert client.get(f'{mock.url}/groups', cache=True).status_code == 404
+    assert client.get(f'{mock.url}/groups', cache=True).status_code == 200
+    assert client.get(f'{mock.url}/groups', cache=True).status_code == 200
+    assert mock.requests == 2
+
+
+def test_paginated_listings_are_not_cached(mock, client):
+    workspace = Workspace('token', client, sink='none')
+
+    assert len(list(workspace.iter_workspaces(page_size=2))) == 5
+    assert len(list(workspace.iter_workspaces(page_size=2))) == 5
+
+    assert mock.requests == 6
+    assert len(client.cache._responses) == 0
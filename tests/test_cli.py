@@ -0,0 +1,23 @@
+import os
+import sys
+import subprocess
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(*args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_import_does_not_load_heavy_modules():
+    result = run('-c', 'import sys, cli; print([m for m in ("pandas", "openpyxl", "azure.identity") if m in sys.modules])')
+
+    assert result.stdout.strip() == '[]'
+
+
+def test_help():
+    result = run('cli.py', '--help')
+
+    assert 'workspaces' in result.stdout
+    assert 'datasets' in result.stdout
@@ -0,0 +1,81 @@
+from collections import Counter
+import pytest
+from credentials import CredentialPool
+from dataset import Dataset
+from workspace import Workspace
+
+
+class FakeAuth:
+
+    def __init__(self, client_id: str):
+        self.client_id = client_id
+
+    def get_headers(self):
+        return {'Authorization': f'Bearer {self.client_id}'}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pool(mock):
+    pool = CredentialPool([('tenant', f'sp-{i}', 'secret') for i in range(3)], base_url=mock.url, state_file=None)
+
+    for credential in pool.credentials:
+        credential.auth = FakeAuth(credential.client_id)
+
+    yield pool
+    pool.close()
+
+
+def test_requests_spread_across_principals(mock, pool):
+    workspace = Workspace(pool, sink='none')
+
+    for i in range(12):
+        assert workspace.list_users(f'ws-{i}')['message'] == 'Success'
+
+    assert Counter(mock.authorizations) == {'Bearer sp-0': 4, 'Bearer sp-1': 4, 'Bearer sp-2': 4}
+    assert pool.remaining() == 3 * 200 - 12
+
+
+def test_failover_on_429(mock, pool):
+    mock.errors = [429]
+    mock.retry_after = 30
+
+    response = pool.get(f'{mock.url}/groups')
+
+    # The throttled principal is paused, the next one sends the request
+    assert response.status_code == 200
+    assert len(set(mock.authorizations)) == 2
+    assert [credential.client.rate_limiter.paused() > 25 for credential in pool.credentials].count(True) == 1
+
+    # Later requests avoid the paused principal
+    first = mock.authorizations[0]
+    Dataset(pool, sink='none').list_datasets('ws-1')
+    assert mock.authorizations[-1] != first
+
+
+def test_gives_up_when_all_principals_are_paused(mock, pool):
+    mock.throttle_rate = 1
+    mock.retry_after = 1200
+
+    response = pool.get(f'{mock.url}/groups')
+
+    assert response.status_code == 429
+    assert sorted(mock.authorizations) == ['Bearer sp-0', 'Bearer sp-1', 'Bearer sp-2']
+    assert all(credential.client.rate_limiter.paused() > 1100 for credential in pool.credentials)
+
+
+def test_failover_on_401(mock, pool):
+    mock.errors = [401]
+
+    response = pool.get(f'{mock.url}/groups')
+
+    assert response.status_code == 200
+    assert mock.requests == 2
+    assert len(set(mock.authorizations)) == 2
+
+    # Refused by every principal: each one is tried once
+    mock.errors = [401] * 3
+    assert pool.get(f'{mock.url}/groups').status_code == 401
+    assert mock.requests == 5
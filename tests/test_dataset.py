@@ -0,0 +1,38 @@
+import pytest
+from dataset import Dataset
+
+
+def operations(n: int, fail_after: int = None):
+    for i in range(n):
+        # Simulates a run killed partway
+        if i == fail_after:
+            raise KeyboardInterrupt
+
+        yield (f'user{i}@contoso.com', 'ws-1', 'dataset-1', 'Read')
+
+
+def test_batch_apply_resume(mock, client):
+    dataset = Dataset('token', client, sink='none')
+
+    with pytest.raises(KeyboardInterrupt):
+        dataset.batch_remove_users(operations(10, fail_after=4), journal_path='journal.jsonl')
+
+    assert mock.requests == 4
+
+    # Only the remaining operations are sent
+    df = dataset.batch_remove_users(operations(10), journal_path='journal.jsonl')
+
+    assert mock.requests == 10
+    assert len(df) == 10
+    assert set(df['update_status']) == {'Done'}
+
+
+def test_batch_apply_resumes_only_informed_journal(mock, client):
+    dataset = Dataset('token', client, sink='none')
+
+    dataset.batch_remove_users(operations(3))
+    df = dataset.batch_remove_users(operations(3))
+
+    # A run without journal_path doesn't skip operations of previous runs
+    assert mock.requests == 6
+    assert len(df) == 3
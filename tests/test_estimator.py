@@ -0,0 +1,59 @@
+import pandas as pd
+from dataset import Dataset
+from workspace import Workspace
+
+
+def test_batch_update_user_estimate(mock, client):
+    workspace = Workspace('token', client, sink='none')
+    workspaces = [{'id': 'ws-1'}, {'id': 'ws-2'}, {'id': 'ws-1'}, {'id': 'ws-3'}, {'id': ''}]
+    current = pd.DataFrame({'workspace_id': ['ws-3'], 'principal': ['User@Contoso.com'], 'right': ['Member']})
+
+    estimate = workspace.batch_update_user('user@contoso.com', workspaces, access_right='Member', current=current, dry_run=True)
+
+    assert mock.requests == 0
+    assert estimate['skipped'] == {'duplicated': 1, 'invalid': 1, 'no_op': 1}
+    assert [(e['method'], e['endpoint'], e['requests']) for e in estimate['endpoints']] == [('PUT', '/groups/{id}/users', 2)]
+
+    # Same requests as the actual run
+    workspace.batch_update_user('user@contoso.com', workspaces, access_right='Member', current=current)
+    assert mock.requests == estimate['requests']
+
+
+def test_batch_apply_estimate(mock, client):
+    dataset = Dataset('token', client, sink='none')
+    operations = [
+        ('user1@contoso.com', 'ws-1', 'dataset-1', 'Read'),
+        ('user1@contoso.com', 'ws-1', 'dataset-1', 'Read'),
+        ('user2@contoso.com', 'ws-1', 'dataset-1', 'Owner'),
+        ('user3@contoso.com', 'ws-1', '', 'Read'),
+        ('user4@contoso.com', 'ws-1', 'dataset-2', 'Read'),
+    ]
+
+    estimate = dataset.batch_remove_users(operations, dry_run=True)
+
+    assert mock.requests == 0
+    assert estimate['skipped'] == {'done': 0, 'duplicated': 1, 'owners': 1, 'invalid': 1}
+    assert [(e['method'], e['endpoint'], e['requests']) for e in estimate['endpoints']] == [
+        ('PUT', '/groups/{id}/datasets/{id}/users', 2)]
+
+
+def test_reconcile_estimate(mock, client):
+    workspace = Workspace('token', client, sink='none')
+
+    # Mock workspaces have user0..user4 as Members
+    desired = pd.DataFrame({
+        'principal': ['user0@contoso.com', 'USER0@contoso.com', 'user1@contoso.com', 'new@contoso.com', 'user2@contoso.com'],
+        'workspace_id': ['ws-1'] * 5,
+        'right': ['Member', 'Member', 'Admin', 'Viewer', None],
+    })
+
+    estimate = workspace.reconcile(desired, dry_run=True)
+    endpoints = {(e['method'], e['endpoint']): e['requests'] for e in estimate['endpoints']}
+
+    assert endpoints == {
+        ('GET', '/groups/{id}/users'): 1,
+        ('POST', '/groups/{id}/users'): 1,
+        ('PUT', '/groups/{id}/users'): 1,
+        ('DELETE', '/groups/{id}/users/{id}'): 1,
+    }
+    assert estimate['skipped'] == {'duplicated': 1, 'no_op': 1}
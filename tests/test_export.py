@@ -0,0 +1,62 @@
+import os
+from export import ReportExporter
+from workspace import Workspace
+
+
+def exporter(client, tmp_path, **kwargs) -> ReportExporter:
+    workspace = Workspace('token', client, sink='none')
+    return ReportExporter(workspace, directory=str(tmp_path / 'exports'), min_poll=0.01, max_poll=0.05, **kwargs)
+
+
+def test_export_slots(mock, client, tmp_path):
+    mock.export_polls = 3
+    mock.latency = 0.01
+    reports = [f'report-{i}' for i in range(6)] + ['failed-report', 'truncated-report']
+
+    df = exporter(client, tmp_path, max_jobs=2, download_workers=2).run(
+                [{'workspace_id': 'ws-1', 'report_id': report_id} for report_id in reports])
+    results = df.set_index('report_id')
+
+    # Never more jobs running on the service than the limit
+    assert len(mock.exports) == 8
+    assert mock.max_running_exports == 2
+    assert all(export['polls'] == 4 for export in mock.exports.values())
+
+    for report_id in reports[:6]:
+        path = str(tmp_path / 'exports' / f'{report_id}.pdf')
+
+        assert results.loc[report_id, 'status'] == 'Succeeded'
+        assert results.loc[report_id, 'path'] == path
+        assert results.loc[report_id, 'bytes'] == os.path.getsize(path)
+        assert not os.path.exists(path + '.part')
+
+    assert results.loc['failed-report', 'status'] == 'Failed'
+    assert results.loc['failed-report', 'error'] == 'Export failed'
+    assert not os.path.exists(tmp_path / 'exports' / 'failed-report.pdf')
+
+    # An incomplete download is never renamed to the final file
+    assert results.loc['truncated-report', 'status'] == 'Failed'
+    assert not os.path.exists(tmp_path / 'exports' / 'truncated-report.pdf')
+    assert os.path.exists(tmp_path / 'exports' / 'truncated-report.pdf.part')
+
+
+def test_export_pages_and_path(mock, client, tmp_path):
+    path = str(tmp_path / 'sales.pdf')
+
+    df = exporter(client, tmp_path).run([
+                {'workspace_id': 'ws-1', 'report_id': 'report-1', 'pages': ['ReportSection1', 'ReportSection2']},
+                {'workspace_id': 'ws-1', 'report_id': 'report-2', 'path': path}])
+
+    assert list(df['status']) == ['Succeeded', 'Succeeded']
+    assert df.loc[0, 'path'] == str(tmp_path / 'exports' / 'report-1_ReportSection1_ReportSection2.pdf')
+    assert df.loc[1, 'path'] == path
+    assert os.path.exists(path)
+
+
+def test_export_timeout(mock, client, tmp_path):
+    mock.export_polls = 1000
+
+    df = exporter(client, tmp_path, timeout=0.2).run([{'workspace_id': 'ws-1', 'report_id': 'report-1'}])
+
+    assert list(df['status']) == ['TimedOut']
+    assert mock.exports['export-0']['polls'] > 1
@@ -0,0 +1,121 @@
+import time
+import pandas as pd
+from dataset import Dataset
+from inventory import InventoryStore
+from plan import PlanReader
+from scanner import Scanner
+from workspace import Workspace
+
+
+def store(client, tmp_path, **kwargs) -> InventoryStore:
+    return InventoryStore(
+                Workspace('token', client, sink='none'), Dataset('token', client, sink='none'),
+                path=str(tmp_path / 'inventory.db'), **kwargs)
+
+
+def stored_ids(inventory: InventoryStore) -> list:
+    return sorted(id for id, in inventory.conn.execute('SELECT id FROM workspaces'))
+
+
+def test_incremental_sync(mock, client, tmp_path):
+    inventory = store(client, tmp_path)
+    scanner = Scanner('token', client)
+
+    # First sync scans every workspace
+    assert inventory.sync(scanner, poll_interval=0.01) == 5
+    assert stored_ids(inventory) == [f'ws-{i}' for i in range(5)]
+    assert inventory.conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0] == 5
+
+    # Then only the workspaces modified since the last one
+    mock.reset()
+    mock.modified = ['ws-1']
+
+    assert inventory.sync(scanner, poll_interval=0.01) == 1
+    assert 'modifiedSince=' in mock.urls[0]
+    assert [scan['workspaces'] for scan in mock.scans.values()] == [['ws-1']]
+
+    inventory.close()
+
+
+def test_full_sync_after_30_days(mock, client, tmp_path):
+    inventory = store(client, tmp_path)
+    scanner = Scanner('token', client)
+    inventory.sync(scanner, poll_interval=0.01)
+
+    with inventory.conn:
+        inventory.conn.execute("UPDATE sync_state SET value = '2020-01-01T00:00:00.0000000Z' WHERE name = 'modified_since'")
+        inventory.conn.execute("INSERT INTO workspaces VALUES ('ws-deleted', 'Deleted', 'DELETED', '{}')")
+
+    # modifiedSince only accepts the last 30 days: every workspace is scanned, deleted ones removed
+    mock.reset()
+    assert inventory.sync(scanner, poll_interval=0.01) == 5
+    assert 'modifiedSince=' not in mock.urls[0]
+    assert stored_ids(inventory) == [f'ws-{i}' for i in range(5)]
+
+    high_water = inventory.conn.execute("SELECT value FROM sync_state WHERE name = 'modified_since'").fetchone()[0]
+    assert high_water > '2020-01-01'
+
+    inventory.close()
+
+
+def test_ttl(mock, client, tmp_path):
+    inventory = store(client, tmp_path, ttl={'workspaces': 0.3, 'users': 0.3})
+
+    inventory.refresh_workspaces()
+    inventory.refresh_users('ws-1')
+    requests = mock.requests
+
+    # Fresh listings aren't requested again
+    inventory.refresh_workspaces()
+    inventory.refresh_users('ws-1')
+    assert mock.requests == requests
+
+    inventory.refresh_users('ws-2')
+    assert mock.requests == requests + 1
+
+    time.sleep(0.3)
+    inventory.refresh_workspaces()
+    inventory.refresh_users('ws-1')
+    assert mock.requests == requests + 3
+
+    inventory.refresh_workspaces(force=True)
+    assert mock.requests == requests + 4
+
+    inventory.close()
+
+
+def test_resolve_frame(mock, client, tmp_path):
+    inventory = store(client, tmp_path)
+    df = pd.DataFrame({
+        'Workspace': ['workspace 1', ' WORKSPACE 2 ', 'Workspace 2', 'Nope', None],
+        'Report': ['report 3', 'REPORT 4', 'missing', 'Report 1', 'Report 1'],
+    })
+
+    df = inventory.resolve_frame(df, workspace_column='Workspace', report_column='Report')
+
+    # Names are matched case-insensitive (and trimmed), rows not found get empty ids
+    assert list(df['workspace_id']) == ['ws-1', 'ws-2', 'ws-2', '', '']
+    assert list(df['report_id']) == ['report-3', 'report-4', '', '', '']
+    assert list(df['dataset_id']) == ['dataset-3', 'dataset-4', '', '', '']
+
+    # Workspaces listed once, reports only of the workspaces found
+    assert mock.urls[0].startswith('/groups?')
+    assert sorted(mock.urls[1:]) == ['/groups/ws-1/reports', '/groups/ws-2/reports']
+
+    inventory.close()
+
+
+def test_plan_names_resolved(mock, client, tmp_path):
+    inventory = store(client, tmp_path)
+    path = tmp_path / 'plan.csv'
+    path.write_text(
+                'Workspace,Report,user_principal_name,access_right\n'
+                'WORKSPACE 1,report 2,a@contoso.com,Read\n'
+                'Workspace 9,Report 1,b@contoso.com,Read\n')
+
+    plan = PlanReader(str(path), inventory=inventory, workspace_column='Workspace', report_column='Report')
+
+    assert list(plan) == [{'user_principal_name': 'a@contoso.com', 'workspace_id': 'ws-1', 'dataset_id': 'dataset-2', 'access_right': 'Read'}]
+    assert plan.stats['not_found'] == 1
+
+    inventory.close()
@@ -0,0 +1,96 @@
+import json
+from metrics import Metrics, endpoint_name
+
+
+URL = 'https://api.powerbi.com/v1.0/myorg/groups/ws-1/users'
+
+
+def test_endpoint_name():
+    assert endpoint_name(URL) == '/groups/{id}/users'
+    assert endpoint_name('https://api.powerbi.com/v1.0/myorg/groups?$top=10') == '/groups'
+    assert endpoint_name('https://api.powerbi.com/v1.0/myorg/groups/ws-1/datasets/ds-1/refreshes') == '/groups/{id}/datasets/{id}/refreshes'
+
+
+def test_histogram_counts():
+    metrics = Metrics(buckets=(0.1, 1, 10))
+
+    for seconds in [0.05, 0.1, 0.5, 2, 20]:
+        metrics.record_request('GET', URL, 200, seconds)
+
+    buckets = [line.rsplit(' ', 1)[1] for line in metrics.to_prometheus().splitlines() if '_bucket{' in line]
+
+    # Buckets are cumulative (requests up to each bound)
+    assert buckets == ['2', '3', '4', '5']
+
+
+def test_to_json():
+    metrics = Metrics()
+    metrics.record_request('GET', URL, 200, 0.2, bytes_received=100)
+    metrics.record_request('GET', URL.replace('ws-1', 'ws-2'), 429, 0.4, bytes_received=50)
+    metrics.record_retry('GET', URL)
+    metrics.record_request('POST', URL, 'error', 1.0, bytes_sent=10)
+    metrics.record_quota_wait(2.5)
+
+    summary = metrics.to_json()
+
+    assert json.loads(json.dumps(summary)) == summary
+    assert summary['requests'] == 3
+    assert summary['throttled'] == 1
+    assert summary['retries'] == 1
+    assert summary['quota_wait_seconds'] == 2.5
+
+    endpoints = {(e['method'], e['endpoint']): e for e in summary['endpoints']}
+    get = endpoints[('GET', '/groups/{id}/users')]
+
+    assert get['count'] == 2
+    assert abs(get['mean_seconds'] - 0.3) < 1e-9
+    assert get['max_seconds'] == 0.4
+    assert get['statuses'] == {'200': 1, '429': 1}
+    assert get['bytes_received'] == 150
+    assert endpoints[('POST', '/groups/{id}/users')]['statuses'] == {'error': 1}
+
+
+def test_to_prometheus():
+    metrics = Metrics(buckets=(0.1, 1))
+    metrics.record_request('GET', URL, 200, 0.05, bytes_received=100)
+    metrics.record_request('GET', URL, 429, 0.5)
+    metrics.record_retry('GET', URL)
+
+    lines = metrics.to_prometheus().splitlines()
+    labels = 'method="GET",endpoint="/groups/{id}/users"'
+
+    assert '# TYPE powerbi_request_duration_seconds histogram' in lines
+    assert f'powerbi_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in lines
+    assert f'powerbi_request_duration_seconds_bucket{{{labels},le="1"}} 2' in lines
+    assert f'powerbi_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f'powerbi_request_duration_seconds_count{{{labels}}} 2' in lines
+    assert f'powerbi_requests_total{{{labels},status="200"}} 1' in lines
+    assert f'powerbi_requests_total{{{labels},status="429"}} 1' in lines
+    assert f'powerbi_bytes_received_total{{{labels}}} 100' in lines
+    assert f'powerbi_retries_total{{{labels}}} 1' in lines
+    assert 'powerbi_quota_wait_seconds_total 0.0' in lines
+
+
+def test_client_requests_are_measured(mock, client):
+    spans = []
+    client.metrics.add_span_callback(on_end=spans.append)
+
+    client.get(f'{mock.url}/groups')
+    client.get(f'{mock.url}/groups/ws-1/users')
+
+    summary = client.metrics.to_json()
+
+    assert summary['requests'] == 2
+    assert {e['endpoint'] for e in summary['endpoints']} == {'/groups', '/groups/{id}/users'}
+    assert all(e['bytes_received'] > 0 for e in summary['endpoints'])
+    assert [(span['endpoint'], span['status']) for span in spans] == [('/groups', 200), ('/groups/{id}/users', 200)]
+
+
+def test_reset():
+    metrics = Metrics()
+    metrics.record_request('GET', URL, 200, 0.1)
+    metrics.record_quota_wait(1)
+
+    metrics.reset()
+
+    assert metrics.to_json() == {'requests': 0, 'throttled': 0, 'retries': 0, 'quota_wait_seconds': 0.0, 'endpoints': []}
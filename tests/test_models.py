@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import pickle
+import subprocess
+import pytest
+from models import Collection, WorkspaceRecord
+from sinks import write_jsonl
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_record_api():
+    record = WorkspaceRecord({'id': 'ws-1', 'name': 'Sales', 'custom': 1})
+
+    assert record['id'] == record.id == 'ws-1'
+    assert record.get('description') is None
+    assert list(record) == ['id', 'name', 'custom']
+    assert len(record) == 3
+    assert dict(record) == {'id': 'ws-1', 'name': 'Sales', 'custom': 1}
+
+    # Known fields are slots: no per-record dict
+    assert not hasattr(record, '__dict__')
+    assert WorkspaceRecord({'id': 'ws-2'})._extra is None
+
+    with pytest.raises(KeyError):
+        record['description']
+
+    with pytest.raises(AttributeError):
+        record.name = 'Finance'
+
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_record_to_dict():
+    record = WorkspaceRecord({'id': 'ws-1', 'name': 'Sales', 'custom': 1})
+
+    assert json.loads(json.dumps(record.to_dict())) == {'id': 'ws-1', 'name': 'Sales', 'custom': 1}
+
+
+def test_jsonl_sink(tmp_path):
+    records = Collection(WorkspaceRecord, [{'id': 'ws-1', 'name': 'Sales'}, {'id': 'ws-2'}])
+    path = tmp_path / 'workspaces.jsonl'
+
+    write_jsonl(records, str(path))
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [{'id': 'ws-1', 'name': 'Sales'}, {'id': 'ws-2'}]
+
+
+def test_to_frame_is_lazy():
+    code = ('import sys; from models import Collection, WorkspaceRecord; '
+            'records = Collection(WorkspaceRecord, [{"id": "ws-1"}]); loaded = "pandas" in sys.modules; '
+            'df = records.to_frame(); print(loaded, "pandas" in sys.modules, list(df["id"]))')
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    # pandas is only imported by the conversion
+    assert result.stdout.strip() == "False True ['ws-1']"
+
+
+def test_to_frame_columns():
+    records = Collection(WorkspaceRecord, [{'id': 'ws-1', 'name': 'Sales'}, {'id': 'ws-2', 'state': 'Deleted'}])
+
+    df = records.to_frame()
+
+    assert list(df.columns) == ['id', 'name', 'state']
+    assert list(df['id']) == ['ws-1', 'ws-2']
+    assert list(records.to_frame(['name']).columns) == ['name']
@@ -0,0 +1,99 @@
+import time
+import threading
+from urllib.parse import parse_qs, urlsplit
+from pagination import page_url, paginate
+from workspace import Workspace
+
+
+class FakeListing:
+    """
+    Listing of `n` items paged with $top/$skip, or with @odata.nextLink when `next_link` is set.
+    """
+
+    def __init__(self, n: int, next_link: int = 0):
+        self.items = [{'id': i} for i in range(n)]
+        self.next_link = next_link
+        self.urls = []
+        self.lock = threading.Lock()
+
+
+    def fetch(self, url: str) -> dict:
+        with self.lock:
+            self.urls.append(url)
+
+        query = parse_qs(urlsplit(url).query)
+        skip = int(query.get('$skip', ['0'])[0])
+
+        if self.next_link:
+            page = self.items[skip:skip + self.next_link]
+            body = {'value': page}
+
+            if skip + self.next_link < len(self.items):
+                body['@odata.nextLink'] = f'https://api/items?$skip={skip + self.next_link}'
+
+            return body
+
+        top = int(query.get('$top', ['0'])[0])
+
+        return {'value': self.items[skip:skip + top] if top else self.items}
+
+
+def test_page_url():
+    assert page_url('https://api/groups', 0, 0) == 'https://api/groups'
+    assert page_url('https://api/groups', 10, 20) == 'https://api/groups?$top=10&$skip=20'
+    assert page_url('https://api/groups?$filter=x', 10, 0) == 'https://api/groups?$filter=x&$top=10&$skip=0'
+
+
+def test_top_skip_stops_on_short_page():
+    listing = FakeListing(25)
+
+    assert [item['id'] for item in paginate(listing.fetch, 'https://api/items', 10)] == list(range(25))
+    assert [parse_qs(urlsplit(url).query)['$skip'][0] for url in listing.urls] == ['0', '10', '20']
+
+
+def test_top_skip_stops_on_empty_page():
+    listing = FakeListing(20)
+
+    assert len(list(paginate(listing.fetch, 'https://api/items', 10))) == 20
+
+    # A full last page needs one more (empty) page to know it was the last
+    assert len(listing.urls) == 3
+
+
+def test_next_link():
+    listing = FakeListing(25, next_link=10)
+
+    assert [item['id'] for item in paginate(listing.fetch, 'https://api/items')] == list(range(25))
+    assert listing.urls == ['https://api/items', 'https://api/items?$skip=10', 'https://api/items?$skip=20']
+
+
+def test_prefetch_one_page_ahead():
+    listing = FakeListing(100)
+    items = paginate(listing.fetch, 'https://api/items', 10)
+
+    next(items)
+
+    # The next page is requested while the current one is processed...
+    deadline = time.time() + 5
+    while (len(listing.urls) < 2) & (time.time() < deadline):
+        time.sleep(0.01)
+
+    time.sleep(0.1)
+
+    # ...but never more than one ahead
+    assert len(listing.urls) == 2
+
+    items.close()
+    time.sleep(0.1)
+
+    # Nothing else is requested after the caller stops
+    assert len(listing.urls) == 2
+
+
+def test_iter_workspaces(mock, client):
+    workspace = Workspace('token', client, sink='none')
+
+    workspaces = list(workspace.iter_workspaces(page_size=2))
+
+    assert [w['id'] for w in workspaces] == [f'ws-{i}' for i in range(5)]
+    assert mock.urls == ['/groups?$top=2&$skip=0', '/groups?$top=2&$skip=2', '/groups?$top=2&$skip=4']
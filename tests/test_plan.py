@@ -0,0 +1,37 @@
+import os
+import sys
+import subprocess
+from plan import PlanReader
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_duplicates_dropped_across_chunks(tmp_path):
+    path = tmp_path / 'plan.csv'
+    path.write_text(
+                'user_principal_name,workspace_id,dataset_id,access_right\n'
+                'a@contoso.com,ws-1,dataset-1,Read\n'
+                'b@contoso.com,ws-1,dataset-1,Read\n'
+                'a@contoso.com,ws-1,dataset-1,Read\n'
+                'c@contoso.com,ws-1,dataset-1,Owner\n'
+                'b@contoso.com,ws-1,dataset-1,Read\n'
+                ',ws-1,dataset-1,Read\n'
+                'd@contoso.com,ws-1,dataset-1,Read\n')
+
+    plan = PlanReader(str(path), chunk_size=2)
+    users = [operation['user_principal_name'] for operation in plan]
+
+    assert users == ['a@contoso.com', 'b@contoso.com', 'd@contoso.com']
+    assert plan.stats == {'rows': 7, 'owners': 1, 'not_found': 0, 'invalid': 1, 'duplicated': 2}
+
+    # Each iteration starts over
+    assert len(list(plan)) == 3
+    assert plan.stats['duplicated'] == 2
+
+
+def test_import_does_not_load_pandas():
+    code = 'import sys, plan; print("pandas" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == 'False'
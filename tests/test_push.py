@@ -0,0 +1,69 @@
+import pandas as pd
+import pyarrow as pa
+from dataset import Dataset
+from push import RowPusher, table_schema
+
+
+def rows(n: int, start: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({'id': range(start, start + n), 'amount': [1.5] * n})
+
+
+def test_table_schema():
+    df = rows(1).assign(name='a', active=True, date=pd.Timestamp('2024-01-01'))
+    expected = {'name': 'Sales', 'columns': [
+        {'name': 'id', 'dataType': 'Int64'},
+        {'name': 'amount', 'dataType': 'Double'},
+        {'name': 'name', 'dataType': 'String'},
+        {'name': 'active', 'dataType': 'Boolean'},
+        {'name': 'date', 'dataType': 'DateTime'},
+    ]}
+
+    assert table_schema('Sales', df) == expected
+    assert table_schema('Sales', pa.Table.from_pandas(df, preserve_index=False)) == expected
+
+
+def test_chunks_regroup_batches(client):
+    pusher = RowPusher(Dataset('token', client, sink='none'))
+    batches = [rows(3000, start) for start in range(0, 24000, 3000)]
+    batches += [pa.RecordBatch.from_pandas(rows(1000, 24000 + start), preserve_index=False) for start in range(0, 3000, 1000)]
+
+    chunks = list(pusher.chunks(iter(batches)))
+
+    # Small batches are merged, only the last chunk is smaller
+    assert [len(chunk) for chunk in chunks] == [10000, 10000, 7000]
+    assert list(pd.concat(chunks)['id']) == list(range(27000))
+
+
+def test_push_10k_chunks(mock, client):
+    pusher = RowPusher(Dataset('token', client, sink='none'), max_requests=100000)
+
+    stats = pusher.push('ws-1', 'dataset-1', 'Sales', rows(25000))
+
+    assert stats == {'chunks': 3, 'rows': 25000, 'skipped': 0, 'failed': 0}
+    assert sorted(len(pushed) for pushed in mock.pushed) == [5000, 10000, 10000]
+    assert sorted(row['id'] for pushed in mock.pushed for row in pushed) == list(range(25000))
+    assert all(url == '/groups/ws-1/datasets/dataset-1/tables/Sales/rows' for url in mock.urls)
+
+
+def test_push_resume_skips_journaled_chunks(mock, client):
+    pusher = RowPusher(Dataset('token', client, sink='none'), workers=1, journal_path='push.jsonl', max_requests=100000)
+    # The second chunk fails (POST isn't retried on 5xx)
+    mock.errors = [None, 500]
+
+    stats = pusher.push('ws-1', 'dataset-1', 'Sales', rows(25000), batch_id='day-1')
+
+    assert stats == {'chunks': 2, 'rows': 15000, 'skipped': 0, 'failed': 1}
+
+    mock.reset()
+    stats = pusher.push('ws-1', 'dataset-1', 'Sales', rows(25000), batch_id='day-1')
+
+    # Only the failed chunk is posted again
+    assert stats == {'chunks': 1, 'rows': 10000, 'skipped': 2, 'failed': 0}
+    assert [row['id'] for row in mock.pushed[0]] == list(range(10000, 20000))
+
+    # Another batch isn't skipped
+    mock.reset()
+    stats = pusher.push('ws-1', 'dataset-1', 'Sales', rows(25000), batch_id='day-2')
+
+    assert stats['chunks'] == 3
+    assert stats['skipped'] == 0
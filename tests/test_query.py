@@ -0,0 +1,47 @@
+import pyarrow.parquet as pq
+from dataset import Dataset
+from query import QueryExtractor
+
+
+def test_windows_split_under_the_rows_limit(mock, client, tmp_path):
+    mock.table = [{'Key': key, 'Amount': float(key)} for key in range(100)]
+    mock.query_max_rows = 10
+    extractor = QueryExtractor(Dataset('token', client, sink='none'), workers=2, max_rows=10)
+    path = str(tmp_path / 'sales.parquet')
+
+    result = extractor.to_parquet('ws-1', 'dataset-1', 'Sales', 'Key', path)
+
+    assert result['rows'] == 100
+    assert result['truncated'] == 0
+    assert all(window['rows'] < 10 for window in result['report'])
+    assert sorted(pq.read_table(path).column('Key').to_pylist()) == list(range(100))
+
+
+def test_window_that_cant_be_split_is_flagged(mock, client, tmp_path):
+    # 30 rows on a single key value: more than a query returns
+    mock.table = [{'Key': key, 'Amount': 1.0} for key in list(range(100)) + [50] * 29]
+    mock.query_max_rows = 10
+    extractor = QueryExtractor(Dataset('token', client, sink='none'), workers=2, max_rows=10)
+    path = str(tmp_path / 'sales.parquet')
+
+    result = extractor.to_parquet('ws-1', 'dataset-1', 'Sales', 'Key', path)
+    truncated = [window for window in result['report'] if window['truncated']]
+
+    assert result['truncated'] == 1
+    assert truncated == [{'low': 50, 'high': 51, 'rows': 10, 'truncated': True}]
+    assert result['rows'] == 99 + 10
+    assert pq.read_table(path).num_rows == result['rows']
+
+
+def test_windows_split_under_the_bytes_limit(mock, client, tmp_path):
+    mock.table = [{'Key': key, 'Name': 'x' * 100} for key in range(40)]
+    extractor = QueryExtractor(Dataset('token', client, sink='none'), max_bytes=1000)
+    path = str(tmp_path / 'names.parquet')
+
+    result = extractor.to_parquet('ws-1', 'dataset-1', 'Names', 'Key', path)
+
+    # A single window by rows, split until each response fits
+    assert result['windows'] == 1
+    assert result['rows'] == 40
+    assert result['truncated'] == 0
+    assert len(result['report']) > 4
@@ -0,0 +1,65 @@
+import time
+import multiprocessing
+from rate_limiter import RateLimiter
+
+
+MAX_REQUESTS = 5
+PERIOD = 0.5
+
+
+def take_slots(state_file: str, n: int, times):
+    rate_limiter = RateLimiter(MAX_REQUESTS, PERIOD, state_file=state_file)
+
+    for _ in range(n):
+        rate_limiter.acquire()
+        times.put(time.time())
+
+
+def wait_for_slot(state_file: str, waited):
+    waited.put(RateLimiter(MAX_REQUESTS, PERIOD, state_file=state_file).acquire())
+
+
+def run(target, *args, processes: int = 1):
+    workers = [multiprocessing.Process(target=target, args=args) for _ in range(processes)]
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+
+def test_quota_shared_between_processes(tmp_path):
+    times = multiprocessing.Queue()
+
+    run(take_slots, str(tmp_path / 'rate_limit.db'), 6, times, processes=4)
+
+    times = sorted(times.get() for _ in range(24))
+
+    # Never more than MAX_REQUESTS in any window (times are taken right after each slot, hence the tolerance)
+    for i in range(len(times) - MAX_REQUESTS):
+        assert times[i + MAX_REQUESTS] - times[i] >= PERIOD - 0.05
+
+    # 24 requests need at least 4 full windows
+    assert times[-1] - times[0] >= 4 * PERIOD - 0.05
+
+
+def test_pause_shared_between_processes(tmp_path):
+    state_file = str(tmp_path / 'rate_limit.db')
+    waited = multiprocessing.Queue()
+
+    RateLimiter(MAX_REQUESTS, PERIOD, state_file=state_file).pause(1)
+    run(wait_for_slot, state_file, waited)
+
+    assert waited.get() >= 0.9
+
+
+def test_in_memory_window():
+    rate_limiter = RateLimiter(MAX_REQUESTS, PERIOD, state_file=None)
+
+    started = time.time()
+    waits = [rate_limiter.acquire() for _ in range(MAX_REQUESTS + 1)]
+
+    assert waits[:MAX_REQUESTS] == [0] * MAX_REQUESTS
+    assert time.time() - started >= PERIOD - 0.01
@@ -0,0 +1,81 @@
+import pandas as pd
+from reconcile import ACTIONS_ORDER, apply_changes, plan_changes
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=['workspace_id', 'principal', 'right'])
+
+
+CURRENT = frame([
+    ('ws-1', 'keep@contoso.com', 'Member'),
+    ('ws-1', 'promote@contoso.com', 'Viewer'),
+    ('ws-1', 'drop@contoso.com', 'Member'),
+    ('ws-1', 'unlisted@contoso.com', 'Viewer'),
+    ('ws-2', 'other@contoso.com', 'Admin'),
+])
+
+
+def actions(plan):
+    return list(plan[['workspace_id', 'principal', 'action']].itertuples(index=False, name=None))
+
+
+def test_minimal_changes():
+    desired = frame([
+        ('ws-1', 'drop@contoso.com', None),
+        ('ws-1', 'KEEP@contoso.com', 'Member'),
+        ('ws-1', 'promote@contoso.com', 'Admin'),
+        ('ws-1', 'new@contoso.com', 'Viewer'),
+        ('ws-1', 'gone@contoso.com', 'None'),
+    ])
+
+    plan = plan_changes(desired, CURRENT, item_columns=['workspace_id'])
+
+    # Unchanged and already removed principals are left out, grants come first
+    assert actions(plan) == [
+        ('ws-1', 'new@contoso.com', 'add'),
+        ('ws-1', 'promote@contoso.com', 'update'),
+        ('ws-1', 'drop@contoso.com', 'remove'),
+    ]
+    assert list(plan['action']) == sorted(plan['action'], key=ACTIONS_ORDER.index)
+    assert plan.loc[1, 'current_right'] == 'Viewer'
+
+
+def test_prune_only_listed_items():
+    desired = frame([('ws-1', 'keep@contoso.com', 'Member')])
+
+    plan = plan_changes(desired, CURRENT, item_columns=['workspace_id'], prune=True)
+
+    # ws-2 isn't on desired, so its users are kept
+    assert sorted(actions(plan)) == [
+        ('ws-1', 'drop@contoso.com', 'remove'),
+        ('ws-1', 'promote@contoso.com', 'remove'),
+        ('ws-1', 'unlisted@contoso.com', 'remove'),
+    ]
+
+
+def test_last_row_of_a_principal_wins():
+    desired = frame([('ws-1', 'promote@contoso.com', 'Member'), ('ws-1', 'PROMOTE@contoso.com', 'Admin')])
+
+    plan = plan_changes(desired, CURRENT, item_columns=['workspace_id'])
+
+    assert actions(plan) == [('ws-1', 'PROMOTE@contoso.com', 'update')]
+    assert plan.loc[0, 'right'] == 'Admin'
+
+
+def test_apply_changes():
+    desired = frame([('ws-1', 'new@contoso.com', 'Viewer'), ('ws-1', 'drop@contoso.com', None)])
+    plan = plan_changes(desired, CURRENT, item_columns=['workspace_id'])
+    calls = []
+
+    def action(name, response):
+        return lambda row: calls.append((name, row['principal'])) or response
+
+    df = apply_changes(plan, {
+        'add': action('add', {'message': 'Success'}),
+        'update': action('update', {'message': 'Success'}),
+        'remove': action('remove', {'message': {'error': {'status': 401, 'description': 'not authorized'}, 'content': ''}}),
+    })
+
+    assert calls == [('add', 'new@contoso.com'), ('remove', 'drop@contoso.com')]
+    assert list(df['status']) == ['Done', 'not authorized']
+    assert list(df['status_code']) == [200, 401]
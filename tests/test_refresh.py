@@ -0,0 +1,98 @@
+import pytest
+from dataset import Dataset
+from refresh import RefreshOrchestrator, topological_order
+
+
+def orchestrator(client, **kwargs) -> RefreshOrchestrator:
+    return RefreshOrchestrator(Dataset('token', client, sink='none'), min_poll=0.01, max_poll=0.1, **kwargs)
+
+
+def test_topological_order():
+    dependencies = {'c': ['a', 'b'], 'd': ['c'], 'b': ['a', 'other']}
+
+    assert topological_order(['d', 'c', 'b', 'a'], dependencies) == ['a', 'b', 'c', 'd']
+
+    with pytest.raises(ValueError):
+        topological_order(['a', 'b'], {'a': ['b'], 'b': ['a']})
+
+
+def test_dependencies_and_failures(mock, client):
+    datasets = [
+        {'workspace_id': 'ws-1', 'dataset_id': 'a'},
+        {'workspace_id': 'ws-2', 'dataset_id': 'b'},
+        {'workspace_id': 'ws-1', 'dataset_id': 'c'},
+        {'workspace_id': 'ws-2', 'dataset_id': 'd'},
+        {'workspace_id': 'ws-3', 'dataset_id': 'failed-e'},
+        {'workspace_id': 'ws-3', 'dataset_id': 'f'},
+        {'workspace_id': 'ws-4', 'dataset_id': 'broken-g'},
+        {'workspace_id': 'ws-4', 'dataset_id': 'h'},
+        {'workspace_id': 'ws-4', 'dataset_id': 'i'},
+    ]
+    dependencies = {'c': ['a', 'b'], 'd': ['c'], 'f': ['failed-e'], 'h': ['broken-g'], 'i': ['h']}
+
+    df = orchestrator(client, max_per_group=1).run(datasets, dependencies)
+    results = df.set_index('dataset_id')
+
+    assert results['status'].to_dict() == {
+        'a': 'Completed', 'b': 'Completed', 'c': 'Completed', 'd': 'Completed',
+        'failed-e': 'Failed', 'f': 'Skipped', 'broken-g': 'Failed', 'h': 'Skipped', 'i': 'Skipped',
+    }
+    assert results.loc['c', 'request_id'] == 'request-c'
+
+    # Dependents start after their sources complete, independent datasets right away
+    started = {dataset_id: refresh['started'] for dataset_id, refresh in mock.refreshes.items()}
+    assert started['c'] >= max(started['a'], started['b']) + mock.refresh_seconds
+    assert started['d'] >= started['c'] + mock.refresh_seconds
+    assert abs(started['a'] - started['b']) < mock.refresh_seconds
+
+    # Refreshes that never ran
+    assert set(mock.refreshes) == {'a', 'b', 'c', 'd', 'failed-e'}
+
+
+def test_concurrency_per_group(mock, client):
+    datasets = [{'workspace_id': f'ws-{i % 2}', 'dataset_id': f'dataset-{i}'} for i in range(6)]
+
+    df = orchestrator(client, max_per_group=2).run(datasets)
+
+    assert set(df['status']) == {'Completed'}
+    assert mock.max_running_refreshes == {'ws-0': 2, 'ws-1': 2}
+
+    # Workspaces of the same capacity share its slots
+    mock.reset()
+    df = orchestrator(client, max_per_group=2).run(datasets, groups={'ws-0': 'capacity', 'ws-1': 'capacity'})
+
+    starts = [refresh['started'] for refresh in mock.refreshes.values()]
+    running = [sum(1 for start in starts if start <= t < start + mock.refresh_seconds) for t in starts]
+
+    assert set(df['status']) == {'Completed'}
+    assert max(running) == 2
+
+
+def test_adaptive_polling(mock, client):
+    mock.refresh_seconds = 0.3
+    datasets = [{'workspace_id': 'ws-1', 'dataset_id': f'dataset-{i}'} for i in range(3)]
+
+    df = orchestrator(client, max_per_group=3).run(datasets)
+
+    # First poll when the refresh is expected to end (its last duration), so none is wasted
+    assert set(df['status']) == {'Completed'}
+    assert list(df['polls']) == [1, 1, 1]
+
+    for refresh in mock.refreshes.values():
+        assert refresh['polls'][0] - refresh['started'] >= 0.3
+
+
+def test_polling_interval_grows(mock, client, monkeypatch):
+    # Without a previous duration, polls start at min_poll and grow up to max_poll
+    monkeypatch.setattr(RefreshOrchestrator, '_expected_seconds', lambda self, workspace_id, dataset_id: 0)
+    mock.refresh_seconds = 0.5
+
+    df = orchestrator(client, backoff=2).run([{'workspace_id': 'ws-1', 'dataset_id': 'dataset-1'}])
+
+    polls = mock.refreshes['dataset-1']['polls']
+    gaps = [b - a for a, b in zip(polls, polls[1:])]
+
+    assert df.loc[0, 'status'] == 'Completed'
+    assert gaps[0] < gaps[1] < gaps[2]
+    assert all(gap < 0.1 + 0.05 for gap in gaps)
+    assert len(polls) < 12
@@ -0,0 +1,121 @@
+import time
+import random
+from email.utils import formatdate
+import pytest
+from client import Client
+from rate_limiter import RateLimiter
+from retry import RetryPolicy
+
+
+def make_client(mock, **retry) -> Client:
+    return Client(
+                base_url=mock.url,
+                rate_limiter=RateLimiter(100000, 60, state_file=None),
+                retry=RetryPolicy(**retry))
+
+
+def test_retry_after_parsing():
+    policy = RetryPolicy()
+
+    assert policy.delay(0, '3') == 3
+    assert policy.delay(0, '1.5') == 1.5
+    assert policy.delay(0, '-1') == 0
+    assert 28 <= policy.delay(0, formatdate(time.time() + 30, usegmt=True)) <= 30
+
+    # Long values aren't clamped
+    assert policy.delay(0, '1200') == 1200
+
+
+def test_full_jitter_backoff():
+    policy = RetryPolicy(backoff=1, max_backoff=10)
+    random.seed(0)
+
+    for attempt in range(8):
+        delays = [policy.delay(attempt, 'invalid') for _ in range(200)]
+
+        assert all(0 <= delay <= min(2 ** attempt, 10) for delay in delays)
+        assert max(delays) > min(2 ** attempt, 10) / 2
+
+
+def test_throttled_requests_are_retried(mock):
+    mock.throttle_rate = 0.5
+    mock.retry_after = 0
+    client = make_client(mock, max_retries=20)
+
+    responses = [client.get(f'{mock.url}/groups') for _ in range(20)]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert mock.throttled > 0
+    assert mock.requests == 20 + mock.throttled
+    assert client.metrics.to_json()['retries'] == mock.throttled
+
+    client.close()
+
+
+def test_retries_exhausted(mock):
+    mock.throttle_rate = 1
+    mock.retry_after = 0
+    client = make_client(mock, max_retries=3)
+
+    response = client.get(f'{mock.url}/groups')
+
+    assert response.status_code == 429
+    assert mock.requests == 4
+
+    client.close()
+
+
+def test_gives_up_on_long_retry_after(mock):
+    mock.throttle_rate = 1
+    mock.retry_after = 1200
+    client = make_client(mock, max_retry_after=900)
+
+    started = time.time()
+    response = client.get(f'{mock.url}/groups')
+
+    # Returned right away, but the quota stays paused for the whole Retry-After
+    assert response.status_code == 429
+    assert mock.requests == 1
+    assert time.time() - started < 1
+    assert client.rate_limiter.paused() > 1100
+
+    client.close()
+
+
+def test_transient_errors_are_retried(mock):
+    mock.errors = [503, 502]
+    client = make_client(mock, backoff=0.01)
+
+    response = client.get(f'{mock.url}/groups')
+
+    assert response.status_code == 200
+    assert mock.requests == 3
+
+    client.close()
+
+
+@pytest.mark.parametrize('method, status', [('GET', 404), ('GET', 501), ('POST', 503), ('POST', 500)])
+def test_not_retried(mock, method, status):
+    mock.errors = [status]
+    client = make_client(mock, backoff=0.01)
+
+    response = client.request(method, f'{mock.url}/groups')
+
+    assert response.status_code == status
+    assert mock.requests == 1
+
+    client.close()
+
+
+def test_throttled_post_is_retried(mock):
+    # Throttled requests aren't processed, so any method can be sent again
+    mock.errors = [429]
+    mock.retry_after = 0
+    client = make_client(mock)
+
+    response = client.post(f'{mock.url}/groups/ws-1/users', json={})
+
+    assert response.status_code == 200
+    assert mock.requests == 2
+
+    client.close()
@@ -0,0 +1,41 @@
+from scanner import Scanner
+
+
+def test_scan(mock, client):
+    mock.scan_polls = 2
+    scanner = Scanner('token', client)
+    workspace_ids = [f'ws-{i}' for i in range(250)]
+
+    workspaces = list(scanner.scan(workspace_ids, poll_interval=0.05))
+
+    # Batches of up to 100 workspaces, all scans polled at the same time
+    assert sorted(len(scan['workspaces']) for scan in mock.scans.values()) == [50, 100, 100]
+    assert mock.max_running_scans == 3
+    assert all(scan['polls'] == 3 for scan in mock.scans.values())
+    assert all(url.endswith('getInfo?lineage=true&getArtifactUsers=true') for url in mock.urls if 'getInfo' in url)
+
+    assert sorted(workspace['id'] for workspace in workspaces) == sorted(workspace_ids)
+
+    # Same fields as the listings
+    for workspace in workspaces:
+        assert isinstance(workspace['datasets'], list)
+        assert isinstance(workspace['users'], list)
+        assert all(report['datasetWorkspaceId'] == workspace['id'] for report in workspace['reports'])
+
+
+def test_scan_all_workspaces(mock, client):
+    mock.items = 120
+
+    workspaces = list(Scanner('token', client).scan(poll_interval=0.01))
+
+    assert len(workspaces) == 120
+    assert sorted(len(scan['workspaces']) for scan in mock.scans.values()) == [20, 100]
+    assert mock.urls[0] == '/admin/workspaces/modified?excludePersonalWorkspaces=true'
+
+
+def test_modified_workspaces(mock, client):
+    mock.modified = ['ws-1', 'ws-3']
+    scanner = Scanner('token', client)
+
+    assert scanner.modified_workspaces('2024-01-01T00:00:00Z', exclude_personal=False) == ['ws-1', 'ws-3']
+    assert mock.urls == ['/admin/workspaces/modified?excludePersonalWorkspaces=false&modifiedSince=2024-01-01T00:00:00Z']
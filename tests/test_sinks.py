@@ -0,0 +1,71 @@
+import os
+import json
+import pandas as pd
+import pytest
+from sinks import SinkWriter
+from workspace import Workspace
+
+
+READERS = {
+    'csv': ('.csv', pd.read_csv),
+    'jsonl': ('.jsonl', lambda path: pd.DataFrame([json.loads(line) for line in open(path)])),
+    'parquet': ('.parquet', pd.read_parquet),
+    'excel': ('.xlsx', pd.read_excel),
+}
+
+
+@pytest.mark.parametrize('sink', list(READERS))
+def test_files_per_sink(mock, client, sink):
+    workspace = Workspace('token', client, sink='none')
+
+    response = workspace.list_users('ws-1', sink=sink)
+    workspace.flush()
+
+    extension, reader = READERS[sink]
+
+    # Only the file of the chosen sink is written
+    assert os.listdir('data/users') == [f'users_ws-1{extension}']
+
+    df = reader(f'data/users/users_ws-1{extension}')
+
+    assert len(df) == len(response['content'])
+    assert list(df['identifier']) == [user['identifier'] for user in response['content']]
+
+
+def test_sink_none(mock, client):
+    workspace = Workspace('token', client, sink='none')
+
+    workspace.list_users('ws-1')
+    workspace.list_reports('ws-1')
+    workspace.flush()
+
+    assert os.listdir('data/users') == []
+    assert os.listdir('data/reports') == []
+
+
+def test_object_sink(mock, client):
+    workspace = Workspace('token', client, sink='jsonl')
+
+    workspace.list_users('ws-1')
+    workspace.list_reports('ws-1', sink='csv')
+    workspace.flush()
+
+    # The call's sink overrides the object's
+    assert os.listdir('data/users') == ['users_ws-1.jsonl']
+    assert os.listdir('data/reports') == ['reports_ws-1.csv']
+
+
+def test_invalid_sink():
+    with pytest.raises(ValueError):
+        SinkWriter().write([{'id': 1}], 'data/records', sink='xml')
+
+
+def test_flush_raises_write_errors(tmp_path):
+    writer = SinkWriter()
+    # A directory where the file should be
+    os.makedirs(tmp_path / 'records.csv')
+
+    writer.write([{'id': 1}], str(tmp_path / 'records'), sink='csv')
+
+    with pytest.raises(OSError):
+        writer.flush()
@@ -0,0 +1,55 @@
+from workspace import Workspace
+
+
+def test_batch_update_user_keeps_repeated_rows(mock, client):
+    workspace = Workspace('token', client, sink='none')
+    workspaces = [{'id': 'ws-1', 'name': 'A'}, {'id': 'ws-2', 'name': 'B'}, {'id': 'ws-1', 'name': 'A'}]
+
+    df = workspace.batch_update_user('user@contoso.com', workspaces, access_right='Member')
+
+    # One row per input row, repeats updated once
+    assert list(df['id']) == ['ws-1', 'ws-2', 'ws-1']
+    assert list(df['status']) == ['Success', 'Success', 'Skipped']
+    assert df['error_message'].iloc[2] == 'duplicated'
+    assert mock.requests == 2
+
+
+def test_batch_update_user_structured_errors(mock, client):
+    workspace = Workspace('token', client, sink='none')
+    workspaces = [{'id': 'ws-1', 'name': 'A'}, {'id': 'ws-2', 'name': 'B'}, {'id': '', 'name': 'C'}, {'id': 'ws-4', 'name': 'D'}]
+    # The second request fails
+    mock.errors = [None, 400]
+
+    df = workspace.batch_update_user('user@contoso.com', workspaces, access_right='Member', workers=1)
+
+    assert list(df['id']) == ['ws-1', 'ws-2', '', 'ws-4']
+    assert list(df['status']) == ['Success', 'Error', 'Error', 'Success']
+    assert list(df['error_code']) == ['', 'MockError', '', '']
+    assert list(df['error_message']) == ['', 'mock error 400', 'Missing parameters, please check.', '']
+
+
+def test_batch_update_user_keeps_order_on_failures(mock, client, monkeypatch):
+    workspace = Workspace('token', client, sink='none')
+    workspaces = [{'id': f'ws-{i}', 'name': f'Workspace {i}'} for i in range(50)]
+    update_user = workspace.update_user
+
+    def failing_update_user(user_principal_name, workspace_id, access_right):
+        if int(workspace_id.split('-')[1]) % 3 == 0:
+            raise ConnectionError(f'{workspace_id} unreachable')
+
+        return update_user(user_principal_name=user_principal_name, workspace_id=workspace_id, access_right=access_right)
+
+    monkeypatch.setattr(workspace, 'update_user', failing_update_user)
+
+    df = workspace.batch_update_user('user@contoso.com', workspaces, access_right='Member', workers=8)
+
+    # Results keep the input order, whichever update finished first
+    assert list(df['id']) == [f'ws-{i}' for i in range(50)]
+
+    failed = df[df['status'] == 'Error']
+
+    assert list(failed['id']) == [f'ws-{i}' for i in range(0, 50, 3)]
+    assert set(failed['error_code']) == {'ConnectionError'}
+    assert list(failed['error_message']) == [f'ws-{i} unreachable' for i in range(0, 50, 3)]
+    assert set(df.loc[df['status'] != 'Error', 'status']) == {'Success'}
+    assert mock.requests == 50 - len(failed)
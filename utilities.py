@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 
 def create_directory(dir_path: str):
     """
@@ -9,4 +10,30 @@ def create_directory(dir_path: str):
     """
     
     if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
\ No newline at end of file
+        os.makedirs(dir_path)
+
+
+def get_operation_status(response: Dict) -> tuple:
+    """
+    Status of an add/update/remove response.
+
+    Args:
+        response (Dict): response of add_user, update_user or remove_user.
+
+    Returns:
+        tuple: update status ('Done' or error description) and HTTP status code, if known.
+    """
+    message = response['message']
+
+    if message == 'Success':
+        return 'Done', 200
+
+    if isinstance(message, str):
+        return message, None
+
+    error = message['error']
+
+    if isinstance(error, dict):
+        return error['description'], error['status']
+
+    return error, None
\ No newline at end of file
@@ -1,35 +1,75 @@
+import os
 import json
-import requests
-import pandas as pd
-from pandas.core.frame import DataFrame
-from typing import Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Union
+from auth import Auth
+from client import Client, PowerBIError
+from credentials import CredentialPool, client_for
+from models import Collection, OperationRecord, ReportRecord, UserRecord, WorkspaceRecord
+from pagination import paginate
+from sinks import SinkWriter
 from utilities import create_directory
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
 
 class Workspace:
 
-    def __init__(self, token: str):
+    def __init__(self, token: Union[str, Auth, CredentialPool], client: Client = None, sink: str = 'excel'):
         """
         Initialize variables.
+
+        Args:
+            token (Union[str, Auth, CredentialPool]): bearer token, Auth object to get a valid token on each request, or CredentialPool.
+            client (Client, optional): shared HTTP client, a new one is created if not informed (a CredentialPool token is its own client).
+            sink (str, optional): default export of list_* results: 'none', 'csv', 'jsonl', 'parquet' or 'excel'. Defaults to 'excel'.
         """
-        self.main_url = 'https://api.powerbi.com/v1.0/myorg'
+        self.client = client_for(token, client)
+        self.main_url = self.client.base_url
         self.token = token
-        self.headers = {'Authorization': f'Bearer {self.token}'}
+        self.sink = sink
+        self.sink_writer = SinkWriter()
 
         # Directories
         self.workspace_dir = './data/workspaces'
         self.users_dir = './data/users'
-        self.directories = [self.workspace_dir, self.users_dir]
+        self.reports_dir = './data/reports'
+        self.directories = [self.workspace_dir, self.users_dir, self.reports_dir]
 
         for dir in self.directories:
             create_directory(dir)
 
 
+    @property
+    def headers(self) -> Dict:
+        """
+        Authorization header, asked to Auth on each request (when informed),
+        so long runs never use an expired token.
+
+        Returns:
+            Dict: header for authorization.
+        """
+        if isinstance(self.token, (Auth, CredentialPool)):
+            return self.token.get_headers()
+
+        return {'Authorization': f'Bearer {self.token}'}
+
+
+    def flush(self):
+        """
+        Wait for all exports still being written in the background.
+        """
+        self.sink_writer.flush()
+
+
     def list_workspaces(
                 self, 
                 workspace_id: str = '', 
                 workspace_name: str = '', 
-                filters: str = '') -> Dict:
+                filters: str = '',
+                sink: str = '') -> Dict:
         """
         List all workspaces that the user has access to.
 
@@ -37,6 +77,7 @@ class Workspace:
             workspace_id (str, optional): workspace id to search for.
             workspace_name (str, optional): workspace name to search for.
             filters (str, optional): filters to be applied.
+            sink (str, optional): export format ('none', 'csv', 'jsonl', 'parquet' or 'excel'), defaults to the object's sink.
 
         Returns:
             Dict: status message and content.
@@ -46,56 +87,58 @@ class Workspace:
 
         # If no parameter, list all workspaces with access to...
         if (workspace_id == '') & (workspace_name == '') & (filters == ''):
-            filename = 'workspaces_all.xlsx'
+            filename = 'workspaces_all'
 
         # If workspace ID was informed...
         elif workspace_id != '':
             request_url = f"{request_url}/{workspace_id}"
-            filename = f'{workspace_id}.xlsx'
+            filename = f'{workspace_id}'
 
         # If workspace name was informed...
         elif workspace_name != '':
             request_url = f"{request_url}/?$filter=name%20eq%20'{workspace_name}'"
-            filename = f"{workspace_name.replace(' ', '_').upper()}.xlsx"
+            filename = f"{workspace_name.replace(' ', '_').upper()}"
         
         # If any custom (OData) filters were informed...
         # Example: passing -> filters="contains(name,'Databrew')"
         # Filters for workspaces that contain Databrew on it's name.
         elif filters != '':
             request_url = f'{request_url}/{workspace_id}?$filter={filters}'
-            filename = 'workspaces_filtered.xlsx'
+            filename = 'workspaces_filtered'
         else: 
             return {'message': 'Missing parameters, please check.', 'content': ''}
 
         # Make the request
-        r = requests.get(url=request_url, headers=self.headers)
+        r = self.client.get(url=request_url, headers=self.headers, cache=True)
 
         # Get HTTP status and content
         status = r.status_code
-        response = json.loads(r.content).get('value', '')
+        response = r.json()
 
         # If success...
         if status == 200:
-            # Save to Excel file
-            df = pd.DataFrame(response)
-            df.to_excel(f'{self.workspace_dir}/{filename}', index=False)
+            # A single workspace isn't wrapped on 'value'
+            response = Collection(WorkspaceRecord, response['value'] if 'value' in response else [response])
+
+            # Export (in the background)
+            self.sink_writer.write(response, f'{self.workspace_dir}/{filename}', sink or self.sink)
             
             return {'message': 'Success', 'content': response}
 
         else:                
             # If any error happens, return message.
-            response = json.loads(r.content)
             error_message = response['error']['message']
 
             return {'message': {'error': error_message, 'content': response}}
 
 
-    def list_users(self, workspace_id: str = '') -> Dict:
+    def list_users(self, workspace_id: str = '', sink: str = '') -> Dict:
         """
         List all users in a workspace_id that the user has access to.
 
         Args:
             workspace_id (str, optional): workspace id to search for.
+            sink (str, optional): export format ('none', 'csv', 'jsonl', 'parquet' or 'excel'), defaults to the object's sink.
 
         Returns:
             Dict: status message and content.
@@ -110,37 +153,38 @@ class Workspace:
         # If workspace ID was informed...
         else:
             request_url = f'{request_url}/{workspace_id}/users'
-            filename = f'users_{workspace_id}.xlsx'
+            filename = f'users_{workspace_id}'
 
             # Make the request
-            r = requests.get(url=request_url, headers=self.headers)
+            r = self.client.get(url=request_url, headers=self.headers, cache=True)
 
             # Get HTTP status and content
             status = r.status_code
-            response = json.loads(r.content).get('value', '')
+            response = r.json()
 
             # If success...
             if status == 200:
-                # Save to Excel file
-                df = pd.DataFrame(response)
-                df.to_excel(f'{self.users_dir}/{filename}', index=False)
+                response = Collection(UserRecord, response.get('value', []))
+
+                # Export (in the background)
+                self.sink_writer.write(response, f'{self.users_dir}/{filename}', sink or self.sink)
                 
                 return {'message': 'Success', 'content': response}
 
             else:                
                 # If any error happens, return message.
-                response = json.loads(r.content)
                 error_message = response['error']['message']
 
                 return {'message': {'error': error_message, 'content': response}}
 
         
-    def list_reports(self, workspace_id: str = '') -> Dict:
+    def list_reports(self, workspace_id: str = '', sink: str = '') -> Dict:
         """
-        List all users in a workspace_id that the user has access to.
+        List all reports in a workspace_id that the user has access to.
 
         Args:
             workspace_id (str, optional): workspace id to search for.
+            sink (str, optional): export format ('none', 'csv', 'jsonl', 'parquet' or 'excel'), defaults to the object's sink.
 
         Returns:
             Dict: status message and content.
@@ -155,31 +199,244 @@ class Workspace:
         # If workspace ID was informed...
         else:
             request_url = f'{request_url}/{workspace_id}/reports'
-            filename = f'users_{workspace_id}.xlsx'
+            filename = f'reports_{workspace_id}'
 
             # Make the request
-            r = requests.get(url=request_url, headers=self.headers)
+            r = self.client.get(url=request_url, headers=self.headers, cache=True)
 
             # Get HTTP status and content
             status = r.status_code
-            response = json.loads(r.content).get('value', '')
+            response = r.json()
 
             # If success...
             if status == 200:
-                # Save to Excel file
-                df = pd.DataFrame(response)
-                df.to_excel(f'{self.users_dir}/{filename}', index=False)
+                response = Collection(ReportRecord, response.get('value', []))
+
+                # Export (in the background)
+                self.sink_writer.write(response, f'{self.reports_dir}/{filename}', sink or self.sink)
                 
                 return {'message': 'Success', 'content': response}
 
             else:                
                 # If any error happens, return message.
-                response = json.loads(r.content)
                 error_message = response['error']['message']
 
                 return {'message': {'error': error_message, 'content': response}}
 
 
+    def _fetch(self, url: str, cache: bool = False) -> Dict:
+        """
+        GET request returning the parsed content, raising PowerBIError if not successful.
+        Not cached by default: pages of the iterators would pile up on the session cache.
+        """
+        return self.client.get_json(url, headers=self.headers, cache=cache)
+
+
+    def iter_workspaces(self, filters: str = '', page_size: int = 5000) -> Iterator[Dict]:
+        """
+        Iterate over all workspaces that the user has access to, page by page.
+        The next page is requested while the current one is processed.
+
+        Args:
+            filters (str, optional): OData filters to be applied.
+            page_size (int, optional): number of workspaces per request. Defaults to 5000.
+
+        Raises:
+            PowerBIError: if any request was not successful.
+
+        Returns:
+            Iterator[Dict]: workspaces.
+        """
+        request_url = self.main_url + '/groups'
+
+        if filters != '':
+            request_url = f'{request_url}?$filter={filters}'
+
+        return paginate(self._fetch, request_url, page_size)
+
+
+    def iter_users(self, workspace_id: str, page_size: int = 1000) -> Iterator[Dict]:
+        """
+        Iterate over all users in a workspace_id, page by page.
+
+        Args:
+            workspace_id (str): workspace id to search for.
+            page_size (int, optional): number of users per request. Defaults to 1000.
+
+        Raises:
+            PowerBIError: if any request was not successful.
+
+        Returns:
+            Iterator[Dict]: users.
+        """
+        return paginate(self._fetch, f'{self.main_url}/groups/{workspace_id}/users', page_size)
+
+
+    def iter_reports(self, workspace_id: str) -> Iterator[Dict]:
+        """
+        Iterate over all reports in a workspace_id.
+        The endpoint doesn't support $top/$skip, so only @odata.nextLink is followed.
+
+        Args:
+            workspace_id (str): workspace id to search for.
+
+        Raises:
+            PowerBIError: if any request was not successful.
+
+        Returns:
+            Iterator[Dict]: reports.
+        """
+        return paginate(self._fetch, f'{self.main_url}/groups/{workspace_id}/reports')
+
+
+    def list_pages(self, workspace_id: str, report_id: str) -> List[Dict]:
+        """
+        List the pages of a report.
+
+        Args:
+            workspace_id (str): workspace id of the report.
+            report_id (str): report id.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            List[Dict]: pages (name, displayName, order).
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/reports/get-pages-in-group
+        return self._fetch(f'{self.main_url}/groups/{workspace_id}/reports/{report_id}/pages', cache=True).get('value', [])
+
+
+    def _export_job(self, r) -> Dict:
+        """
+        Export job of a response, with the seconds to wait before polling it again (Retry-After).
+        """
+        try:
+            content = r.json()
+        except ValueError:
+            content = {'error': {'message': r.text}}
+
+        if r.status_code not in (200, 202):
+            raise PowerBIError(r.status_code, content)
+
+        try:
+            content['retryAfter'] = float(r.headers.get('Retry-After', '') or 0)
+        except ValueError:
+            content['retryAfter'] = 0
+
+        return content
+
+
+    def export_report(
+                self,
+                workspace_id: str,
+                report_id: str,
+                format: str = 'PDF',
+                pages: List[str] = [],
+                configuration: Dict = {}) -> Dict:
+        """
+        Start the export of a report to a file.
+
+        Args:
+            workspace_id (str): workspace id of the report.
+            report_id (str): report id.
+            format (str, optional): 'PDF', 'PNG', 'PPTX'... (paginated reports: 'CSV', 'XLSX', 'DOCX'...). Defaults to 'PDF'.
+            pages (List[str], optional): names of the pages to export, all if not informed.
+            configuration (Dict, optional): other powerBIReportConfiguration options (bookmark, reportLevelFilters, settings...).
+
+        Raises:
+            PowerBIError: if the export could not be started.
+
+        Returns:
+            Dict: export job (id, status, percentComplete...) and retryAfter, seconds to wait before polling it.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/reports/export-to-file-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/reports/{report_id}/ExportTo'
+
+        data = {'format': format}
+        report_configuration = dict(configuration)
+
+        if len(pages) > 0:
+            report_configuration['pages'] = [{'pageName': page} for page in pages]
+
+        if report_configuration != {}:
+            data['powerBIReportConfiguration'] = report_configuration
+
+        return self._export_job(self.client.post(url=request_url, headers=self.headers, json=data))
+
+
+    def export_status(self, workspace_id: str, report_id: str, export_id: str) -> Dict:
+        """
+        Status of an export job (never cached, it's used for polling).
+
+        Args:
+            workspace_id (str): workspace id of the report.
+            report_id (str): report id.
+            export_id (str): export job id.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            Dict: export job (status 'NotStarted', 'Running', 'Succeeded' or 'Failed', percentComplete, resourceFileExtension...)
+            and retryAfter, seconds to wait before polling it again.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/reports/get-export-to-file-status-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/reports/{report_id}/exports/{export_id}'
+
+        return self._export_job(self.client.get(url=request_url, headers=self.headers, cache=False))
+
+
+    def download_export(
+                self,
+                workspace_id: str,
+                report_id: str,
+                export_id: str,
+                path: str,
+                chunk_size: int = 1024 * 1024) -> int:
+        """
+        Download the file of a finished export job, streamed to disk chunk by chunk.
+        The file is written to path + '.part' and only renamed when complete.
+
+        Args:
+            workspace_id (str): workspace id of the report.
+            report_id (str): report id.
+            export_id (str): export job id.
+            path (str): file to save the export to.
+            chunk_size (int, optional): bytes read at a time. Defaults to 1 MB.
+
+        Raises:
+            PowerBIError: if the request was not successful.
+
+        Returns:
+            int: bytes written.
+        """
+        # https://learn.microsoft.com/en-us/rest/api/power-bi/reports/get-file-of-export-to-file-in-group
+        request_url = f'{self.main_url}/groups/{workspace_id}/reports/{report_id}/exports/{export_id}/file'
+
+        create_directory(os.path.dirname(os.path.abspath(path)))
+
+        with self.client.get(url=request_url, headers=self.headers, stream=True) as r:
+            if r.status_code != 200:
+                try:
+                    content = r.json()
+                except ValueError:
+                    content = {'error': {'message': r.text}}
+
+                raise PowerBIError(r.status_code, content)
+
+            size = 0
+
+            with open(path + '.part', 'wb') as f:
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+
+        os.replace(path + '.part', path)
+
+        return size
+
+
     def add_user(
                 self, 
                 user_principal_name: str = '', 
@@ -204,8 +461,6 @@ class Workspace:
 
             request_url = self.main_url + f'/groups/{workspace_id}/users'
 
-            headers = {'Authorization': f'Bearer {self.token}'}
-
             # Add user to workspace with the specified access right.
             # https://learn.microsoft.com/en-us/rest/api/power-bi/groups/add-group-user#groupuseraccessright
 
@@ -224,7 +479,7 @@ class Workspace:
                 }
 
             # Make the request
-            r = requests.post(url=request_url, headers=headers, json=data)
+            r = self.client.post(url=request_url, headers=self.headers, json=data)
 
             # Get HTTP status and content
             status = r.status_code
@@ -266,8 +521,6 @@ class Workspace:
 
             request_url = self.main_url + f'/groups/{workspace_id}/users'
 
-            headers = {'Authorization': f'Bearer {self.token}'}
-
             # Add user to workspace with the specified access right.
             # https://learn.microsoft.com/en-us/rest/api/power-bi/groups/update-group-user
             data = {
@@ -277,7 +530,7 @@ class Workspace:
             }
 
             # Make the request
-            r = requests.put(url=request_url, headers=headers, json=data)
+            r = self.client.put(url=request_url, headers=self.headers, json=data)
 
             # Get HTTP status and content
             status = r.status_code
@@ -315,10 +568,8 @@ class Workspace:
 
             request_url = self.main_url + f'/groups/{workspace_id}/users/{user_principal_name}'
 
-            headers = {'Authorization': f'Bearer {self.token}'}
-
             # Make the request
-            r = requests.delete(url=request_url, headers=headers)
+            r = self.client.delete(url=request_url, headers=self.headers)
 
             # Get HTTP status and content
             status = r.status_code
@@ -338,51 +589,192 @@ class Workspace:
             return {'message': 'Missing parameters, please check.'}
 
 
-    def batch_update_user(self, user: str = '', workspaces_list: List[str] = []) -> DataFrame:
+    def batch_update_user(
+                self,
+                user: str = '',
+                workspaces_list: List[Dict] = [],
+                access_right: str = 'Admin',
+                workers: int = 0,
+                progress: Callable[[int, int], None] = None,
+                sink: str = '',
+                current: 'DataFrame' = None,
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
         """
         Batch update an user on a list of workspaces.
 
+        Workspaces are updated in parallel (the client quota still applies, so workers
+        only wait for it when it runs out), and the results keep the order of the list.
+        Repeated workspaces are updated once (the repeats are 'Skipped' as duplicated), and
+        workspaces where the user already has the access right (on current, when informed)
+        are skipped without a request.
+
         Args:
             user (str): user e-mail or identifier of service principal.
-            workspaces_list (List[str]): list of workspaces to update an user.
+            workspaces_list (List[Dict]): list of workspaces ('id' and 'name') to update an user.
+            access_right (str, optional): access right type. Defaults to 'Admin'.
+            workers (int, optional): number of parallel requests, defaults to the client pool size.
+            progress (Callable[[int, int], None], optional): called with the number of workspaces done and the total after each one.
+            sink (str, optional): export format ('none', 'csv', 'jsonl', 'parquet' or 'excel'), defaults to the object's sink.
+            current (DataFrame, optional): current access rights ('workspace_id', 'principal' and 'right' columns, as on reconcile).
+            dry_run (bool, optional): don't send anything, return the cost estimate of the run instead. Defaults to False.
 
         Returns:
-            DataFrame: table with workspaces and status of the update.
+            DataFrame: table with workspaces, status of the update ('Success', 'Error' or 'Skipped'), error code and message.
+            Dict: on dry_run, requests by endpoint, workspaces skipped and wall time estimate (see Estimator.estimate).
         """
+        columns = ['id', 'name', 'status', 'error_code', 'error_message']
+
+        # Workspaces where the user already has the access right
+        unchanged = set()
+
+        if (current is not None) & (user != ''):
+            rows = current.loc[
+                        (current['principal'].astype(str).str.lower() == user.lower()) & (current['right'] == access_right),
+                        'workspace_id']
+            unchanged = set(rows.astype(str))
+
+        # Each workspace is updated once, on its first row (rows without id fail without a request)
+        seen = set()
+        duplicated = set()
+
+        for i, workspace in enumerate(workspaces_list):
+            id = workspace.get('id', '')
+
+            if id in seen:
+                duplicated.add(i)
+            elif id != '':
+                seen.add(id)
+
+        if dry_run:
+            from estimator import Estimator
+
+            ids = [workspace.get('id', '') for i, workspace in enumerate(workspaces_list) if i not in duplicated] if user != '' else []
+            skipped = {
+                'duplicated': len(duplicated) if user != '' else 0,
+                'invalid': ids.count(''),
+                'no_op': sum(1 for id in ids if id in unchanged),
+            }
+            requests = {('PUT', '/groups/{id}/users'): sum(1 for id in ids if (id != '') and (id not in unchanged))}
 
-        responses = []
+            return Estimator(self.client).estimate(requests, skipped, workers=workers if workers > 0 else self.client.pool_size)
 
         # If user and list of workspaces were informed...
-        if (user != '') & (workspaces_list != []):
+        if (user != '') & (len(workspaces_list) > 0):
 
+            workers = workers if workers > 0 else self.client.pool_size
+            lock = threading.Lock()
+            done = [0]
 
-            for workspace in workspaces_list:
+            def update(i: int, workspace: Dict) -> OperationRecord:
                 id = workspace.get('id', '')
                 name = workspace.get('name', '')
-                response = self.update_user(user_principal_name=user, workspace_id=id, access_right='Admin')
 
-                # Try to update the user
                 try:
-                    responses.append((id, name, 'Error', response['message']['content']))
-                except:
-                    responses.append((id, name, 'Success', ''))
+                    if i in duplicated:
+                        result = (id, name, 'Skipped', '', 'duplicated')
+                    elif id in unchanged:
+                        result = (id, name, 'Skipped', '', f'already {access_right}')
+                    else:
+                        response = self.update_user(user_principal_name=user, workspace_id=id, access_right=access_right)
+                        result = (id, name) + self._update_status(response)
+                except Exception as e:
+                    result = (id, name, 'Error', type(e).__name__, str(e))
 
-            # Create a dataframe with responses
-            df1 = pd.DataFrame(responses, columns=['id', 'name', 'status', 'error_message'])
+                if progress is not None:
+                    with lock:
+                        done[0] += 1
+                        progress(done[0], len(workspaces_list))
 
-            # Serialize json from error message as a new dataframe
-            df2 = pd.json_normalize(df1['error_message'])
+                return OperationRecord(dict(zip(columns, result)))
 
-            # Drop error message column and merge both dataframes
-            df1.drop(labels='error_message', axis='columns', inplace=True)
-            df = pd.merge(left=df1, right=df2, left_index=True, right_index=True)
-            df = df.fillna('')
+            # map keeps the input order
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = Collection(OperationRecord, executor.map(update, range(len(workspaces_list)), workspaces_list))
 
-            # Save to an Excel file with user name
-            df.to_excel(f"./data/workspaces_{user.split('@')[0]}.xlsx", index=False)
+            # Save to a file with user name
+            self.sink_writer.write(results, f"./data/workspaces_{user.split('@')[0]}", sink or self.sink)
 
-            return df
+            return results.to_frame(columns)
 
         else:
 
-            return pd.DataFrame([], columns=['id', 'name', 'status', 'error_message'])
\ No newline at end of file
+            return Collection(OperationRecord).to_frame(columns)
+
+
+    def _update_status(self, response: Dict) -> tuple:
+        """
+        Status, error code and error message of an update_user response.
+        """
+        message = response['message']
+
+        if message == 'Success':
+            return 'Success', '', ''
+
+        if isinstance(message, str):
+            return 'Error', '', message
+
+        error = message['content'].get('error', {})
+
+        return 'Error', message['error'], error.get('message', '')
+
+
+    def reconcile(
+                self,
+                desired: 'DataFrame',
+                current: 'DataFrame' = None,
+                prune: bool = False,
+                dry_run: bool = False) -> Union['DataFrame', Dict]:
+        """
+        Apply a desired state of workspaces access rights, sending only the requests that change something
+        (users that already have the desired right, or were already removed, are skipped).
+
+        Args:
+            desired (DataFrame): 'principal', 'workspace_id' and 'right' columns (Admin, Member, Contributor, Viewer, or None to remove).
+            current (DataFrame, optional): current access rights, same columns. Requested for the workspaces on desired if not informed.
+            prune (bool, optional): also remove users not listed on desired, on the workspaces listed. Defaults to False.
+            dry_run (bool, optional): only list the current access (if needed), return the cost estimate of the changes instead. Defaults to False.
+
+        Raises:
+            PowerBIError: if the current users of any workspace can't be listed.
+
+        Returns:
+            DataFrame: changes applied, with action, status and status_code columns.
+            Dict: on dry_run, requests by endpoint (listings included), rows skipped and wall time estimate (see Estimator.estimate).
+        """
+        # Imported only when needed, so the CLI starts fast
+        import pandas as pd
+        from reconcile import apply_changes, plan_changes, plan_requests, plan_skipped
+
+        listings = 0
+
+        if current is None:
+            rows = [
+                (workspace_id, user.get('emailAddress', '') or user.get('identifier', ''), user.get('groupUserAccessRight', ''))
+                for workspace_id in desired['workspace_id'].unique()
+                for user in self.iter_users(workspace_id)
+            ]
+            current = pd.DataFrame(rows, columns=['workspace_id', 'principal', 'right'])
+
+            # iter_users pages 1000 users at a time, and asks for one more page while they're full
+            counts = current['workspace_id'].value_counts()
+            listings = sum(int(counts.get(workspace_id, 0)) // 1000 + 1 for workspace_id in desired['workspace_id'].unique())
+
+        plan = plan_changes(desired, current, item_columns=['workspace_id'], prune=prune)
+
+        if dry_run:
+            from estimator import Estimator
+
+            users = '/groups/{id}/users'
+            requests = plan_requests(plan, {'add': ('POST', users), 'update': ('PUT', users), 'remove': ('DELETE', '/groups/{id}/users/{id}')})
+
+            # Listings aren't cached (see _fetch), so the actual run sends them again
+            if listings > 0:
+                requests[('GET', users)] = listings
+
+            return Estimator(self.client).estimate(requests, plan_skipped(desired, plan, ['workspace_id']))
+
+        return apply_changes(plan, {
+            'add': lambda row: self.add_user(row['principal'], row['workspace_id'], row['right']),
+            'update': lambda row: self.update_user(row['principal'], row['workspace_id'], row['right']),
+            'remove': lambda row: self.remove_user(row['principal'], row['workspace_id']),
+        })